@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Frackture LSH Recall vs Latency Benchmark
+Measures CosineLSHIndex recall@k and query latency against exact FracktureIndex
+search over a corpus of payloads cut from the benchmark datasets.
+"""
+
+import sys
+import time
+import json
+import numpy as np
+from pathlib import Path
+from typing import Dict, List, Any
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Import dataset repository
+try:
+    from dataset_repository import DatasetRepository
+    HAS_DATASET_REPO = True
+except ImportError:
+    HAS_DATASET_REPO = False
+
+# Import Frackture - note the module name has spaces
+import importlib.util
+spec = importlib.util.spec_from_file_location("frackture", str(Path(__file__).parent.parent / "frackture (2).py"))
+frackture_module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(frackture_module)
+
+compress_batch = frackture_module.compress_batch
+decompress_compact_batch = frackture_module.decompress_compact_batch
+FracktureIndex = frackture_module.FracktureIndex
+CosineLSHIndex = frackture_module.CosineLSHIndex
+
+SOURCE_SIZE = 1 << 16         # bytes of each dataset to cut records from
+COMPRESS_CHUNK = 50000        # records compressed per batch
+
+
+def load_sources() -> Dict[str, bytes]:
+    """Load each benchmark dataset, scaled to SOURCE_SIZE bytes."""
+    if HAS_DATASET_REPO:
+        try:
+            repo = DatasetRepository()
+            return {name: repo.load_scaled(name, SOURCE_SIZE) for name in repo.list_datasets()}
+        except FileNotFoundError as e:
+            print(f"Warning: {e}\nFalling back to the sample files in benchmarks/datasets/")
+
+    sources = {}
+    for path in sorted((Path(__file__).parent / "datasets").glob("sample_*")):
+        data = path.read_bytes()
+        if data:
+            sources[path.stem] = (data * (SOURCE_SIZE // len(data) + 1))[:SOURCE_SIZE]
+    return sources
+
+
+def make_records(sources: Dict[str, bytes], count: int, rng: np.random.Generator,
+                 min_len: int = 64, max_len: int = 4096, mutation_rate: float = 0.01) -> List[bytes]:
+    """Cut random windows from the sources and flip a few bytes in each."""
+    blobs = [np.frombuffer(data, dtype=np.uint8) for data in sources.values()]
+    records = []
+    for _ in range(count):
+        blob = blobs[rng.integers(len(blobs))]
+        length = int(rng.integers(min_len, min(max_len, len(blob)) + 1))
+        start = int(rng.integers(0, len(blob) - length + 1))
+        window = blob[start:start + length].copy()
+        flips = rng.random(length) < mutation_rate
+        window[flips] = rng.integers(0, 256, int(flips.sum()), dtype=np.uint8)
+        records.append(window.tobytes())
+    return records
+
+
+def compact_vectors(records: List[bytes]) -> np.ndarray:
+    """Compress records in chunks and keep only their compact reconstructions."""
+    chunks = []
+    for start in range(0, len(records), COMPRESS_CHUNK):
+        chunks.append(decompress_compact_batch(compress_batch(records[start:start + COMPRESS_CHUNK])))
+    return np.concatenate(chunks) if chunks else np.zeros((0, 32), dtype=np.float32)
+
+
+def run_benchmark(items: int, num_queries: int, k: int, configs: List[tuple], probes_list: List[int],
+                  seed: int, output_dir: Path) -> Dict[str, Any]:
+    rng = np.random.default_rng(seed)
+    sources = load_sources()
+    print(f"📚 {len(sources)} datasets, {items:,} corpus items, {num_queries} queries, k={k}")
+
+    start = time.perf_counter()
+    corpus = compact_vectors(make_records(sources, items, rng))
+    queries = compact_vectors(make_records(sources, num_queries, rng))
+    print(f"   corpus built in {time.perf_counter() - start:.1f}s")
+
+    exact = FracktureIndex.from_payloads(corpus)
+    latencies = []
+    true_scores = []
+    for query in queries:
+        start = time.perf_counter()
+        _, scores = exact.search(query, k=k)
+        latencies.append(time.perf_counter() - start)
+        true_scores.append(scores)
+    exact_ms = 1000 * np.array(latencies)
+    print(f"\n{'config':<16}{'probes':>7}{'recall@k':>10}{'cand %':>9}{'mean ms':>9}{'p95 ms':>9}{'speedup':>9}")
+    print(f"{'exact':<16}{'-':>7}{1.0:>10.3f}{100.0:>9.2f}{exact_ms.mean():>9.2f}{np.percentile(exact_ms, 95):>9.2f}{1.0:>9.1f}")
+
+    results = []
+    for num_tables, bits_per_table in configs:
+        start = time.perf_counter()
+        index = CosineLSHIndex.from_payloads(corpus, num_tables=num_tables, bits_per_table=bits_per_table, seed=seed)
+        build_seconds = time.perf_counter() - start
+        for probes in probes_list:
+            if probes > bits_per_table:
+                continue
+            latencies, hits, candidates = [], 0, 0
+            for query, truth in zip(queries, true_scores):
+                start = time.perf_counter()
+                _, scores = index.search(query, k=k, probes=probes)
+                latencies.append(time.perf_counter() - start)
+                # Tie-aware recall: a result counts if it scores at least the true k-th score
+                hits += int((scores >= truth[-1] - 1e-9).sum()) if len(truth) else 0
+                candidates += len(index.candidates(query, probes=probes))
+            ms = 1000 * np.array(latencies)
+            row = {
+                "num_tables": num_tables,
+                "bits_per_table": bits_per_table,
+                "probes": probes,
+                "build_seconds": build_seconds,
+                "recall": hits / max(1, sum(len(t) for t in true_scores)),
+                "candidate_fraction": candidates / max(1, len(queries) * len(corpus)),
+                "mean_ms": float(ms.mean()),
+                "p95_ms": float(np.percentile(ms, 95)),
+                "speedup": float(exact_ms.mean() / ms.mean()),
+            }
+            results.append(row)
+            label = f"{num_tables}x{bits_per_table}"
+            print(f"{label:<16}{probes:>7}{row['recall']:>10.3f}{100 * row['candidate_fraction']:>9.2f}"
+                  f"{row['mean_ms']:>9.2f}{row['p95_ms']:>9.2f}{row['speedup']:>9.1f}")
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "items": items,
+        "queries": num_queries,
+        "k": k,
+        "seed": seed,
+        "datasets": list(sources),
+        "exact": {"mean_ms": float(exact_ms.mean()), "p95_ms": float(np.percentile(exact_ms, 95))},
+        "lsh": results,
+    }
+    output_dir.mkdir(parents=True, exist_ok=True)
+    json_path = output_dir / f"lsh_results_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    with open(json_path, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n📁 Results saved to {json_path}")
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="CosineLSHIndex recall vs latency against exact search",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s                                  # 200k items, default table configs
+  %(prog)s --items 1000000 --queries 500    # Larger corpus
+  %(prog)s --configs 8x12 16x12 --probes 0 4 8
+        """
+    )
+    parser.add_argument("--items", type=int, default=200000, help="Corpus size (default: 200000)")
+    parser.add_argument("--queries", type=int, default=200, help="Number of queries (default: 200)")
+    parser.add_argument("-k", type=int, default=10, help="Results per query (default: 10)")
+    parser.add_argument(
+        "--configs", nargs="+", default=["8x8", "16x10", "16x12"],
+        help="Index configs as TABLESxBITS (default: 8x8 16x10 16x12)"
+    )
+    parser.add_argument(
+        "--probes", nargs="+", type=int, default=[0, 2, 4, 8],
+        help="Extra buckets probed per table (default: 0 2 4 8)"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    parser.add_argument(
+        "--output-dir", type=Path, default=Path(__file__).parent / "results",
+        help="Directory for the JSON report (default: benchmarks/results)"
+    )
+    args = parser.parse_args()
+
+    configs = []
+    for config in args.configs:
+        tables, bits = config.lower().split("x")
+        configs.append((int(tables), int(bits)))
+    run_benchmark(args.items, args.queries, args.k, configs, args.probes, args.seed, args.output_dir)
@@ -1,11 +1,25 @@
+import bisect
 import copy
 import hashlib
 import hmac
+import importlib.util
+import itertools
 import json
 import math
+import mmap
+import os
+import shutil
 import struct
-from dataclasses import dataclass, asdict
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass
 from enum import Enum
+from functools import lru_cache
 from typing import Any, Dict, Iterable, Optional, Union
 
 import numpy as np
@@ -14,6 +28,9 @@ from scipy.fft import fft
 _FRACKTURE_SYMBOLIC_HEX_LEN = 64
 _FRACKTURE_ENTROPY_LEN = 16
 _FRACKTURE_ENCRYPTION_VERSION = 1
+_FRACKTURE_VECTOR_LEN = 768
+_FRACKTURE_PAYLOAD_LEN = 65
+_FRACKTURE_PAYLOAD_VERSIONS = (1, 2)  # v2: tiny-tier padding hashed from a canonical byte form
 
 _UNSET = object()
 
@@ -26,7 +43,17 @@ class CompressionTier(Enum):
 
 
 ### === Compact Payload Format === ###
-@dataclass
+_PAYLOAD_STRUCT = struct.Struct("<B32s16H")
+_PAYLOAD_ENTROPY_STRUCT = struct.Struct("<16H")
+_PAYLOAD_TIER_FLAGS = {
+    CompressionTier.TINY.value: 0b001,
+    CompressionTier.DEFAULT.value: 0b010,
+    CompressionTier.LARGE.value: 0b100,
+}
+_PAYLOAD_TIER_NAMES = {flags: name for name, flags in _PAYLOAD_TIER_FLAGS.items()}
+
+
+@dataclass(init=False, repr=False, eq=False)
 class FrackturePayload:
     """
     Compact payload format for Frackture compression.
@@ -34,19 +61,136 @@ class FrackturePayload:
     Stores the same data as the legacy dict format but in a more efficient
     binary format suitable for serialization.
     
-    For backward compatibility, also supports dict-like access.
+    For backward compatibility, also supports dict-like access, and the four
+    fields below remain dataclass fields (`dataclasses.asdict`, `replace`).
+    
+    Payloads parsed with `from_bytes` wrap the 65-byte buffer and decode the
+    symbolic, entropy and tier fields only on first access. `to_bytes` caches
+    its result; the cache is reused as long as the entropy list still holds
+    the values it was encoded from.
     """
+    
     symbolic: bytes  # 32 bytes raw
     entropy: list  # 16 float32 values quantized to uint16
     tier_name: str  # Tier metadata
     version: int = 1  # Payload format version
     
+    __slots__ = ("_raw", "_raw_entropy", "_symbolic", "_entropy", "_tier_name", "_version")
+    
+    def __init__(self, symbolic: bytes, entropy: list, tier_name: str, version: int = 1):
+        """
+        Args:
+            symbolic: 32 bytes raw
+            entropy: 16 float32 values quantized to uint16
+            tier_name: Tier metadata
+            version: Payload format version
+        """
+        self._raw = None
+        self._raw_entropy = None
+        self._symbolic = symbolic
+        self._entropy = entropy
+        self._tier_name = tier_name
+        self._version = version
+    
+    @classmethod
+    def _wrap(cls, raw: bytes, version: int) -> 'FrackturePayload':
+        payload = cls.__new__(cls)
+        payload._raw = raw
+        # None while the entropy list has not been handed out, so the buffer is trusted as is
+        payload._raw_entropy = None
+        payload._symbolic = payload._entropy = payload._tier_name = _UNSET
+        payload._version = version
+        return payload
+    
+    def _materialize(self):
+        """Decode every field so the cached buffer can be dropped."""
+        self.symbolic, self.tier_name, self._entropy_values()
+        self._raw = self._raw_entropy = None
+    
+    def _cached_bytes(self) -> Optional[bytes]:
+        """The cached serialization, if the entropy list has not changed since it was made."""
+        raw = self._raw
+        if raw is not None and self._raw_entropy is not None and self._entropy != self._raw_entropy:
+            return None
+        return raw
+    
+    @property
+    def symbolic(self) -> bytes:
+        if self._symbolic is _UNSET:
+            self._symbolic = self._raw[1:33]
+        return self._symbolic
+    
+    @symbolic.setter
+    def symbolic(self, value):
+        self._materialize()
+        self._symbolic = value
+    
+    @property
+    def entropy(self) -> list:
+        entropy = self._entropy_values()
+        if self._raw is not None and self._raw_entropy is None:
+            # The caller may mutate the list; remember what the buffer encodes
+            self._raw_entropy = list(entropy)
+        return entropy
+    
+    @entropy.setter
+    def entropy(self, value):
+        self._materialize()
+        self._entropy = value
+    
+    @property
+    def tier_name(self) -> str:
+        if self._tier_name is _UNSET:
+            self._tier_name = _PAYLOAD_TIER_NAMES.get(self._raw[0] & 0x07, CompressionTier.DEFAULT.value)
+        return self._tier_name
+    
+    @tier_name.setter
+    def tier_name(self, value):
+        self._materialize()
+        self._tier_name = value
+    
+    @property
+    def version(self) -> int:
+        return self._version
+    
+    @version.setter
+    def version(self, value):
+        self._materialize()
+        self._version = value
+    
+    def _entropy_values(self) -> list:
+        """Entropy list for internal reads that do not hand it to the caller."""
+        if self._entropy is _UNSET:
+            self._entropy = list(_PAYLOAD_ENTROPY_STRUCT.unpack_from(self._raw, 33))
+        return self._entropy
+    
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        raw = self._cached_bytes()
+        if raw is not None and raw == other._cached_bytes():
+            return True
+        return (self.symbolic, self._entropy_values(), self.tier_name, self._version) == (
+            other.symbolic, other._entropy_values(), other.tier_name, other._version
+        )
+    
+    __hash__ = None
+    
+    def __repr__(self):
+        return (
+            f"FrackturePayload(symbolic={self.symbolic!r}, entropy={self._entropy_values()!r}, "
+            f"tier_name={self.tier_name!r}, version={self._version!r})"
+        )
+    
+    def __reduce__(self):
+        return (FrackturePayload, (self.symbolic, list(self._entropy_values()), self.tier_name, self._version))
+    
     def __getitem__(self, key):
         """Allow dict-like access for backward compatibility."""
         if key == "symbolic":
             return self.symbolic.hex()  # Return hex string for compatibility
         elif key == "entropy":
-            return [float(x) / 1000.0 for x in self.entropy]  # Dequantize to floats
+            return [float(x) / 1000.0 for x in self._entropy_values()]  # Dequantize to floats
         elif key == "tier_name":
             return self.tier_name
         else:
@@ -70,55 +214,52 @@ class FrackturePayload:
     
     def to_bytes(self) -> bytes:
         """Serialize payload to compact binary format."""
-        # Header: version (5 bits) + tier flags (3 bits)
-        tier_flags = {
-            CompressionTier.TINY: 0b001,
-            CompressionTier.DEFAULT: 0b010,
-            CompressionTier.LARGE: 0b100
-        }.get(CompressionTier(self.tier_name), 0b010)
+        raw = self._cached_bytes()
+        if raw is not None:
+            return raw
         
-        header = (self.version << 3) | tier_flags
-        
-        # Pack entropy values as uint16 (quantized from float32)
-        # Scale factor for quantization - adjust based on typical entropy ranges
-        entropy_data = struct.pack('<' + 'H' * 16, *self.entropy)
+        # Header: version (5 bits) + tier flags (3 bits)
+        tier_name = self.tier_name
+        tier_flags = _PAYLOAD_TIER_FLAGS.get(tier_name)
+        if tier_flags is None:
+            tier_flags = _PAYLOAD_TIER_FLAGS[CompressionTier(tier_name).value]
+        header = (self._version << 3) | tier_flags
         
-        # Total format: header (1 byte) + symbolic (32 bytes) + entropy (32 bytes)
-        return bytes([header]) + self.symbolic + entropy_data
+        # Total format: header (1 byte) + symbolic (32 bytes) + entropy (16 × uint16)
+        symbolic = self.symbolic
+        entropy = self._entropy_values()
+        if len(symbolic) == 32 and 0 <= header <= 0xFF:
+            raw = _PAYLOAD_STRUCT.pack(header, symbolic, *entropy)
+        else:
+            raw = bytes([header]) + symbolic + _PAYLOAD_ENTROPY_STRUCT.pack(*entropy)
+        if type(symbolic) is bytes and type(entropy) is list:
+            self._raw = raw
+            self._raw_entropy = list(entropy)
+        return raw
     
     @classmethod
     def from_bytes(cls, data: bytes) -> 'FrackturePayload':
-        """Deserialize payload from compact binary format."""
+        """Deserialize payload from compact binary format (fields decode lazily)."""
         if len(data) < 65:  # 1 + 32 + 32
             raise ValueError("Invalid compact payload: too short")
         
-        # Parse header
-        header = data[0]
-        version = (header >> 3) & 0x1F  # 5 bits for version
-        tier_flags = header & 0x07  # 3 bits for tier
-        
-        if version != 1:
+        # Header: version (5 bits) + tier flags (3 bits, decoded on access)
+        version = (data[0] >> 3) & 0x1F
+        if version not in _FRACKTURE_PAYLOAD_VERSIONS:
             raise ValueError(f"Unsupported payload version: {version}")
         
-        tier_map = {
-            0b001: CompressionTier.TINY.value,
-            0b010: CompressionTier.DEFAULT.value,
-            0b100: CompressionTier.LARGE.value
-        }
-        tier_name = tier_map.get(tier_flags, CompressionTier.DEFAULT.value)
-        
-        # Extract symbolic (32 bytes) and entropy (32 bytes = 16 × uint16)
-        symbolic = data[1:33]
-        entropy_bytes = data[33:65]
-        entropy = list(struct.unpack('<' + 'H' * 16, entropy_bytes))
-        
-        return cls(symbolic=symbolic, entropy=entropy, tier_name=tier_name, version=version)
+        raw = data if type(data) is bytes and len(data) == 65 else bytes(data[:65])
+        payload = cls._wrap(raw, version)
+        if raw[0] & 0x07 not in _PAYLOAD_TIER_NAMES:
+            # Unknown tier flags decode as default and re-serialize canonically
+            payload._materialize()
+        return payload
     
     def to_legacy_dict(self) -> Dict[str, Any]:
         """Convert to legacy dict format for compatibility."""
         return {
             "symbolic": self.symbolic.hex(),
-            "entropy": [float(x) / 1000.0 for x in self.entropy],  # Dequantize
+            "entropy": [float(x) / 1000.0 for x in self._entropy_values()],  # Dequantize
             "tier_name": self.tier_name,
         }
     
@@ -180,6 +321,9 @@ def select_tier(data: Union[str, bytes, dict, list, np.ndarray, Any]) -> Compres
     Returns:
         CompressionTier: The appropriate tier for the input
     """
+    if isinstance(data, PreparedInput):
+        return data.tier
+    
     try:
         if isinstance(data, bytes):
             size = len(data)
@@ -196,6 +340,11 @@ def select_tier(data: Union[str, bytes, dict, list, np.ndarray, Any]) -> Compres
     except Exception:
         return CompressionTier.DEFAULT
     
+    return _tier_for_size(size)
+
+
+def _tier_for_size(size: int) -> CompressionTier:
+    """Map a canonical byte size to its compression tier."""
     if size < 100:
         return CompressionTier.TINY
     elif size >= 10 * 1024 * 1024:  # 10 MB
@@ -204,6 +353,106 @@ def select_tier(data: Union[str, bytes, dict, list, np.ndarray, Any]) -> Compres
         return CompressionTier.DEFAULT
 
 
+### === Prepared Inputs === ###
+def _canonical_input_bytes(data: Any) -> Optional[bytes]:
+    """
+    Return the bytes the preprocessor reads for `data`.
+    
+    Lists and arrays are consumed numerically, so they have no canonical bytes
+    and None is returned. May raise if the input cannot be serialized.
+    """
+    if isinstance(data, str):
+        return data.encode("utf-8")
+    elif isinstance(data, dict):
+        return str(sorted(data.items())).encode("utf-8")
+    elif isinstance(data, bytes):
+        return data
+    elif isinstance(data, (list, np.ndarray)):
+        return None
+    else:
+        return str(data).encode("utf-8")
+
+
+class PreparedInput:
+    """
+    Input canonicalized once and shared across the pipeline.
+    
+    Tier selection, preprocessing and hashing each serialize dict, list and str
+    inputs on their own. Wrapping the input in a PreparedInput computes each
+    serialization at most once and caches the bytes, the size and the tier.
+    `select_tier`, `frackture_preprocess_universal_v2_6`, `compress_simple`,
+    `normalize_to_bytes` and `frackture_deterministic_hash` all accept it and
+    produce the same results as for the raw input.
+    """
+    
+    __slots__ = ("data", "_canonical", "_canonical_error", "_size", "_tier", "_hash_bytes")
+    
+    def __init__(self, data: Any):
+        if isinstance(data, PreparedInput):
+            data = data.data
+        self.data = data
+        self._canonical = _UNSET
+        self._canonical_error = None
+        self._size = _UNSET
+        self._tier = None
+        self._hash_bytes = None
+    
+    def __reduce__(self):
+        # Caches hold module-level sentinels, so only ship the raw input
+        return (PreparedInput, (self.data,))
+    
+    @property
+    def canonical_bytes(self) -> Optional[bytes]:
+        """Bytes the preprocessor consumes, or None for numeric list/array inputs."""
+        if self._canonical is _UNSET:
+            try:
+                self._canonical = _canonical_input_bytes(self.data)
+            except Exception as e:
+                self._canonical = None
+                self._canonical_error = e
+        if self._canonical_error is not None:
+            raise self._canonical_error
+        return self._canonical
+    
+    @property
+    def size(self) -> Optional[int]:
+        """Size used for tier selection, or None if the input cannot be measured."""
+        if self._size is _UNSET:
+            data = self.data
+            try:
+                if isinstance(data, list):
+                    self._size = len(str(data).encode("utf-8"))
+                elif isinstance(data, np.ndarray):
+                    self._size = data.nbytes
+                else:
+                    self._size = len(self.canonical_bytes)
+            except Exception:
+                self._size = None
+        return self._size
+    
+    @property
+    def tier(self) -> CompressionTier:
+        """Tier `select_tier` would choose for the raw input."""
+        if self._tier is None:
+            size = self.size
+            self._tier = CompressionTier.DEFAULT if size is None else _tier_for_size(size)
+        return self._tier
+    
+    @property
+    def hash_bytes(self) -> Union[bytes, memoryview]:
+        """Bytes `normalize_to_bytes` produces for the raw input."""
+        if self._hash_bytes is None:
+            data = self.data
+            if isinstance(data, str) or not isinstance(
+                data, (bytes, bytearray, memoryview, np.ndarray, dict, list, tuple)
+            ):
+                # Preprocessing and hashing serialize these inputs identically
+                self._hash_bytes = self.canonical_bytes
+            else:
+                self._hash_bytes = normalize_to_bytes(data)
+        return self._hash_bytes
+
+
 def _key_to_bytes(key: Union[str, bytes, bytearray]) -> bytes:
     if isinstance(key, (bytes, bytearray)):
         return bytes(key)
@@ -244,7 +493,8 @@ def validate_frackture_payload(
             # Validate FrackturePayload directly
             if not isinstance(payload.symbolic, bytes) or len(payload.symbolic) != 32:
                 raise ValueError("Invalid symbolic fingerprint")
-            if not isinstance(payload.entropy, list) or len(payload.entropy) != 16:
+            entropy_values = payload._entropy_values()
+            if not isinstance(entropy_values, list) or len(entropy_values) != 16:
                 raise ValueError("Invalid entropy channel")
             if not isinstance(payload.tier_name, str):
                 raise ValueError("Invalid tier_name")
@@ -322,7 +572,8 @@ def frackture_preprocess_universal_v2_6(data, tier: Optional[CompressionTier] =
     variance guards and lighter processing.
     
     Args:
-        data: Input data of any type (str, bytes, dict, list, np.ndarray, etc.)
+        data: Input data of any type (str, bytes, dict, list, np.ndarray, etc.),
+            or a PreparedInput wrapping one
         tier: Optional CompressionTier. If None, will auto-detect.
         
     Returns:
@@ -333,19 +584,22 @@ def frackture_preprocess_universal_v2_6(data, tier: Optional[CompressionTier] =
         tier = select_tier(data)
     
     try:
-        if isinstance(data, str):
-            vec = np.frombuffer(data.encode("utf-8"), dtype=np.uint8)
-        elif isinstance(data, dict):
-            flat = str(sorted(data.items()))
-            vec = np.frombuffer(flat.encode("utf-8"), dtype=np.uint8)
-        elif isinstance(data, bytes):
-            vec = np.frombuffer(data, dtype=np.uint8)
+        if isinstance(data, PreparedInput):
+            canonical = data.canonical_bytes
+            data = data.data
+        else:
+            canonical = _canonical_input_bytes(data)
+        
+        if canonical is not None:
+            vec = np.frombuffer(canonical, dtype=np.uint8)
         elif isinstance(data, list):
             vec = np.array(data, dtype=np.float32).flatten()
-        elif isinstance(data, np.ndarray):
-            vec = data.flatten()
         else:
-            vec = np.frombuffer(str(data).encode("utf-8"), dtype=np.uint8)
+            vec = np.ravel(data)
+        
+        # Byte inputs on standard tiers only need the head plus the global range
+        if tier != CompressionTier.TINY and vec.dtype == np.uint8:
+            return _preprocess_byte_vector(vec)
         
         normed = vec.astype(np.float32)
         
@@ -384,12 +638,217 @@ def frackture_preprocess_universal_v2_6(data, tier: Optional[CompressionTier] =
         return np.zeros(768, dtype=np.float32)
 
 
+_RANGE_SCAN_CHUNK = 64 * 1024
+
+
+def _byte_range_scan(vec: np.ndarray):
+    """
+    Return (min, max) of a uint8 vector, stopping once 0x00 and 0xFF are both seen.
+
+    Scans in fixed-size chunks so no full-size temporaries are created; most
+    binary inputs hit both extremes within the first chunk.
+    """
+    lo, hi = 255, 0
+    for offset in range(0, len(vec), _RANGE_SCAN_CHUNK):
+        chunk = vec[offset : offset + _RANGE_SCAN_CHUNK]
+        lo = min(lo, int(chunk.min()))
+        hi = max(hi, int(chunk.max()))
+        if lo == 0 and hi == 255:
+            break
+    return lo, hi
+
+
+def _normalize_byte_head(head: np.ndarray, min_byte: int, max_byte: int) -> np.ndarray:
+    """
+    Standard-tier normalization of (at most) the first 768 bytes given the global range.
+
+    Produces exactly what full float32 conversion of the whole input would, since
+    only the first 768 normalized samples survive the wrap-pad and truncation.
+    """
+    min_val = np.float32(min_byte)
+    ptp = np.float32(max_byte - min_byte)
+    normed = (head.astype(np.float32) - min_val) / (ptp + 1e-8)
+    padded = np.pad(normed, (0, 768 - len(normed) % 768), mode="wrap")
+    return padded[:768].astype(np.float32)
+
+
+def _preprocess_byte_vector(vec: np.ndarray) -> np.ndarray:
+    """Standard-tier preprocessing of a uint8 vector via an early-exit range scan."""
+    if len(vec) == 0:
+        return np.zeros(768, dtype=np.float32)
+    min_byte, max_byte = _byte_range_scan(vec)
+    return _normalize_byte_head(vec[:768], min_byte, max_byte)
+
+
+def frackture_preprocess_buffer(buffer, tier: Optional[CompressionTier] = None):
+    """
+    Preprocess any bytes-like buffer without copying it.
+    
+    Accepts bytes, bytearray, memoryview, mmap.mmap or uint8 ndarrays
+    (including np.memmap). Output is identical to
+    `frackture_preprocess_universal_v2_6(bytes(buffer))`, but standard tiers only
+    read the first 768 bytes plus as much of the buffer as the range scan needs.
+    
+    Args:
+        buffer: Bytes-like object
+        tier: Optional CompressionTier. If None, auto-detected from the byte length.
+        
+    Returns:
+        np.ndarray: Normalized 768-length float32 vector
+    """
+    if isinstance(buffer, np.ndarray):
+        vec = np.ravel(buffer).view(np.uint8)
+    else:
+        vec = np.frombuffer(buffer, dtype=np.uint8)
+    
+    if tier is None:
+        tier = _tier_for_size(len(vec))
+    
+    return frackture_preprocess_universal_v2_6(vec, tier)
+
+
+def frackture_preprocess_file(path, tier: Optional[CompressionTier] = None):
+    """
+    Preprocess a file by memory-mapping it.
+    
+    Equivalent to preprocessing the file's bytes, but for DEFAULT and LARGE tiers
+    only the pages touched by the range scan are read.
+    
+    Args:
+        path: Path to the file
+        tier: Optional CompressionTier. If None, auto-detected from the file size.
+        
+    Returns:
+        np.ndarray: Normalized 768-length float32 vector
+    """
+    with open(path, "rb") as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            return frackture_preprocess_buffer(b"", tier)
+        with mapped:
+            vec = np.frombuffer(mapped, dtype=np.uint8)
+            try:
+                return frackture_preprocess_buffer(vec, tier)
+            finally:
+                # Release the buffer export so the map can close
+                del vec
+
+
 ### === Symbolic Fingerprinting System === ###
+_SYMBOLIC_MASK_768 = (
+    (np.arange(_FRACKTURE_VECTOR_LEN) ** 2 + np.arange(_FRACKTURE_VECTOR_LEN) * 3 + 1) % 256
+).astype(np.uint8)
+_SYMBOLIC_MASK_768.setflags(write=False)
+
+
+@lru_cache(maxsize=32)
+def _symbolic_mask(width: int) -> np.ndarray:
+    """Return the read-only (i² + 3i + 1) mod 256 mask for a vector of the given width."""
+    if width == _FRACKTURE_VECTOR_LEN:
+        return _SYMBOLIC_MASK_768
+    idx = np.arange(width, dtype=np.int64)
+    mask = ((idx ** 2 + idx * 3 + 1) % 256).astype(np.uint8)
+    mask.setflags(write=False)
+    return mask
+
+
+def _symbolic_fold(entropy_mixed):
+    """
+    XOR-fold each row of an (N, width) uint8 matrix into 32 values.
+
+    Chunk boundaries follow `np.array_split(row, 32)`: a plain reshape when the
+    width divides evenly, otherwise `reduceat` over the same boundaries with
+    empty chunks folding to 0.
+    """
+    n, width = entropy_mixed.shape
+    if width % 32 == 0 and width > 0:
+        return np.bitwise_xor.reduce(entropy_mixed.reshape(n, 32, -1), axis=2)
+
+    base, extra = divmod(width, 32)
+    sizes = np.full(32, base, dtype=np.int64)
+    sizes[:extra] += 1
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    nonempty = sizes > 0
+
+    folded = np.zeros((n, 32), dtype=np.uint8)
+    if nonempty.any():
+        folded[:, nonempty] = np.bitwise_xor.reduceat(entropy_mixed, starts[nonempty], axis=1)
+    return folded
+
+
+def _iter_symbolic_passes(bits):
+    """
+    Yield the (N, 32) folded state after each symbolic pass over an (N, width) uint8 matrix.
+
+    All arithmetic in the reference encoder is taken mod 256, so it is carried
+    out here in wrapping uint8 arithmetic. Pass k+1 continues from pass k, so
+    callers that need several pass counts can advance a single generator.
+    """
+    mask = _symbolic_mask(bits.shape[1])
+    p = 0
+    while True:
+        rotated = np.roll(bits ^ mask, p * 17, axis=1)
+        entropy_mixed = rotated * np.uint8(((p + 1) ** 2) % 256)
+        folded = _symbolic_fold(entropy_mixed)
+        yield folded
+        bits = entropy_mixed + folded[:, p % 32, None]
+        p += 1
+
+
+def _symbolic_fingerprint_rows(bits, passes):
+    """
+    Run the symbolic XOR/fold passes over every row of an (N, width) uint8 matrix.
+
+    `passes` is an (N,) array of per-row pass counts; each row's fingerprint is
+    captured after its own final pass.
+
+    Returns:
+        np.ndarray: (N, 32) uint8 fingerprints
+    """
+    n = bits.shape[0]
+    fingerprints = np.zeros((n, 32), dtype=np.uint8)
+    max_passes = int(passes.max()) if n else 0
+    states = _iter_symbolic_passes(bits)
+    for p in range(max_passes):
+        folded = next(states)
+        done = passes == p + 1
+        if done.any():
+            fingerprints[done] = folded[done]
+    return fingerprints
+
+
+def frackture_symbolic_fingerprint_bytes(input_vector, passes=4, tier: Optional[CompressionTier] = None) -> bytes:
+    """
+    Generate the raw 32-byte symbolic fingerprint via recursive XOR and masking.
+
+    Uses the precomputed mask and a fixed fold, and never formats intermediate
+    passes. Bit-identical to `frackture_symbolic_fingerprint_f_infinity`.
+
+    Args:
+        input_vector: Input vector to fingerprint
+        passes: Number of XOR passes (default 4, reduced to 2 for tiny tier)
+        tier: Optional CompressionTier. If tiny, overrides passes to 2.
+
+    Returns:
+        bytes: 32-byte fingerprint
+    """
+    if tier == CompressionTier.TINY:
+        passes = 2
+    if passes < 1:
+        raise ValueError("passes must be at least 1")
+
+    bits = (np.asarray(input_vector) * 255).astype(np.uint8).reshape(1, -1)
+    return _symbolic_fingerprint_rows(bits, np.array([passes])).tobytes()
+
+
 def frackture_symbolic_fingerprint_f_infinity(input_vector, passes=4, tier: Optional[CompressionTier] = None):
     """
     Generate symbolic fingerprint via recursive XOR and masking.
     
     For tiny tier, uses lighter pass counts (2 instead of 4) for efficiency.
+    Compatibility wrapper around `frackture_symbolic_fingerprint_bytes`.
     
     Args:
         input_vector: Input vector to fingerprint
@@ -399,26 +858,17 @@ def frackture_symbolic_fingerprint_f_infinity(input_vector, passes=4, tier: Opti
     Returns:
         str: 64-character hex fingerprint
     """
-    # Use lighter passes for tiny tier
-    if tier == CompressionTier.TINY:
-        passes = 2
-    
-    bits = (input_vector * 255).astype(np.uint8)
-    mask = np.array([(i**2 + i * 3 + 1) % 256 for i in range(len(bits))], dtype=np.uint8)
-    for p in range(passes):
-        rotated = np.roll(bits ^ mask, p * 17)
-        entropy_mixed = (rotated * ((p + 1) ** 2)).astype(np.uint16) % 256
-        chunks = np.array_split(entropy_mixed, 32)
-        folded = [np.bitwise_xor.reduce(chunk) for chunk in chunks]
-        fingerprint = "".join(f"{x:02x}" for x in folded)
-        bits = (entropy_mixed + folded[p % len(folded)]) % 256
-    return fingerprint
+    return frackture_symbolic_fingerprint_bytes(input_vector, passes=passes, tier=tier).hex()
 
 
 def symbolic_channel_encode(input_vector, tier: Optional[CompressionTier] = None):
     return frackture_symbolic_fingerprint_f_infinity(input_vector, tier=tier)
 
 
+def symbolic_channel_encode_bytes(input_vector, tier: Optional[CompressionTier] = None) -> bytes:
+    return frackture_symbolic_fingerprint_bytes(input_vector, tier=tier)
+
+
 def symbolic_channel_decode(symbolic_hash):
     validate_frackture_payload(symbolic=symbolic_hash)
 
@@ -490,7 +940,7 @@ def frackture_v3_3_safe(input_vector, tier: Optional[CompressionTier] = None):
     """
     Safe Frackture encoding with dual-channel compression.
     
-    Returns a lightweight FrackturePayload dataclass that exposes .to_bytes() / .from_bytes().
+    Returns a lightweight FrackturePayload that exposes .to_bytes() / .from_bytes().
     
     Args:
         input_vector: Preprocessed 768-length vector
@@ -502,42 +952,55 @@ def frackture_v3_3_safe(input_vector, tier: Optional[CompressionTier] = None):
     if tier is None:
         tier = CompressionTier.DEFAULT
     
-    symbolic_hex = symbolic_channel_encode(input_vector, tier=tier)
+    symbolic = symbolic_channel_encode_bytes(input_vector, tier=tier)
     entropy_values = entropy_channel_encode(input_vector)
     
     return FrackturePayload(
-        symbolic=bytes.fromhex(symbolic_hex),
+        symbolic=symbolic,
         entropy=[int(max(0, min(65535, x * 1000.0))) for x in entropy_values],
         tier_name=tier.value,
         version=1
     )
 
 
-def frackture_v3_3_reconstruct(payload):
+def frackture_v3_3_reconstruct(payload, out=None):
     """
     Reconstruct approximate representation from Frackture payload.
     
-    Accepts legacy dict, FrackturePayload dataclass, or raw bytes.
+    Accepts legacy dict, FrackturePayload, or raw bytes.
     Honors tier metadata for specialized reconstruction:
     - Tiny tier: Heavier weighting on symbolic fingerprint (70/30 split)
     - Other tiers: Balanced 50/50 merge
     
     Args:
         payload: Frackture payload (dict, FrackturePayload, or bytes)
+        out: Optional (768,) float32 or float16 array (e.g. a row of a memmapped
+            matrix) to write the result into
         
     Returns:
-        np.ndarray: Reconstructed 768-length vector
+        np.ndarray: Reconstructed 768-length vector (`out` if provided)
     """
+    if out is not None and (out.shape != (_FRACKTURE_VECTOR_LEN,) or out.dtype not in _RECONSTRUCT_DTYPES):
+        raise ValueError("out must be a float32 or float16 array of shape (768,)")
+
+    if out is not None and isinstance(payload, (bytes, FrackturePayload)):
+        # Decode the 32-value period from the packed bytes and tile it straight into `out`
+        if isinstance(payload, bytes):
+            payload = deserialize_frackture_payload(payload)
+        row = np.frombuffer(payload.to_bytes(), dtype=np.uint8).reshape(1, _FRACKTURE_PAYLOAD_LEN)
+        frackture_v3_3_reconstruct_batch(row, out=out[None])
+        return out
+
     # Handle different payload types for backward compatibility
     if isinstance(payload, bytes):
         payload_obj = deserialize_frackture_payload(payload)
         tier_name = payload_obj.tier_name
         symbolic_hex = payload_obj.symbolic.hex()
-        entropy_data = [float(x) / 1000.0 for x in payload_obj.entropy]  # Dequantize
+        entropy_data = [float(x) / 1000.0 for x in payload_obj._entropy_values()]  # Dequantize
     elif isinstance(payload, FrackturePayload):
         tier_name = payload.tier_name
         symbolic_hex = payload.symbolic.hex()
-        entropy_data = [float(x) / 1000.0 for x in payload.entropy]  # Dequantize
+        entropy_data = [float(x) / 1000.0 for x in payload._entropy_values()]  # Dequantize
     elif isinstance(payload, dict):
         # For empty dicts, raise KeyError to maintain test compatibility
         if not payload:
@@ -552,6 +1015,15 @@ def frackture_v3_3_reconstruct(payload):
     entropy_part = entropy_channel_decode(entropy_data)
     symbolic_part = symbolic_channel_decode(symbolic_hex)
     
+    merged = _merge_channels(entropy_part, symbolic_part, tier_name)
+    if out is None:
+        return merged
+    out[...] = merged
+    return out
+
+
+def _merge_channels(entropy_part, symbolic_part, tier_name):
+    """Combine decoded channels with the tier's weighting."""
     if tier_name == CompressionTier.TINY.value:
         # For tiny tier, weight symbolic more heavily (better identity preservation)
         # Symbolic: 70%, Entropy: 30%
@@ -561,131 +1033,3500 @@ def frackture_v3_3_reconstruct(payload):
         return merge_reconstruction(entropy_part, symbolic_part)
 
 
-### === Self-Optimization (Decoder Loss Feedback Loop) === ###
-def optimize_frackture(input_vector, num_trials=5, tier: Optional[CompressionTier] = None):
+def _symbolic_decode_raw(symbolic: bytes) -> np.ndarray:
+    """Decode raw fingerprint bytes exactly as `symbolic_channel_decode` decodes their hex."""
+    decoded = (np.frombuffer(symbolic, dtype=np.uint8) / 255.0).astype(np.float32)
+    return np.tile(decoded, 768 // len(decoded))
+
+
+### === Batch Encoding === ###
+_TIER_FLAG_BITS = {
+    CompressionTier.TINY: 0b001,
+    CompressionTier.DEFAULT: 0b010,
+    CompressionTier.LARGE: 0b100,
+}
+
+def _entropy_features_rows(input_matrix):
     """
-    Self-optimizing encoder that minimizes reconstruction MSE.
-    
-    For tiny tier, uses reduced trial count (2 instead of 5) for efficiency.
-    
-    Args:
-        input_vector: Preprocessed 768-length vector
-        num_trials: Number of optimization trials (reduced to 2 for tiny tier)
-        tier: Optional CompressionTier. If tiny, reduces trials automatically.
-        
+    Compute the 16 FFT entropy features for every row of an (N, 768) matrix.
+
+    Mirrors `entropy_channel_encode`: only the first four 48-bin chunks of the
+    magnitude spectrum contribute (mean, std, max, min for each).
+
     Returns:
-        tuple: (best_payload, best_mse)
+        np.ndarray: (N, 16) features in the input's floating dtype
     """
-    if tier == CompressionTier.TINY:
-        num_trials = 2
-    
-    best_payload = None
-    best_mse = float("inf")
-    for trial in range(num_trials):
-        symbolic_hex = frackture_symbolic_fingerprint_f_infinity(input_vector, passes=trial + 2, tier=tier)
-        entropy_values = entropy_channel_encode(input_vector)
-        
-        # Create FrackturePayload for consistency
-        payload = FrackturePayload(
-            symbolic=bytes.fromhex(symbolic_hex),
-            entropy=[int(max(0, min(65535, x * 1000.0))) for x in entropy_values],
-            tier_name=(tier or CompressionTier.DEFAULT).value,
-            version=1
-        )
-        
-        recon = frackture_v3_3_reconstruct(payload)
-        mse = np.mean((input_vector - recon) ** 2)
-        if mse < best_mse:
-            best_mse = mse
-            best_payload = payload
-    return best_payload, best_mse
+    n = input_matrix.shape[0]
+    chunk_size = _FRACKTURE_VECTOR_LEN // 16
+    fft_matrix = np.abs(fft(input_matrix, axis=1))
+    chunks = fft_matrix[:, : 4 * chunk_size].reshape(n, 4, chunk_size)
+    stats = np.stack(
+        [chunks.mean(axis=2), chunks.std(axis=2), chunks.max(axis=2), chunks.min(axis=2)],
+        axis=2,
+    )
+    return stats.reshape(n, 16)
 
 
-### === Simple Wrapper Functions === ###
-def compress_simple(data, tier=None, optimize=False, return_format="compact"):
+def _quantize_entropy_rows(features):
+    """Quantize entropy features to uint16 exactly as the scalar encoder does."""
+    scaled = np.asarray(features, dtype=np.float64) * 1000.0
+    # int(max(0, min(65535, nan))) evaluates to 65535 in the scalar path
+    scaled = np.where(np.isnan(scaled), 65535.0, scaled)
+    return np.clip(scaled, 0, 65535).astype(np.uint16)
+
+
+def _tier_array(tiers, n):
+    """Normalize a tier argument (None, single tier, or per-row sequence) to a list of tiers."""
+    if tiers is None:
+        return [CompressionTier.DEFAULT] * n
+    if isinstance(tiers, (CompressionTier, str)):
+        return [CompressionTier(tiers)] * n
+    tier_list = [CompressionTier(t) for t in tiers]
+    if len(tier_list) != n:
+        raise ValueError("tiers must have one entry per row")
+    return tier_list
+
+
+def frackture_v3_3_safe_batch(input_matrix, tiers=None, version: int = 1):
     """
-    Simplified compression wrapper that performs preprocess → encode → optimization → compact serialization.
-    
+    Batched Frackture encoding over an (N, 768) matrix of preprocessed vectors.
+
+    Runs the symbolic and entropy channels along axis 1 in vectorized form and
+    writes compact payloads straight into a packed array. Row i is byte-identical
+    to `frackture_v3_3_safe(input_matrix[i], tier=tiers[i]).to_bytes()`.
+
     Args:
-        data: Input data to compress (str, bytes, dict, list, np.ndarray, etc.)
-        tier: Optional CompressionTier. If None, will auto-detect.
-        optimize: If True, run optimization to minimize MSE.
-        return_format: "compact" (bytes) or "json" (dict) for legacy compatibility.
-        
+        input_matrix: (N, 768) float array of preprocessed vectors
+        tiers: None (all DEFAULT), a single CompressionTier, or one tier per row
+        version: Payload format version written into the header
+
     Returns:
-        bytes or dict: Compressed payload in requested format
+        np.ndarray: (N, 65) uint8 array of compact payloads
     """
-    # Auto-detect tier if not provided
-    if tier is None:
-        tier = select_tier(data)
-    
-    # Preprocess input
-    input_vector = frackture_preprocess_universal_v2_6(data, tier)
-    
-    # Encode with optional optimization
-    if optimize:
-        payload, _ = optimize_frackture(input_vector, tier=tier)
-    else:
-        payload = frackture_v3_3_safe(input_vector, tier=tier)
-    
-    # Serialize in requested format
-    if return_format == "compact":
-        return payload.to_bytes()
-    elif return_format == "json":
-        return payload.to_legacy_dict()
-    else:
-        raise ValueError("return_format must be 'compact' or 'json'")
+    input_matrix = np.asarray(input_matrix)
+    if input_matrix.ndim != 2 or input_matrix.shape[1] != _FRACKTURE_VECTOR_LEN:
+        raise ValueError("input_matrix must have shape (N, 768)")
+
+    n = input_matrix.shape[0]
+    tier_list = _tier_array(tiers, n)
+    is_tiny = np.array([t == CompressionTier.TINY for t in tier_list], dtype=bool)
+    flags = np.array([_TIER_FLAG_BITS[t] for t in tier_list], dtype=np.uint8)
+
+    out = np.empty((n, _FRACKTURE_PAYLOAD_LEN), dtype=np.uint8)
+    if n == 0:
+        return out
+
+    bits = (input_matrix * 255).astype(np.uint8)
+    passes = np.where(is_tiny, 2, 4)
+
+    out[:, 0] = (version << 3) | flags
+    out[:, 1:33] = _symbolic_fingerprint_rows(bits, passes)
+    entropy = _quantize_entropy_rows(_entropy_features_rows(input_matrix))
+    out[:, 33:65] = entropy.astype("<u2").view(np.uint8).reshape(n, 32)
+    return out
+
+
+### === Batch Reconstruction === ###
+_SYMBOLIC_PERIOD = _FRACKTURE_SYMBOLIC_HEX_LEN // 2
+_RECONSTRUCT_BATCH_BLOCK = 65536
+_RECONSTRUCT_DTYPES = (np.dtype(np.float32), np.dtype(np.float16))
 
 
-def decompress_simple(payload, input_data=None):
+def _payload_rows(payloads) -> np.ndarray:
     """
-    Simplified decompression wrapper for any payload format.
-    
-    Args:
-        payload: Compressed payload (bytes, FrackturePayload, or dict)
-        input_data: Original input for comparison (optional)
-        
-    Returns:
-        np.ndarray: Reconstructed 768-length vector
+    View packed compact payloads as an (N, 65) uint8 array without copying.
+
+    Accepts an (N, 65) uint8 array, or a bytes-like buffer or flat uint8
+    array (such as an `np.memmap` of a payload file) holding N concatenated
+    65-byte payloads.
     """
-    return frackture_v3_3_reconstruct(payload)
+    if isinstance(payloads, PayloadArray):
+        return payloads.rows
+    if isinstance(payloads, np.ndarray) and payloads.ndim != 1:
+        rows = payloads
+    else:
+        try:
+            rows = np.frombuffer(payloads, dtype=np.uint8)
+        except TypeError as e:
+            raise ValueError("payloads must be an (N, 65) uint8 array or a bytes-like buffer") from e
+        if rows.size % _FRACKTURE_PAYLOAD_LEN:
+            raise ValueError("payload buffer length must be a multiple of 65")
+        rows = rows.reshape(-1, _FRACKTURE_PAYLOAD_LEN)
+    if rows.dtype != np.uint8 or rows.ndim != 2 or rows.shape[1] != _FRACKTURE_PAYLOAD_LEN:
+        raise ValueError("payloads must be an (N, 65) uint8 array or a bytes-like buffer")
+    return rows
 
 
-# Preset helpers for common use cases
-def compress_preset_tiny(data, optimize=False, return_format="compact"):
-    """Compress using TINY tier preset."""
-    return compress_simple(data, tier=CompressionTier.TINY, optimize=optimize, return_format=return_format)
+def _reconstruct_periods(rows: np.ndarray) -> np.ndarray:
+    """
+    Reconstruct the repeating 32-value period of every payload row.
 
+    The entropy channel tiles with period 16 and the symbolic channel with
+    period 32, so each reconstructed vector is its first 32 values tiled 24
+    times. The float32 arithmetic matches `frackture_v3_3_reconstruct`
+    step for step.
 
-def compress_preset_default(data, optimize=False, return_format="compact"):
-    """Compress using DEFAULT tier preset.""" 
-    return compress_simple(data, tier=CompressionTier.DEFAULT, optimize=optimize, return_format=return_format)
+    Returns:
+        np.ndarray: (N, 32) float32 periods
+    """
+    versions = rows[:, 0] >> 3
+    if not np.isin(versions, _FRACKTURE_PAYLOAD_VERSIONS).all():
+        bad = int(versions[~np.isin(versions, _FRACKTURE_PAYLOAD_VERSIONS)][0])
+        raise ValueError(f"Unsupported payload version: {bad}")
 
+    n = rows.shape[0]
+    quantized = np.ascontiguousarray(rows[:, 33:65]).view("<u2").reshape(n, _FRACKTURE_ENTROPY_LEN)
+    ent = (quantized / 1000.0).astype(np.float32)
+    low = ent.min(axis=1, keepdims=True)
+    span = ent.max(axis=1, keepdims=True) - low
+    entropy_part = np.tile((ent - low) / (span + 1e-8), 2)
 
-def compress_preset_large(data, optimize=False, return_format="compact"):
-    """Compress using LARGE tier preset."""
-    return compress_simple(data, tier=CompressionTier.LARGE, optimize=optimize, return_format=return_format)
+    symbolic_part = (rows[:, 1:33] / 255.0).astype(np.float32)
 
+    is_tiny = (rows[:, 0] & 0x07) == _TIER_FLAG_BITS[CompressionTier.TINY]
+    periods = (entropy_part + symbolic_part) / 2
+    if is_tiny.any():
+        periods[is_tiny] = 0.7 * symbolic_part[is_tiny] + 0.3 * entropy_part[is_tiny]
+    return periods
 
-### === Hashing Functions === ###
 
-_HASH_CHUNK_SIZE = 1024 * 1024  # 1MiB
+def frackture_v3_3_reconstruct_batch(payloads, out=None, dtype=np.float32):
+    """
+    Batched reconstruction of packed compact payloads.
 
+    Decodes every row straight from the packed bytes, with no hex or per-value
+    Python work, and honors each row's tier header (TINY rows get the 70/30
+    symbolic/entropy weighting, all others 50/50). Row i is identical to
+    `frackture_v3_3_reconstruct(bytes(payloads[i]))`.
 
-def normalize_to_bytes(data: Any) -> Union[bytes, memoryview]:
-    """Normalize arbitrary data into bytes for hashing.
+    Rows are decoded in fixed-size blocks and written straight into the
+    output, so decoding into an `np.memmap` keeps the working set bounded.
 
-    Fast-paths bytes-like objects and uses deterministic JSON for dict/list.
+    Args:
+        payloads: (N, 65) uint8 array (e.g. from `compress_batch`) or a bytes-like
+            buffer of N concatenated compact payloads
+        out: Optional preallocated (N, 768) float32 or float16 array (or memmap)
+            to write into
+        dtype: Output dtype when `out` is not given: float32 (exact) or
+            float16 (half the memory, for similarity ranking)
+
+    Returns:
+        np.ndarray: (N, 768) matrix of reconstructed vectors (`out` if provided)
     """
+    rows = _payload_rows(payloads)
+    n = rows.shape[0]
+    if out is None:
+        dtype = np.dtype(dtype)
+        if dtype not in _RECONSTRUCT_DTYPES:
+            raise ValueError("dtype must be float32 or float16")
+        out = np.empty((n, _FRACKTURE_VECTOR_LEN), dtype=dtype)
+    elif out.shape != (n, _FRACKTURE_VECTOR_LEN) or out.dtype not in _RECONSTRUCT_DTYPES:
+        raise ValueError("out must be a float32 or float16 array of shape (N, 768)")
 
-    if isinstance(data, memoryview):
-        return data
+    reps = _FRACKTURE_VECTOR_LEN // _SYMBOLIC_PERIOD
+    for start in range(0, n, _RECONSTRUCT_BATCH_BLOCK):
+        stop = min(start + _RECONSTRUCT_BATCH_BLOCK, n)
+        periods = _reconstruct_periods(rows[start:stop])
+        block = out[start:stop]
+        if block.flags.c_contiguous:
+            block.reshape(stop - start, reps, _SYMBOLIC_PERIOD)[:] = periods[:, None, :]
+        else:
+            # Strided outputs: column-slice writes avoid a reshaped copy
+            for col in range(0, _FRACKTURE_VECTOR_LEN, _SYMBOLIC_PERIOD):
+                block[:, col : col + _SYMBOLIC_PERIOD] = periods
+    return out
 
-    if isinstance(data, (bytes, bytearray)):
-        return memoryview(data)
 
-    if isinstance(data, str):
-        return data.encode("utf-8")
+### === Payload Arrays === ###
+_TIER_NAMES_BY_FLAGS = np.array(
+    [
+        {0b001: CompressionTier.TINY.value, 0b100: CompressionTier.LARGE.value}.get(flags, CompressionTier.DEFAULT.value)
+        for flags in range(8)
+    ]
+)
+
+
+class PayloadArray:
+    """
+    Columnar container for many compact payloads.
+    
+    Backed by a single (N, 65) uint8 buffer, so each payload costs its 65 bytes
+    instead of a FrackturePayload object with its list and bytes fields. The
+    header, symbolic and entropy columns are zero-copy views into that buffer.
+    Batch reconstruction and the compact decoders accept a PayloadArray
+    wherever they accept a packed (N, 65) array.
+    
+    Indexing with an integer returns a FrackturePayload; slices return views
+    and masks or index arrays return new PayloadArrays.
+    """
+    
+    __slots__ = ("rows",)
+    
+    def __init__(self, rows=None):
+        """
+        Args:
+            rows: (N, 65) uint8 array, bytes-like buffer of concatenated compact
+                payloads, or another PayloadArray. Arrays are used without copying.
+        """
+        if rows is None:
+            rows = np.empty((0, _FRACKTURE_PAYLOAD_LEN), dtype=np.uint8)
+        self.rows = _payload_rows(rows)
+    
+    @classmethod
+    def from_bytes(cls, data) -> 'PayloadArray':
+        """Wrap a buffer of concatenated 65-byte payloads without copying."""
+        return cls(data)
+    
+    @classmethod
+    def from_payloads(cls, payloads) -> 'PayloadArray':
+        """Pack an iterable of compact payload bytes or FrackturePayload objects."""
+        blobs = []
+        for payload in payloads:
+            if isinstance(payload, FrackturePayload):
+                payload = payload.to_bytes()
+            if len(payload) != _FRACKTURE_PAYLOAD_LEN:
+                raise ValueError("compact payloads must be exactly 65 bytes")
+            blobs.append(payload)
+        return cls(bytearray(b"".join(blobs)))
+    
+    @classmethod
+    def concatenate(cls, arrays) -> 'PayloadArray':
+        """Join PayloadArrays (or packed arrays) into one new PayloadArray."""
+        parts = [_payload_rows(a) for a in arrays]
+        if not parts:
+            return cls()
+        return cls(np.concatenate(parts))
+    
+    def to_bytes(self) -> bytes:
+        """All payloads concatenated, in the format `from_bytes` reads."""
+        return self.rows.tobytes()
+    
+    def __len__(self):
+        return self.rows.shape[0]
+    
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            return FrackturePayload.from_bytes(self.rows[index].tobytes())
+        return PayloadArray(self.rows[index])
+    
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+    
+    def __array__(self, dtype=None, copy=None):
+        if copy:
+            return np.array(self.rows, dtype=dtype)
+        return self.rows if dtype is None else self.rows.astype(dtype)
+    
+    def __repr__(self):
+        return f"PayloadArray(n={len(self)})"
+    
+    @property
+    def nbytes(self) -> int:
+        return self.rows.nbytes
+    
+    @property
+    def header(self) -> np.ndarray:
+        """(N,) uint8 header bytes."""
+        return self.rows[:, 0]
+    
+    @property
+    def symbolic(self) -> np.ndarray:
+        """(N, 32) uint8 symbolic fingerprints."""
+        return self.rows[:, 1:33]
+    
+    @property
+    def entropy(self) -> np.ndarray:
+        """(N, 16) little-endian uint16 quantized entropy values."""
+        return self.rows[:, 33:65].view("<u2")
+    
+    @property
+    def versions(self) -> np.ndarray:
+        """(N,) payload format versions decoded from the headers."""
+        return self.header >> 3
+    
+    @property
+    def tier_flags(self) -> np.ndarray:
+        """(N,) 3-bit tier flags decoded from the headers."""
+        return self.header & 0x07
+    
+    @property
+    def tier_names(self) -> np.ndarray:
+        """(N,) tier names, decoded as `FrackturePayload.from_bytes` does."""
+        return _TIER_NAMES_BY_FLAGS[self.tier_flags]
+    
+    def tier_mask(self, tier) -> np.ndarray:
+        """Boolean mask of rows whose header decodes to the given tier."""
+        return self.tier_names == CompressionTier(tier).value
+    
+    def reconstruct(self, out=None, dtype=np.float32) -> np.ndarray:
+        """(N, 768) reconstructions; see `frackture_v3_3_reconstruct_batch`."""
+        return frackture_v3_3_reconstruct_batch(self.rows, out=out, dtype=dtype)
+    
+    def compact(self) -> np.ndarray:
+        """(N, 32) compact reconstructions; see `decompress_compact_batch`."""
+        return decompress_compact_batch(self.rows)
+
+
+### === Bulk Payload Validation === ###
+PAYLOAD_VALID = 0
+PAYLOAD_BAD_LENGTH = 1
+PAYLOAD_BAD_VERSION = 2
+PAYLOAD_BAD_TIER = 3
+
+_PAYLOAD_ERROR_REASONS = {
+    PAYLOAD_BAD_LENGTH: "payload is not 65 bytes",
+    PAYLOAD_BAD_VERSION: "unsupported payload version",
+    PAYLOAD_BAD_TIER: "invalid tier flags",
+}
+_VALID_VERSION_TABLE = np.isin(np.arange(32), _FRACKTURE_PAYLOAD_VERSIONS)
+_VALID_TIER_FLAG_TABLE = np.isin(np.arange(8), list(_TIER_FLAG_BITS.values()))
+
+
+def _payload_batch_rows(payloads, offsets=None):
+    """
+    Resolve validation input to (rows, lengths, starts, buffer).
+
+    Packed input (array, PayloadArray or buffer without offsets) has every row
+    at 65 bytes. Ragged input (a sequence of records, or a buffer with offsets)
+    yields per-record lengths; rows of the wrong length are left zeroed.
+    """
+    if offsets is None and not isinstance(payloads, (list, tuple)):
+        rows = _payload_rows(payloads)
+        return rows, None
+    buffer, bounds = _ragged_records(payloads, offsets)
+    starts = bounds[:-1]
+    lengths = np.diff(bounds)
+    rows = np.zeros((len(starts), _FRACKTURE_PAYLOAD_LEN), dtype=np.uint8)
+    sized = lengths == _FRACKTURE_PAYLOAD_LEN
+    if sized.any():
+        rows[sized] = buffer[starts[sized, None] + np.arange(_FRACKTURE_PAYLOAD_LEN)]
+    return rows, lengths
+
+
+def _payload_error_codes(rows, lengths=None):
+    header = rows[:, 0]
+    codes = np.full(rows.shape[0], PAYLOAD_VALID, dtype=np.uint8)
+    codes[~_VALID_TIER_FLAG_TABLE[header & 0x07]] = PAYLOAD_BAD_TIER
+    codes[~_VALID_VERSION_TABLE[header >> 3]] = PAYLOAD_BAD_VERSION
+    if lengths is not None:
+        codes[lengths != _FRACKTURE_PAYLOAD_LEN] = PAYLOAD_BAD_LENGTH
+    return codes
+
+
+def validate_payload_batch(payloads, offsets=None, raise_on_error: bool = False):
+    """
+    Validate many compact payloads at once.
+
+    Checks the length, header version and tier flags of every row with array
+    operations. Tier flags must be exactly one of the TINY/DEFAULT/LARGE bits,
+    which is stricter than `FrackturePayload.from_bytes` (it decodes unknown
+    flags as DEFAULT). The symbolic and entropy bytes cannot be malformed once
+    the length is right.
+
+    Args:
+        payloads: (N, 65) uint8 array, PayloadArray, buffer of concatenated
+            payloads, or a list of individual payload records
+        offsets: Optional (N + 1,) record boundaries when `payloads` is one
+            buffer of variable-length records
+        raise_on_error: Raise on the first invalid row instead of returning
+
+    Returns:
+        tuple: (mask, codes) where mask is an (N,) bool array of valid rows and
+            codes an (N,) uint8 array of PAYLOAD_VALID / PAYLOAD_BAD_LENGTH /
+            PAYLOAD_BAD_VERSION / PAYLOAD_BAD_TIER
+    """
+    rows, lengths = _payload_batch_rows(payloads, offsets)
+    codes = _payload_error_codes(rows, lengths)
+    mask = codes == PAYLOAD_VALID
+    if raise_on_error and not mask.all():
+        index = int(np.argmin(mask))
+        raise ValueError(f"Invalid payload at row {index}: {_PAYLOAD_ERROR_REASONS[int(codes[index])]}")
+    return mask, codes
+
+
+def filter_valid_payloads(payloads, offsets=None):
+    """
+    Keep only the valid payloads of a batch.
+
+    Args:
+        payloads: Any input accepted by `validate_payload_batch`
+        offsets: Optional (N + 1,) record boundaries for ragged input
+
+    Returns:
+        tuple: (PayloadArray of valid rows, (K,) int64 indices of those rows in the input)
+    """
+    rows, lengths = _payload_batch_rows(payloads, offsets)
+    keep = np.flatnonzero(_payload_error_codes(rows, lengths) == PAYLOAD_VALID)
+    return PayloadArray(rows[keep]), keep
+
+
+### === Payload Files === ###
+# .frk layout (little-endian):
+#   header  magic "FRKP", format version (u16), payload size (u16), id width (u32),
+#           committed record count (u64), 12 reserved bytes
+#   records fixed-width rows of a 65-byte compact payload followed by `id width`
+#           id bytes (NUL-padded)
+_FRK_MAGIC = b"FRKP"
+_FRK_FORMAT_VERSION = 1
+_FRK_HEADER = struct.Struct("<4sHHIQ12x")
+_FRK_COUNT_OFFSET = 12
+_FRK_DEFAULT_FSYNC_EVERY = 65536
+
+
+def _read_frk_header(f):
+    raw = f.read(_FRK_HEADER.size)
+    if len(raw) != _FRK_HEADER.size:
+        raise ValueError("Invalid .frk file: truncated header")
+    magic, version, payload_len, id_width, count = _FRK_HEADER.unpack(raw)
+    if magic != _FRK_MAGIC:
+        raise ValueError("Invalid .frk file: bad magic")
+    if version != _FRK_FORMAT_VERSION:
+        raise ValueError(f"Unsupported .frk format version: {version}")
+    if payload_len != _FRACKTURE_PAYLOAD_LEN:
+        raise ValueError("Invalid .frk file: unexpected payload size")
+    return id_width, count
+
+
+def _frk_id_bytes(record_id, id_width: int) -> bytes:
+    if isinstance(record_id, str):
+        record_id = record_id.encode("utf-8")
+    record_id = bytes(record_id)
+    if len(record_id) > id_width:
+        raise ValueError(f"id longer than the file's id width ({id_width} bytes)")
+    return record_id.ljust(id_width, b"\x00")
+
+
+class FracktureFileWriter:
+    """
+    Append-only writer for .frk payload files.
+    
+    Records are buffered and made durable by `sync()`, which runs automatically
+    every `fsync_every` records and on `close()`. `sync()` fsyncs the records
+    before committing the new record count to the header, so readers and
+    reopened writers only ever see fully written records; an uncommitted tail
+    left by a crash is discarded when the file is reopened for appending.
+    """
+    
+    def __init__(self, path, id_width: int = 0, fsync_every: int = _FRK_DEFAULT_FSYNC_EVERY):
+        """
+        Args:
+            path: File to create, or an existing .frk file to append to
+            id_width: Fixed id width in bytes for a new file (0 for no ids).
+                Must match the header when appending to an existing file.
+            fsync_every: Records between automatic syncs (0 disables them)
+        """
+        if id_width < 0:
+            raise ValueError("id_width must be >= 0")
+        self.path = os.fspath(path)
+        self.fsync_every = fsync_every
+        if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+            self._file = open(self.path, "r+b")
+            try:
+                existing_width, self._committed = _read_frk_header(self._file)
+                if existing_width != id_width:
+                    raise ValueError(f"id_width {id_width} does not match the file's id width {existing_width}")
+            except Exception:
+                self._file.close()
+                raise
+            self.id_width = existing_width
+            self._file.truncate(_FRK_HEADER.size + self._committed * self.record_size)
+            self._file.seek(0, os.SEEK_END)
+        else:
+            self._file = open(self.path, "w+b")
+            self.id_width = id_width
+            self._committed = 0
+            self._file.write(_FRK_HEADER.pack(_FRK_MAGIC, _FRK_FORMAT_VERSION, _FRACKTURE_PAYLOAD_LEN, id_width, 0))
+        self._count = self._committed
+    
+    @property
+    def record_size(self) -> int:
+        return _FRACKTURE_PAYLOAD_LEN + self.id_width
+    
+    def __len__(self):
+        return self._count
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def append(self, payload, record_id=b""):
+        """Append one compact payload (bytes or FrackturePayload) with an optional id."""
+        if isinstance(payload, FrackturePayload):
+            payload = payload.to_bytes()
+        if len(payload) != _FRACKTURE_PAYLOAD_LEN:
+            raise ValueError("compact payloads must be exactly 65 bytes")
+        self._file.write(bytes(payload) + _frk_id_bytes(record_id, self.id_width))
+        self._advance(1)
+    
+    def append_many(self, payloads, ids=None):
+        """
+        Append packed payloads in one write.
+        
+        Args:
+            payloads: (N, 65) uint8 array, PayloadArray, or concatenated payload bytes
+            ids: Optional sequence of N ids (bytes or str) or an (N, id_width) uint8 array
+        """
+        rows = _payload_rows(payloads)
+        n = rows.shape[0]
+        if self.id_width == 0 and ids is None:
+            self._file.write(np.ascontiguousarray(rows).tobytes())
+        else:
+            records = np.zeros((n, self.record_size), dtype=np.uint8)
+            records[:, :_FRACKTURE_PAYLOAD_LEN] = rows
+            if ids is not None:
+                if isinstance(ids, np.ndarray) and ids.dtype == np.uint8 and ids.ndim == 2:
+                    if ids.shape != (n, self.id_width):
+                        raise ValueError("ids array must have shape (N, id_width)")
+                    records[:, _FRACKTURE_PAYLOAD_LEN:] = ids
+                else:
+                    ids = list(ids)
+                    if len(ids) != n:
+                        raise ValueError("ids must have one entry per payload")
+                    blob = b"".join(_frk_id_bytes(i, self.id_width) for i in ids)
+                    records[:, _FRACKTURE_PAYLOAD_LEN:] = np.frombuffer(blob, dtype=np.uint8).reshape(n, self.id_width)
+            self._file.write(records.tobytes())
+        self._advance(n)
+    
+    def _advance(self, n: int):
+        before = self._count
+        self._count += n
+        if self.fsync_every and self._count // self.fsync_every != before // self.fsync_every:
+            self.sync()
+    
+    def sync(self):
+        """Flush and fsync pending records, then commit the record count to the header."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        if self._count != self._committed:
+            self._file.seek(_FRK_COUNT_OFFSET)
+            self._file.write(struct.pack("<Q", self._count))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.seek(0, os.SEEK_END)
+            self._committed = self._count
+    
+    def close(self):
+        if not self._file.closed:
+            try:
+                self.sync()
+            finally:
+                self._file.close()
+
+
+class FracktureFileReader:
+    """
+    Read-only, memory-mapped view of a .frk payload file.
+    
+    Opening only parses the 32-byte header and maps the file; `payloads` is a
+    PayloadArray over the mapping, so random access is O(1) and nothing is
+    deserialized until a row is used.
+    """
+    
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        with open(self.path, "rb") as f:
+            self.id_width, count = _read_frk_header(f)
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+        record_size = _FRACKTURE_PAYLOAD_LEN + self.id_width
+        if size < _FRK_HEADER.size + count * record_size:
+            raise ValueError("Invalid .frk file: fewer records than the header declares")
+        if count:
+            self._records = np.memmap(
+                self.path, dtype=np.uint8, mode="r", offset=_FRK_HEADER.size, shape=(count, record_size)
+            )
+        else:
+            self._records = np.empty((0, record_size), dtype=np.uint8)
+        self.payloads = PayloadArray(self._records[:, :_FRACKTURE_PAYLOAD_LEN])
+        self.ids = self._records[:, _FRACKTURE_PAYLOAD_LEN:]
+    
+    def __len__(self):
+        return len(self.payloads)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def get_id(self, index: int) -> bytes:
+        """Id of record `index` with its NUL padding removed."""
+        return self.ids[index].tobytes().rstrip(b"\x00")
+    
+    def close(self):
+        """Drop this reader's references to the mapping; views already handed out stay valid."""
+        self._records = self.ids = None
+        self.payloads = PayloadArray()
+
+
+def open_frk(path) -> FracktureFileReader:
+    """Open a .frk payload file for memory-mapped reading."""
+    return FracktureFileReader(path)
+
+
+### === Wire Framing === ###
+# Frame layout (little-endian):
+#   header  magic "FRKF", frame version (u8), flags (u8), reserved (u16), record count (u32)
+#   crc32   optional (flags bit 0) CRC32 of the header and records
+#   records count × 65-byte compact payloads
+_FRAME_MAGIC = b"FRKF"
+_FRAME_VERSION = 1
+_FRAME_HEADER = struct.Struct("<4sBBHI")
+_FRAME_CRC = struct.Struct("<I")
+_FRAME_FLAG_CRC = 0x01
+_FRAME_DEFAULT_RECORDS = 65536
+_FRAME_MAX_RECORDS = 1 << 24
+
+
+def _frame_header(count: int, crc: bool) -> bytes:
+    return _FRAME_HEADER.pack(_FRAME_MAGIC, _FRAME_VERSION, _FRAME_FLAG_CRC if crc else 0, 0, count)
+
+
+def _parse_frame_header(header, max_records: int):
+    """Return (record count, has_crc) for a frame header, validating it."""
+    magic, version, flags, _, count = _FRAME_HEADER.unpack(header)
+    if magic != _FRAME_MAGIC:
+        raise ValueError("Invalid payload frame: bad magic")
+    if version != _FRAME_VERSION:
+        raise ValueError(f"Unsupported payload frame version: {version}")
+    if count > max_records:
+        raise ValueError(f"Payload frame of {count} records exceeds max_records ({max_records})")
+    return count, bool(flags & _FRAME_FLAG_CRC)
+
+
+def _check_frame_crc(header, expected: int, body):
+    if zlib.crc32(body, zlib.crc32(header)) != expected:
+        raise ValueError("Payload frame failed CRC32 check")
+
+
+def encode_payload_frame(payloads, crc: bool = True) -> bytes:
+    """
+    Encode packed payloads as one wire frame.
+
+    Args:
+        payloads: (N, 65) uint8 array, PayloadArray, or concatenated payload bytes
+        crc: Include a CRC32 of the header and records
+
+    Returns:
+        bytes: Frame header, optional CRC32 and the N concatenated records
+    """
+    body = np.ascontiguousarray(_payload_rows(payloads)).tobytes()
+    header = _frame_header(len(body) // _FRACKTURE_PAYLOAD_LEN, crc)
+    if crc:
+        return header + _FRAME_CRC.pack(zlib.crc32(body, zlib.crc32(header))) + body
+    return header + body
+
+
+def write_payload_frames(sink, payloads, frame_records: int = _FRAME_DEFAULT_RECORDS, crc: bool = True) -> int:
+    """
+    Write packed payloads to a socket or binary stream as a sequence of frames.
+
+    Records are sent straight from the payload buffer; only strided inputs
+    (such as payloads read from a .frk file with ids) are copied per frame.
+
+    Args:
+        sink: Socket (uses `sendall`) or binary file-like object (uses `write`)
+        payloads: (N, 65) uint8 array, PayloadArray, or concatenated payload bytes
+        frame_records: Maximum records per frame
+        crc: Include a CRC32 in every frame
+
+    Returns:
+        int: Number of frames written
+    """
+    if not 1 <= frame_records <= _FRAME_MAX_RECORDS:
+        raise ValueError(f"frame_records must be between 1 and {_FRAME_MAX_RECORDS}")
+    send = sink.sendall if hasattr(sink, "sendall") else sink.write
+    rows = _payload_rows(payloads)
+    frames = 0
+    for start in range(0, rows.shape[0], frame_records):
+        body = memoryview(np.ascontiguousarray(rows[start : start + frame_records])).cast("B")
+        header = _frame_header(len(body) // _FRACKTURE_PAYLOAD_LEN, crc)
+        if crc:
+            header += _FRAME_CRC.pack(zlib.crc32(body, zlib.crc32(header)))
+        send(header)
+        send(body)
+        frames += 1
+    return frames
+
+
+def _read_exact(read_into, view) -> int:
+    """Fill `view` from a readinto/recv_into callable; returns the bytes read (short only at EOF)."""
+    got = 0
+    while got < len(view):
+        n = read_into(view[got:])
+        if not n:
+            break
+        got += n
+    return got
+
+
+def read_payload_frames(source, max_records: int = _FRAME_MAX_RECORDS):
+    """
+    Yield one PayloadArray per frame read from a socket or binary stream.
+
+    Each frame's records are received directly into a fresh buffer
+    (`recv_into` / `readinto`) that the yielded PayloadArray wraps, so no
+    record is copied after it arrives. The generator ends cleanly at EOF on a
+    frame boundary.
+
+    Args:
+        source: Socket, or binary file-like object with `readinto` (files, pipes, BytesIO)
+        max_records: Reject frames declaring more records than this
+
+    Raises:
+        ValueError: On a bad header, CRC mismatch or a stream that ends mid-frame
+    """
+    read_into = source.recv_into if hasattr(source, "recv_into") else source.readinto
+    header = bytearray(_FRAME_HEADER.size)
+    while True:
+        got = _read_exact(read_into, memoryview(header))
+        if got == 0:
+            return
+        if got < len(header):
+            raise ValueError("Truncated payload frame")
+        count, has_crc = _parse_frame_header(header, max_records)
+        expected = None
+        if has_crc:
+            crc_bytes = bytearray(_FRAME_CRC.size)
+            if _read_exact(read_into, memoryview(crc_bytes)) < len(crc_bytes):
+                raise ValueError("Truncated payload frame")
+            expected = _FRAME_CRC.unpack(crc_bytes)[0]
+        body = bytearray(count * _FRACKTURE_PAYLOAD_LEN)
+        if _read_exact(read_into, memoryview(body)) < len(body):
+            raise ValueError("Truncated payload frame")
+        if expected is not None:
+            _check_frame_crc(header, expected, body)
+        yield PayloadArray(body)
+
+
+class PayloadFrameDecoder:
+    """
+    Push-style incremental frame decoder for event loops and callbacks.
+
+    Feed it arbitrary chunks of the byte stream as they arrive; every frame
+    completed by a chunk comes back as a PayloadArray over that frame's
+    records. Partial frames are buffered until the rest arrives.
+
+    A corrupt frame (bad header or CRC) stays buffered. Frames completed
+    before it in the same chunk are still returned, and the error is raised
+    by the next `feed` or `close`; after that every call raises it again.
+    """
+
+    def __init__(self, max_records: int = _FRAME_MAX_RECORDS):
+        self.max_records = max_records
+        self._buffer = bytearray()
+        self._error = None
+
+    @property
+    def pending_bytes(self) -> int:
+        """Bytes buffered for a frame that is not complete yet."""
+        return len(self._buffer)
+
+    def feed(self, data) -> list:
+        """Add received bytes and return the PayloadArrays of all frames now complete."""
+        if self._error is not None:
+            raise self._error
+        buffer = self._buffer
+        buffer += data
+        spans = []  # (frame start, records start, records end, header or None)
+        pos = 0
+        error = None
+        try:
+            while len(buffer) - pos >= _FRAME_HEADER.size:
+                header = bytes(buffer[pos : pos + _FRAME_HEADER.size])
+                count, has_crc = _parse_frame_header(header, self.max_records)
+                start = pos + _FRAME_HEADER.size + (_FRAME_CRC.size if has_crc else 0)
+                end = start + count * _FRACKTURE_PAYLOAD_LEN
+                if len(buffer) < end:
+                    break
+                spans.append((pos, start, end, header if has_crc else None))
+                pos = end
+        except ValueError as e:
+            error = e
+
+        frames = []
+        if spans:
+            # Frames are views into the filled buffer, which is retired rather
+            # than compacted; only the trailing partial frame is copied out
+            consumed = memoryview(buffer).toreadonly()
+            for frame_start, start, end, header in spans:
+                if header is not None:
+                    try:
+                        expected = _FRAME_CRC.unpack_from(consumed, frame_start + _FRAME_HEADER.size)[0]
+                        _check_frame_crc(header, expected, consumed[start:end])
+                    except ValueError as e:
+                        error, pos = e, frame_start
+                        break
+                frames.append(PayloadArray(consumed[start:end]))
+            self._buffer = bytearray(consumed[pos:])
+        if error is not None:
+            self._error = error
+            if not frames:
+                raise error
+        return frames
+
+    def close(self):
+        """Signal end of stream; raises if a corrupt or partial frame is still buffered."""
+        if self._error is not None:
+            raise self._error
+        if self._buffer:
+            raise ValueError("Truncated payload frame")
+
+
+### === Compact Similarity Space === ###
+_COMPACT_REPEATS = _FRACKTURE_VECTOR_LEN // _SYMBOLIC_PERIOD
+
+
+def decompress_compact_vector(payload):
+    """
+    Reconstruct a payload in its 32-value compact form.
+
+    A reconstructed vector is its first 32 values tiled 24 times, so the
+    compact form carries the same information as `decompress_simple` at 1/24
+    the size: `expand_compact_vector(decompress_compact_vector(p))` equals
+    `decompress_simple(p)`.
+
+    Args:
+        payload: Compressed payload (bytes, FrackturePayload, or dict)
+
+    Returns:
+        np.ndarray: (32,) float32 compact vector
+    """
+    if isinstance(payload, FrackturePayload):
+        payload = payload.to_bytes()
+    if isinstance(payload, bytes) and len(payload) == _FRACKTURE_PAYLOAD_LEN:
+        return _reconstruct_periods(_payload_rows(payload))[0]
+    return frackture_v3_3_reconstruct(payload)[:_SYMBOLIC_PERIOD].copy()
+
+
+def decompress_compact_batch(payloads):
+    """
+    Reconstruct packed compact payloads in their 32-value compact form.
+
+    Args:
+        payloads: (N, 65) uint8 array or bytes-like buffer of concatenated payloads
+
+    Returns:
+        np.ndarray: (N, 32) float32 matrix; row i tiled 24 times equals
+            `frackture_v3_3_reconstruct_batch(payloads)[i]`
+    """
+    return _reconstruct_periods(_payload_rows(payloads))
+
+
+def expand_compact_vector(compact):
+    """Tile compact vectors (shape (..., 32)) back to full 768-length reconstructions."""
+    compact = np.asarray(compact)
+    if compact.shape[-1:] != (_SYMBOLIC_PERIOD,):
+        raise ValueError("compact vectors must have 32 values in the last axis")
+    return np.tile(compact, (1,) * (compact.ndim - 1) + (_COMPACT_REPEATS,))
+
+
+def _compact_pair(a, b):
+    a = np.asarray(a)
+    b = np.asarray(b)
+    if a.shape[-1:] != (_SYMBOLIC_PERIOD,) or b.shape[-1:] != (_SYMBOLIC_PERIOD,):
+        raise ValueError("compact vectors must have 32 values in the last axis")
+    return a, b
+
+
+def compact_dot(a, b):
+    """
+    Dot product of the full reconstructions, computed on compact vectors.
+
+    Broadcasts over leading axes, so a (32,) query against an (N, 32) matrix
+    returns (N,) scores.
+
+    Returns:
+        float64 scalar or array equal to `np.dot(expand(a), expand(b))`
+    """
+    a, b = _compact_pair(a, b)
+    return _COMPACT_REPEATS * np.einsum("...i,...i->...", a, b, dtype=np.float64)
+
+
+def compact_l2(a, b):
+    """Euclidean distance between the full reconstructions, computed on compact vectors."""
+    a, b = _compact_pair(a, b)
+    diff = a.astype(np.float64) - b
+    return np.sqrt(_COMPACT_REPEATS * np.einsum("...i,...i->...", diff, diff))
+
+
+def compact_cosine(a, b):
+    """
+    Cosine similarity between the full reconstructions, computed on compact vectors.
+
+    Tiling scales the dot product and both norms by the same factor, so cosine
+    on the compact form equals cosine on the 768-length vectors. Zero vectors
+    score 0.
+    """
+    a, b = _compact_pair(a, b)
+    dot = np.einsum("...i,...i->...", a, b, dtype=np.float64)
+    norms = np.sqrt(
+        np.einsum("...i,...i->...", a, a, dtype=np.float64) * np.einsum("...i,...i->...", b, b, dtype=np.float64)
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(norms > 0, dot / np.where(norms > 0, norms, 1.0), 0.0)[()]
+
+
+### === Reconstruction Cache === ###
+class ReconstructionCache:
+    """
+    Bounded, thread-safe LRU cache of reconstructed vectors keyed by compact payload bytes.
+    
+    Reconstruction is deterministic in the 65 payload bytes, so hot payloads
+    only need decoding once. Cached vectors are read-only and shared between
+    callers; pass `copy=True` (or an `out` buffer to `decompress_simple`) to
+    get a private, writable result. Dict payloads are decoded without caching,
+    since their unquantized entropy is not captured by compact bytes.
+    
+    Counters (`hits`, `misses`, `evictions`) are cumulative until `clear()`.
+    """
+    
+    def __init__(self, max_entries: int = 4096, max_bytes: Optional[int] = None):
+        """
+        Args:
+            max_entries: Maximum number of cached vectors
+            max_bytes: Optional cap on the total bytes of cached vectors
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        if max_bytes is not None and max_bytes < 0:
+            raise ValueError("max_bytes must be >= 0")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    @staticmethod
+    def _key(payload) -> Optional[bytes]:
+        if isinstance(payload, FrackturePayload):
+            return payload.to_bytes()
+        if isinstance(payload, bytes):
+            # Decoding ignores anything past the first 65 bytes
+            return payload[:_FRACKTURE_PAYLOAD_LEN]
+        # Dicts, and types the uncached path rejects, are left to frackture_v3_3_reconstruct
+        return None
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def __contains__(self, payload):
+        key = self._key(payload)
+        return key is not None and key in self._entries
+    
+    @property
+    def nbytes(self) -> int:
+        """Total bytes of the cached vectors."""
+        return self._bytes
+    
+    def get(self, payload, copy: bool = False) -> np.ndarray:
+        """
+        Reconstruct a payload, serving repeated payloads from the cache.
+        
+        Args:
+            payload: Compact payload bytes or FrackturePayload (dicts bypass the cache;
+                other types raise ValueError, as in `frackture_v3_3_reconstruct`)
+            copy: Return a writable copy instead of the shared read-only vector
+            
+        Returns:
+            np.ndarray: Reconstructed 768-length float32 vector
+        """
+        key = self._key(payload)
+        if key is None:
+            return frackture_v3_3_reconstruct(payload)
+        
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        
+        if vector is None:
+            # Decode outside the lock; a concurrent miss on the same key just re-inserts it
+            vector = frackture_v3_3_reconstruct(key)
+            vector.setflags(write=False)
+            self._insert(key, vector)
+        return vector.copy() if copy else vector
+    
+    def _insert(self, key: bytes, vector: np.ndarray):
+        size = vector.nbytes
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.nbytes
+            self._entries[key] = vector
+            self._bytes += size
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes is not None and self._bytes > self.max_bytes
+            ):
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self.evictions += 1
+    
+    def stats(self) -> Dict[str, int]:
+        """Snapshot of the counters and current size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+    
+    def clear(self):
+        """Drop all cached vectors and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+
+### === Exact Search Index === ###
+_INDEX_SEARCH_BLOCK = 65536        # corpus rows scored per block for a single query
+_INDEX_BATCH_SCORES = 1 << 22      # score-matrix elements per block for batch queries
+_INDEX_METRICS = ("cosine", "l2")
+_INDEX_KEY_TOLERANCE = 64 * float(np.finfo(np.float32).eps)  # relative bound on float32 key error
+
+
+def _index_compact(payloads) -> np.ndarray:
+    """
+    Normalize index input to an (N, 32) float32 matrix of compact vectors.
+
+    Accepts float arrays of compact vectors, a single payload, a list of
+    payloads (bytes, FrackturePayload, or dict), or anything
+    `decompress_compact_batch` reads (PayloadArray, packed rows, buffers).
+    """
+    if isinstance(payloads, np.ndarray) and payloads.dtype.kind == "f":
+        compact = np.atleast_2d(payloads)
+        if compact.ndim != 2 or compact.shape[1] != _SYMBOLIC_PERIOD:
+            raise ValueError("compact vectors must be an (N, 32) float array")
+        return compact.astype(np.float32, copy=False)
+    if isinstance(payloads, (bytes, FrackturePayload, dict)):
+        payloads = [payloads]
+    if isinstance(payloads, (list, tuple)):
+        if not payloads:
+            return np.zeros((0, _SYMBOLIC_PERIOD), dtype=np.float32)
+        if any(isinstance(p, dict) for p in payloads):
+            return np.stack([decompress_compact_vector(p) for p in payloads])
+        payloads = PayloadArray.from_payloads(payloads)
+    return decompress_compact_batch(payloads)
+
+
+def _index_queries(queries):
+    """
+    Fold queries onto the 32-value period.
+
+    A stored reconstruction is its compact vector tiled 24 times, so its dot
+    product with any 768-length query equals the dot product of the compact
+    vector with the query's 24 tiles summed. Full float queries need not be
+    periodic (e.g. a preprocessed input vector).
+
+    Returns:
+        tuple: (Q, 32) float64 folded queries and (Q,) float64 full squared norms
+    """
+    if isinstance(queries, np.ndarray) and queries.dtype.kind == "f" and queries.shape[-1:] == (_FRACKTURE_VECTOR_LEN,):
+        full = np.atleast_2d(queries).astype(np.float64)
+        if full.ndim != 2:
+            raise ValueError("query vectors must be a (Q, 768) or (Q, 32) float array")
+        folded = full.reshape(len(full), _COMPACT_REPEATS, _SYMBOLIC_PERIOD).sum(axis=1)
+        return folded, np.einsum("ij,ij->i", full, full)
+    compact = _index_compact(queries).astype(np.float64)
+    return _COMPACT_REPEATS * compact, _COMPACT_REPEATS * np.einsum("ij,ij->i", compact, compact)
+
+
+class FracktureIndex:
+    """
+    Exact top-k cosine / L2 search over stored payload reconstructions.
+
+    Items are kept in compact form (32 float32 values instead of 768, see
+    `decompress_compact_vector`) in one contiguous matrix with precomputed
+    norms. Queries are scored block by block in float32, every item within
+    the float32 error bound of the k-th best score is kept, and those are
+    re-scored exactly in float64, so results and scores match a brute-force
+    comparison of the full 768-length vectors even at near-ties.
+
+    Queries may be payloads, compact vectors, or arbitrary 768-length vectors.
+    Equal scores are ordered by insertion position.
+    """
+
+    def __init__(self, capacity: int = 0):
+        """
+        Args:
+            capacity: Number of items to preallocate room for
+        """
+        self._compact = np.empty((capacity, _SYMBOLIC_PERIOD), dtype=np.float32)
+        self._sqnorms = np.empty(capacity, dtype=np.float32)
+        self._inv_norms = np.empty(capacity, dtype=np.float32)
+        self._ids = np.empty(capacity, dtype=np.int64)
+        self._size = 0
+
+    @classmethod
+    def from_payloads(cls, payloads, ids=None) -> 'FracktureIndex':
+        """Build an index from payloads (e.g. `FracktureFileReader.payloads`) in one pass."""
+        compact = _index_compact(payloads)
+        index = cls(capacity=len(compact))
+        index.add(compact, ids)
+        return index
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def compact(self) -> np.ndarray:
+        """(N, 32) float32 compact vectors of the stored items."""
+        return self._compact[: self._size]
+
+    @property
+    def ids(self) -> np.ndarray:
+        """(N,) int64 ids of the stored items."""
+        return self._ids[: self._size]
+
+    def _reserve(self, needed: int):
+        capacity = len(self._ids)
+        if needed <= capacity:
+            return
+        capacity = max(needed, 2 * capacity, 1024)
+        for name in ("_compact", "_sqnorms", "_inv_norms", "_ids"):
+            old = getattr(self, name)
+            new = np.empty((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[: self._size] = old[: self._size]
+            setattr(self, name, new)
+
+    def add(self, payloads, ids=None) -> np.ndarray:
+        """
+        Add items to the index.
+
+        Args:
+            payloads: Payloads (see `_index_compact`) or an (N, 32) float array
+                of compact vectors
+            ids: Optional (N,) integer ids; defaults to insertion positions
+
+        Returns:
+            np.ndarray: (N,) int64 ids of the added items
+        """
+        compact = _index_compact(payloads)
+        n = len(compact)
+        start = self._size
+        if ids is None:
+            ids = np.arange(start, start + n, dtype=np.int64)
+        else:
+            ids = np.asarray(ids, dtype=np.int64)
+            if ids.shape != (n,):
+                raise ValueError("ids must have one entry per item")
+
+        self._reserve(start + n)
+        stop = start + n
+        sqnorms = _COMPACT_REPEATS * np.einsum("ij,ij->i", compact, compact, dtype=np.float64)
+        self._compact[start:stop] = compact
+        self._sqnorms[start:stop] = sqnorms
+        with np.errstate(divide="ignore"):
+            self._inv_norms[start:stop] = np.where(sqnorms > 0, 1.0 / np.sqrt(sqnorms), 0.0)
+        self._ids[start:stop] = ids
+        self._size = stop
+        return ids
+
+    def search(self, query, k: int = 10, metric: str = "cosine"):
+        """
+        Find the k stored items nearest to one query.
+
+        Args:
+            query: Payload, (32,) compact vector, or (768,) vector
+            k: Number of results (capped at the index size)
+            metric: "cosine" (highest first) or "l2" (smallest distance first)
+
+        Returns:
+            tuple: (k,) int64 ids and (k,) float64 scores
+        """
+        if isinstance(query, np.ndarray) and query.dtype.kind == "f" and query.ndim != 1:
+            raise ValueError("search takes a single query; use search_batch")
+        ids, scores = self.search_batch(query, k=k, metric=metric)
+        if len(ids) != 1:
+            raise ValueError("search takes a single query; use search_batch")
+        return ids[0], scores[0]
+
+    def search_batch(self, queries, k: int = 10, metric: str = "cosine"):
+        """
+        Find the k stored items nearest to each of Q queries in one pass.
+
+        Args:
+            queries: Payloads, (Q, 32) compact vectors, or (Q, 768) vectors
+            k: Number of results per query (capped at the index size)
+            metric: "cosine" (highest first) or "l2" (smallest distance first)
+
+        Returns:
+            tuple: (Q, k) int64 ids and (Q, k) float64 scores
+        """
+        if metric not in _INDEX_METRICS:
+            raise ValueError(f"metric must be one of {_INDEX_METRICS}")
+        if k < 0:
+            raise ValueError("k must be >= 0")
+        folded, query_sqnorms = _index_queries(queries)
+        num_queries = len(folded)
+        n = self._size
+        k = min(k, n)
+        if k == 0 or num_queries == 0:
+            return np.zeros((num_queries, 0), dtype=np.int64), np.zeros((num_queries, 0))
+
+        queries32 = folded.astype(np.float32)
+        # Bound on the float32 key error: keys within twice of it of the k-th
+        # best may be misordered, so all of them go on to exact re-scoring
+        folded_norms = np.sqrt(np.einsum("ij,ij->i", folded, folded))
+        if metric == "cosine":
+            bound = folded_norms / np.sqrt(_COMPACT_REPEATS)
+        else:
+            max_sqnorm = float(self._sqnorms[:n].max())
+            bound = max_sqnorm + 2.0 * folded_norms * np.sqrt(max_sqnorm / _COMPACT_REPEATS)
+        margin = (2.0 * _INDEX_KEY_TOLERANCE * bound).astype(np.float32)[:, None]
+
+        block = _INDEX_SEARCH_BLOCK if num_queries == 1 else max(1024, _INDEX_BATCH_SCORES // num_queries)
+        cand_q, cand_idx, cand_keys = [], [], []
+        for start in range(0, n, block):
+            stop = min(start + block, n)
+            dots = queries32 @ self._compact[start:stop].T
+            # Smaller key is better; the query norm is constant per row and drops out
+            if metric == "cosine":
+                keys = -(dots * self._inv_norms[start:stop])
+            else:
+                keys = self._sqnorms[start:stop] - 2.0 * dots
+            if stop - start > k:
+                keep = ~(keys > np.partition(keys, k - 1, axis=1)[:, k - 1 : k] + margin)
+            else:
+                keep = np.ones(keys.shape, dtype=bool)
+            rows, cols = np.nonzero(keep)
+            cand_q.append(rows)
+            cand_idx.append(cols + start)
+            cand_keys.append(keys[rows, cols])
+        q = np.concatenate(cand_q)
+        idx = np.concatenate(cand_idx)
+        keys = np.concatenate(cand_keys)
+
+        # Every query has at least k candidates; drop those outside the margin
+        # of its overall k-th best key
+        order = np.lexsort((keys, q))
+        q, idx, keys = q[order], idx[order], keys[order]
+        starts = np.searchsorted(q, np.arange(num_queries))
+        keep = ~(keys > keys[starts + k - 1][q] + margin[q, 0])
+        q, idx = q[keep], idx[keep]
+
+        # Exact float64 re-scoring of the survivors
+        compact = self._compact[idx].astype(np.float64)
+        dots = np.einsum("pj,pj->p", compact, folded[q])
+        sqnorms = _COMPACT_REPEATS * np.einsum("pj,pj->p", compact, compact)
+        if metric == "cosine":
+            denom = np.sqrt(query_sqnorms[q] * sqnorms)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                scores = np.where(denom > 0, dots / np.where(denom > 0, denom, 1.0), 0.0)
+            order = np.lexsort((idx, -scores, q))
+        else:
+            scores = np.sqrt(np.maximum(query_sqnorms[q] - 2.0 * dots + sqnorms, 0.0))
+            order = np.lexsort((idx, scores, q))
+        q, idx, scores = q[order], idx[order], scores[order]
+        top = np.arange(len(q)) - np.searchsorted(q, np.arange(num_queries))[q] < k
+        idx = idx[top].reshape(num_queries, k)
+        return self._ids[idx], scores[top].reshape(num_queries, k)
+
+
+### === Symbolic Hamming Index === ###
+_SYMBOLIC_WORDS = _SYMBOLIC_PERIOD // 8
+_HAMMING_MAX_PROBE_RADIUS = 2      # per-substring probe radius before falling back to a scan
+_POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _popcount_rows(words: np.ndarray) -> np.ndarray:
+    """Total set bits per row of an (N, W) uint64 array."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words).sum(axis=1, dtype=np.int64)
+    return _POPCOUNT_TABLE[words.view(np.uint8)].sum(axis=1, dtype=np.int64)
+
+
+def _index_symbolic(payloads) -> np.ndarray:
+    """
+    Normalize input to an (N, 32) uint8 matrix of symbolic fingerprints.
+
+    Accepts (N, 32) uint8 fingerprint arrays, a single payload, a list of
+    payloads (bytes, FrackturePayload, or dict), or anything `_payload_rows`
+    reads (PayloadArray, packed rows, buffers).
+    """
+    if isinstance(payloads, np.ndarray) and payloads.dtype == np.uint8 and payloads.shape[-1:] == (_SYMBOLIC_PERIOD,):
+        return np.atleast_2d(payloads)
+    if isinstance(payloads, (bytes, FrackturePayload, dict)):
+        payloads = [payloads]
+    if isinstance(payloads, (list, tuple)):
+        if not payloads:
+            return np.zeros((0, _SYMBOLIC_PERIOD), dtype=np.uint8)
+        if any(isinstance(p, dict) for p in payloads):
+            symbolic = []
+            for payload in payloads:
+                if isinstance(payload, dict):
+                    symbolic.append(bytes.fromhex(payload["symbolic"]))
+                else:
+                    symbolic.append(PayloadArray.from_payloads([payload]).symbolic[0].tobytes())
+            return np.frombuffer(b"".join(symbolic), dtype=np.uint8).reshape(-1, _SYMBOLIC_PERIOD)
+        payloads = PayloadArray.from_payloads(payloads)
+    return _payload_rows(payloads)[:, 1 : 1 + _SYMBOLIC_PERIOD]
+
+
+class SymbolicHammingIndex:
+    """
+    Near-duplicate lookup on the 256-bit symbolic fingerprint by Hamming distance.
+
+    Fingerprints are stored packed as four uint64 words per item. Radius
+    queries use multi-index hashing: the 256 bits are split into substrings
+    with one exact-match table per substring. Any fingerprint within distance
+    r of the query matches it to within r // m bits on at least one of the m
+    substrings, so probing each table for those few substring values yields
+    every true neighbour while touching only a small fraction of the index.
+    Candidates are then verified with a vectorized popcount.
+
+    Tables are rebuilt lazily on the first query after `add`, so bulk inserts
+    should be batched.
+    """
+
+    def __init__(self, substring_bits: int = 16):
+        """
+        Args:
+            substring_bits: Bits per hash-table substring (8 or 16)
+        """
+        if substring_bits not in (8, 16):
+            raise ValueError("substring_bits must be 8 or 16")
+        self.substring_bits = substring_bits
+        self.num_tables = 8 * _SYMBOLIC_PERIOD // substring_bits
+        self._words = np.empty((0, _SYMBOLIC_WORDS), dtype=np.uint64)
+        self._ids = np.empty(0, dtype=np.int64)
+        self._size = 0
+        self._tables = None
+        self._probe_masks = {}
+
+    @classmethod
+    def from_payloads(cls, payloads, ids=None, substring_bits: int = 16) -> 'SymbolicHammingIndex':
+        """Build an index from payloads or (N, 32) uint8 fingerprints in one pass."""
+        index = cls(substring_bits=substring_bits)
+        index.add(payloads, ids)
+        return index
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def fingerprints(self) -> np.ndarray:
+        """(N, 4) uint64 packed fingerprints of the stored items."""
+        return self._words[: self._size]
+
+    @property
+    def ids(self) -> np.ndarray:
+        """(N,) int64 ids of the stored items."""
+        return self._ids[: self._size]
+
+    def add(self, payloads, ids=None) -> np.ndarray:
+        """
+        Add items to the index.
+
+        Args:
+            payloads: Payloads or (N, 32) uint8 fingerprints (see `_index_symbolic`)
+            ids: Optional (N,) integer ids; defaults to insertion positions
+
+        Returns:
+            np.ndarray: (N,) int64 ids of the added items
+        """
+        words = self._pack(payloads)
+        n = len(words)
+        start, stop = self._size, self._size + n
+        if ids is None:
+            ids = np.arange(start, stop, dtype=np.int64)
+        else:
+            ids = np.asarray(ids, dtype=np.int64)
+            if ids.shape != (n,):
+                raise ValueError("ids must have one entry per item")
+
+        if stop > len(self._ids):
+            capacity = max(stop, 2 * len(self._ids), 1024)
+            grown_words = np.empty((capacity, _SYMBOLIC_WORDS), dtype=np.uint64)
+            grown_ids = np.empty(capacity, dtype=np.int64)
+            grown_words[:start] = self._words[:start]
+            grown_ids[:start] = self._ids[:start]
+            self._words, self._ids = grown_words, grown_ids
+        self._words[start:stop] = words
+        self._ids[start:stop] = ids
+        self._size = stop
+        self._tables = None
+        return ids
+
+    @staticmethod
+    def _pack(payloads) -> np.ndarray:
+        symbolic = np.ascontiguousarray(_index_symbolic(payloads))
+        return symbolic.view("<u8").astype(np.uint64, copy=False).reshape(-1, _SYMBOLIC_WORDS)
+
+    def _query_words(self, query) -> np.ndarray:
+        words = self._pack(query)
+        if len(words) != 1:
+            raise ValueError("expected a single query fingerprint")
+        return words[0]
+
+    def _substrings(self, words: np.ndarray) -> np.ndarray:
+        dtype = np.uint8 if self.substring_bits == 8 else np.dtype("<u2")
+        return np.ascontiguousarray(words).view(np.uint8).view(dtype).reshape(len(words), self.num_tables)
+
+    def _build_tables(self):
+        # One CSR table per substring: postings sorted by substring value, offsets by value
+        substrings = self._substrings(self.fingerprints)
+        index_dtype = np.int32 if self._size < 2**31 else np.int64
+        tables = []
+        for column in substrings.T:
+            postings = np.argsort(column, kind="stable").astype(index_dtype)
+            offsets = np.zeros((1 << self.substring_bits) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(column, minlength=1 << self.substring_bits), out=offsets[1:])
+            tables.append((offsets, postings))
+        self._tables = tables
+
+    def _masks(self, radius: int) -> np.ndarray:
+        """All substring XOR masks with at most `radius` bits set."""
+        masks = self._probe_masks.get(radius)
+        if masks is None:
+            values = np.arange(1 << self.substring_bits, dtype=np.uint32)
+            bits = _POPCOUNT_TABLE[values & 0xFF] + _POPCOUNT_TABLE[values >> 8]
+            masks = values[bits <= radius]
+            self._probe_masks[radius] = masks
+        return masks
+
+    def _candidates(self, query_words: np.ndarray, radius: int) -> np.ndarray:
+        if self._tables is None:
+            self._build_tables()
+        masks = self._masks(radius // self.num_tables)
+        found = []
+        for value, (offsets, postings) in zip(self._substrings(query_words[None])[0], self._tables):
+            probes = masks ^ int(value)
+            starts = offsets[probes]
+            counts = offsets[probes + 1] - starts
+            total = int(counts.sum())
+            if total:
+                # Concatenate the posting ranges without a Python loop
+                shift = starts - (np.cumsum(counts) - counts)
+                found.append(postings[np.arange(total) + np.repeat(shift, counts)])
+        if not found:
+            return np.zeros(0, dtype=np.int64)
+        return np.unique(np.concatenate(found))
+
+    def distances(self, query) -> np.ndarray:
+        """Hamming distance from one query fingerprint to every stored item, as (N,) int64."""
+        return _popcount_rows(self.fingerprints ^ self._query_words(query))
+
+    def radius(self, query, r: int):
+        """
+        Find every stored item within Hamming distance r of a query.
+
+        Args:
+            query: Payload or (32,) uint8 fingerprint
+            r: Maximum Hamming distance (inclusive)
+
+        Returns:
+            tuple: int64 ids and int64 distances, nearest first (ties by insertion position)
+        """
+        if r < 0:
+            raise ValueError("r must be >= 0")
+        query_words = self._query_words(query)
+        if r // self.num_tables > _HAMMING_MAX_PROBE_RADIUS:
+            # Probing would touch most of the index anyway
+            positions = np.arange(self._size)
+            dist = _popcount_rows(self.fingerprints ^ query_words)
+        else:
+            positions = self._candidates(query_words, r)
+            dist = _popcount_rows(self._words[positions] ^ query_words)
+        keep = dist <= r
+        positions, dist = positions[keep], dist[keep]
+        order = np.lexsort((positions, dist))
+        return self._ids[positions[order]], dist[order]
+
+
+### === Near-Duplicate Dedup === ###
+_DEDUP_SYMBOLIC_BANDS = 8          # 32-bit bands: fingerprints within 7 bits always share one
+_DEDUP_ENTROPY_BANDS = 4           # 4 quantized entropy values per band
+_DEDUP_KEY_BITS = 56
+_DEDUP_HASH_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+_DEDUP_MAX_BLOCK = 64              # keys shared by more representatives are ignored
+_DEDUP_MERGE_MIN = 1 << 16         # recent postings held in a dict before merging
+_DEDUP_SETTINGS = ("entropy_quantum", "max_block")  # persisted next to the state file
+
+
+def _dedup_block_keys(rows: np.ndarray, entropy_quantum: int) -> np.ndarray:
+    """
+    Blocking keys for packed payload rows, as an (N, 12) int64 array.
+
+    Each symbolic band is one 32-bit slice of the fingerprint; each entropy
+    band hashes four entropy values quantized by `entropy_quantum`. The band
+    number sits in the top byte so keys from different bands never collide.
+    """
+    n = rows.shape[0]
+    symbolic = np.ascontiguousarray(rows[:, 1 : 1 + _SYMBOLIC_PERIOD]).view("<u4").astype(np.uint64)
+    entropy = np.ascontiguousarray(rows[:, 1 + _SYMBOLIC_PERIOD :]).view("<u2").astype(np.uint64)
+    quantized = (entropy // np.uint64(entropy_quantum)).reshape(n, _DEDUP_ENTROPY_BANDS, _FRACKTURE_ENTROPY_LEN // _DEDUP_ENTROPY_BANDS)
+    mixed = np.zeros((n, _DEDUP_ENTROPY_BANDS), dtype=np.uint64)
+    for column in range(quantized.shape[2]):
+        mixed = (mixed ^ quantized[:, :, column]) * _DEDUP_HASH_MULTIPLIER
+    keys = np.concatenate([symbolic, mixed & np.uint64((1 << _DEDUP_KEY_BITS) - 1)], axis=1)
+    keys |= np.arange(keys.shape[1], dtype=np.uint64) << np.uint64(_DEDUP_KEY_BITS)
+    return keys.astype(np.int64)
+
+
+class DedupEngine:
+    """
+    Streaming near-duplicate clustering of compact payloads.
+
+    Each item added is assigned a cluster number in three stages:
+
+    1. Exact lookup of the 65 payload bytes among every unique payload seen.
+    2. Candidate generation by blocking: cluster representatives sharing a
+       symbolic-channel band (32 bits of the fingerprint) or an entropy-channel
+       bucket (four entropy values quantized by `entropy_quantum`) with the item.
+    3. Verification by L2 distance between full reconstructions (computed on
+       the compact form); the item joins the nearest candidate within
+       `threshold`, or starts a new cluster as its representative.
+
+    Keys shared by more than `max_block` representatives are too common to be
+    informative and are ignored, so work per item is bounded no matter how
+    many items are stored. Blocking is approximate: a near duplicate sharing
+    no informative key with its representative starts its own cluster.
+    Assignments depend only on the order items arrive in, not on how they
+    are split across `add` calls.
+
+    Postings live in sorted arrays (16 bytes per representative and key),
+    with recent inserts held in a dict until they are merged in bulk.
+
+    With `path`, every unique payload is appended with its cluster number to a
+    .frk file (8-byte little-endian ids), and reopening the same path restores
+    the exact-match table, representatives and cluster numbering, so
+    assignments stay consistent across runs. `entropy_quantum` and `max_block`
+    shape the restored postings, so they are recorded in `<path>.json` and
+    reopening with different values raises ValueError.
+    """
+
+    def __init__(self, threshold: float = 2.0, path=None, entropy_quantum: int = 1024,
+                 max_block: int = _DEDUP_MAX_BLOCK, fsync_every: int = _FRK_DEFAULT_FSYNC_EVERY):
+        """
+        Args:
+            threshold: Maximum L2 distance between reconstructions for a near duplicate
+            path: Optional .frk file to persist state to (created or resumed)
+            entropy_quantum: Quantization step for entropy-channel buckets
+            max_block: Representatives a blocking key may have before it is ignored
+            fsync_every: Records between automatic syncs of the state file
+        """
+        if threshold < 0:
+            raise ValueError("threshold must be >= 0")
+        if entropy_quantum < 1:
+            raise ValueError("entropy_quantum must be at least 1")
+        if max_block < 1:
+            raise ValueError("max_block must be at least 1")
+        self.threshold = threshold
+        self.entropy_quantum = entropy_quantum
+        self.max_block = max_block
+        self._exact = {}
+        self._reps = np.empty((0, _FRACKTURE_PAYLOAD_LEN), dtype=np.uint8)
+        self._rep_compact = np.empty((0, _SYMBOLIC_PERIOD), dtype=np.float32)
+        self._num_clusters = 0
+        # Postings sorted by (key, cluster), plus recent ones not merged yet
+        self._posting_keys = np.empty(0, dtype=np.int64)
+        self._posting_reps = np.empty(0, dtype=np.int64)
+        self._recent = {}
+        self._recent_count = 0
+        self.items = 0
+        self.exact_duplicates = 0
+        self.near_duplicates = 0
+
+        self._writer = None
+        if path is not None:
+            settings = {name: getattr(self, name) for name in _DEDUP_SETTINGS}
+            settings_path = os.fspath(path) + ".json"
+            if os.path.exists(path) and os.path.getsize(path) > 0:
+                if os.path.exists(settings_path):
+                    with open(settings_path) as f:
+                        saved = json.load(f)
+                    for name in _DEDUP_SETTINGS:
+                        if saved.get(name) != settings[name]:
+                            raise ValueError(
+                                f"{name}={settings[name]} does not match the state file's {name}={saved.get(name)}"
+                            )
+                self._restore(path)
+            # Renamed into place so a crash never leaves a partial settings file
+            with open(settings_path + ".tmp", "w") as f:
+                json.dump(settings, f)
+            os.replace(settings_path + ".tmp", settings_path)
+            self._writer = FracktureFileWriter(path, id_width=8, fsync_every=fsync_every)
+
+    def _restore(self, path):
+        with FracktureFileReader(path) as reader:
+            if reader.id_width != 8:
+                raise ValueError("not a dedup state file: expected 8-byte cluster ids")
+            rows = np.array(reader.payloads.rows)
+            clusters = np.ascontiguousarray(reader.ids).view("<i8").ravel().astype(np.int64)
+        # Clusters are numbered in creation order and each representative is written first
+        next_cluster = np.maximum.accumulate(np.concatenate([[-1], clusters[:-1]])) + 1
+        if np.any(clusters < 0) or np.any(clusters > next_cluster):
+            raise ValueError("corrupt dedup state file: cluster numbers out of order")
+        reps = rows[clusters == next_cluster]
+        blob = rows.tobytes()
+        self._exact = {
+            blob[i * _FRACKTURE_PAYLOAD_LEN : (i + 1) * _FRACKTURE_PAYLOAD_LEN]: cluster
+            for i, cluster in enumerate(clusters.tolist())
+        }
+        self._store_representatives(reps, decompress_compact_batch(reps))
+
+        # Bulk-build the postings, keeping the earliest max_block + 1 clusters per key
+        # (one past the limit marks the key as ignored), as sequential inserts would
+        keys = _dedup_block_keys(reps, self.entropy_quantum).ravel()
+        owners = np.repeat(np.arange(len(reps), dtype=np.int64), _DEDUP_SYMBOLIC_BANDS + _DEDUP_ENTROPY_BANDS)
+        order = np.lexsort((owners, keys))
+        keys, owners = keys[order], owners[order]
+        group_head = np.ones(len(keys), dtype=bool)
+        group_head[1:] = keys[1:] != keys[:-1]
+        positions = np.arange(len(keys))
+        rank = positions - np.maximum.accumulate(np.where(group_head, positions, 0))
+        keep = rank <= self.max_block
+        self._posting_keys, self._posting_reps = keys[keep], owners[keep]
+
+    def _store_representatives(self, rows: np.ndarray, compact: np.ndarray):
+        start = self._num_clusters
+        stop = start + len(rows)
+        if stop > len(self._reps):
+            capacity = max(stop, 2 * len(self._reps), 1024)
+            grown_reps = np.empty((capacity, _FRACKTURE_PAYLOAD_LEN), dtype=np.uint8)
+            grown_compact = np.empty((capacity, _SYMBOLIC_PERIOD), dtype=np.float32)
+            grown_reps[:start] = self._reps[:start]
+            grown_compact[:start] = self._rep_compact[:start]
+            self._reps, self._rep_compact = grown_reps, grown_compact
+        self._reps[start:stop] = rows
+        self._rep_compact[start:stop] = compact
+        self._num_clusters = stop
+
+    def _merge_recent(self):
+        """Fold the recent-postings dict into the sorted arrays."""
+        if not self._recent:
+            return
+        lists = list(self._recent.values())
+        keys = np.repeat(np.fromiter(self._recent.keys(), dtype=np.int64, count=len(lists)), [len(m) for m in lists])
+        reps = np.fromiter(itertools.chain.from_iterable(lists), dtype=np.int64, count=len(keys))
+        order = np.argsort(keys, kind="stable")
+        keys, reps = keys[order], reps[order]
+        # Recent clusters are newer than every merged one, so inserting to the right keeps (key, cluster) order
+        positions = np.searchsorted(self._posting_keys, keys, side="right")
+        self._posting_keys = np.insert(self._posting_keys, positions, keys)
+        self._posting_reps = np.insert(self._posting_reps, positions, reps)
+        self._recent = {}
+        self._recent_count = 0
+
+    @property
+    def num_clusters(self) -> int:
+        return self._num_clusters
+
+    @property
+    def representatives(self) -> PayloadArray:
+        """Representative payload of each cluster; row k is cluster k's first item."""
+        return PayloadArray(self._reps[: self._num_clusters])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def add(self, payloads) -> np.ndarray:
+        """
+        Assign each payload to a cluster, creating clusters as needed.
+
+        Args:
+            payloads: Compact payloads (list of bytes/FrackturePayload, PayloadArray,
+                packed (N, 65) rows, or concatenated bytes)
+
+        Returns:
+            np.ndarray: (N,) int64 cluster numbers, in input order
+        """
+        if isinstance(payloads, FrackturePayload):
+            payloads = [payloads]
+        if isinstance(payloads, (list, tuple)):
+            payloads = PayloadArray.from_payloads(payloads)
+        rows = _payload_rows(payloads)
+        n = rows.shape[0]
+        clusters = np.empty(n, dtype=np.int64)
+        if n == 0:
+            return clusters
+        validate_payload_batch(rows, raise_on_error=True)
+
+        blob = np.ascontiguousarray(rows).tobytes()
+        payloads = [blob[i * _FRACKTURE_PAYLOAD_LEN : (i + 1) * _FRACKTURE_PAYLOAD_LEN] for i in range(n)]
+        exact, recent = self._exact, self._recent
+        pending = []
+        for i, payload in enumerate(payloads):
+            cluster = exact.get(payload)
+            if cluster is None:
+                pending.append(i)
+            else:
+                clusters[i] = cluster
+        self.exact_duplicates += n - len(pending)
+
+        pending_rows = rows[pending]
+        compact = decompress_compact_batch(pending_rows)
+        keys = _dedup_block_keys(pending_rows, self.entropy_quantum)
+        # The merged postings do not change during this call, so look them all up at once
+        lows = np.searchsorted(self._posting_keys, keys, side="left").tolist()
+        highs = np.searchsorted(self._posting_keys, keys, side="right").tolist()
+        keys = keys.tolist()
+        posting_reps = self._posting_reps
+        threshold_sq = self.threshold**2 / _COMPACT_REPEATS
+        max_block = self.max_block
+        new_rows, new_clusters = [], []
+        for j, i in enumerate(pending):
+            payload = payloads[i]
+            cluster = exact.get(payload)
+            if cluster is not None:
+                # Repeated within this batch
+                self.exact_duplicates += 1
+                clusters[i] = cluster
+                continue
+
+            parts = []
+            for key, low, high in zip(keys[j], lows[j], highs[j]):
+                members = recent.get(key, ())
+                if high - low + len(members) <= max_block:
+                    if high > low:
+                        parts.append(posting_reps[low:high])
+                    if members:
+                        parts.append(members)
+            cluster = -1
+            if parts:
+                candidates = np.unique(np.concatenate(parts))
+                diff = self._rep_compact[candidates] - compact[j]
+                dist_sq = np.einsum("ij,ij->i", diff, diff, dtype=np.float64)
+                best = int(np.argmin(dist_sq))
+                if dist_sq[best] <= threshold_sq:
+                    cluster = int(candidates[best])
+                    self.near_duplicates += 1
+            if cluster < 0:
+                cluster = self._num_clusters
+                self._store_representatives(pending_rows[j : j + 1], compact[j : j + 1])
+                for key, low, high in zip(keys[j], lows[j], highs[j]):
+                    # One past the limit is enough to mark the key as ignored
+                    if high - low + len(recent.get(key, ())) <= max_block:
+                        recent.setdefault(key, []).append(cluster)
+                        self._recent_count += 1
+
+            exact[payload] = cluster
+            clusters[i] = cluster
+            new_rows.append(i)
+            new_clusters.append(cluster)
+
+        self.items += n
+        if self._recent_count >= max(_DEDUP_MERGE_MIN, len(self._posting_keys) // 8):
+            self._merge_recent()
+        if self._writer is not None and new_rows:
+            ids = np.array(new_clusters, dtype="<i8").view(np.uint8).reshape(-1, 8)
+            self._writer.append_many(rows[new_rows], ids)
+        return clusters
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for this session plus the current table sizes."""
+        return {
+            "items": self.items,
+            "exact_duplicates": self.exact_duplicates,
+            "near_duplicates": self.near_duplicates,
+            "clusters": self._num_clusters,
+            "unique_payloads": len(self._exact),
+        }
+
+    def sync(self):
+        """Make everything added so far durable in the state file."""
+        if self._writer is not None:
+            self._writer.sync()
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+### === Entropy KD-Tree === ###
+_KDTREE_LEAF_SIZE = 64
+
+
+def _index_entropy(payloads) -> np.ndarray:
+    """
+    Normalize input to an (N, 16) uint16 matrix of quantized entropy values.
+
+    Accepts integer arrays or lists of 16-value entropy vectors (e.g.
+    `FrackturePayload.entropy`), a single payload, a list of payloads (bytes
+    or FrackturePayload), a FracktureFileReader, or anything `_payload_rows`
+    reads (PayloadArray, packed rows, buffers).
+    """
+    if isinstance(payloads, FracktureFileReader):
+        payloads = payloads.payloads
+    if isinstance(payloads, (bytes, FrackturePayload)):
+        payloads = [payloads]
+    if isinstance(payloads, (list, tuple)):
+        if payloads and isinstance(payloads[0], (bytes, FrackturePayload)):
+            return PayloadArray.from_payloads(payloads).entropy
+        values = np.asarray(payloads)
+    elif isinstance(payloads, np.ndarray) and payloads.shape[-1:] == (_FRACKTURE_ENTROPY_LEN,):
+        values = payloads
+    else:
+        return PayloadArray(_payload_rows(payloads)).entropy
+
+    if values.size == 0:
+        return np.zeros((0, _FRACKTURE_ENTROPY_LEN), dtype=np.uint16)
+    values = np.atleast_2d(values)
+    if values.ndim != 2 or values.shape[1] != _FRACKTURE_ENTROPY_LEN or values.dtype.kind not in "iu":
+        raise ValueError("entropy vectors must be integer arrays with 16 values per row")
+    if values.min() < 0 or values.max() > 65535:
+        raise ValueError("quantized entropy values must be in [0, 65535]")
+    return values.astype(np.uint16, copy=False)
+
+
+class EntropyKDTree:
+    """
+    Exact radius and k-nearest search over the 16 quantized entropy values.
+
+    Distances are Euclidean in quantized units (the uint16 values stored in
+    payloads, i.e. entropy features times 1000) and are computed exactly in
+    integer arithmetic.
+
+    The tree is a balanced implicit binary tree: every node splits its points
+    at the median of its widest dimension, all leaves sit at the same depth
+    and hold between `leaf_size` and 2 * `leaf_size` points, and every node
+    keeps a bounding box. Queries walk the tree one level at a time, pruning
+    the whole frontier of nodes against the query with vectorized box
+    distances, then scan the surviving leaves. A k-nearest query scans the
+    query's own leaf (or the smallest enclosing subtree with k points) for an
+    upper bound and runs a radius query with it.
+
+    Points are copied into tree order as uint16 (32 bytes each, plus 8 for
+    the original position), so building from a memory-mapped .frk file reads
+    only the entropy columns.
+    """
+
+    def __init__(self, payloads, ids=None, leaf_size: int = _KDTREE_LEAF_SIZE):
+        """
+        Args:
+            payloads: Payloads or (N, 16) entropy vectors (see `_index_entropy`)
+            ids: Optional (N,) integer ids; defaults to positions in `payloads`
+            leaf_size: Minimum points per leaf
+        """
+        if leaf_size < 1:
+            raise ValueError("leaf_size must be at least 1")
+        points = np.array(_index_entropy(payloads), dtype=np.uint16)
+        n = len(points)
+        if ids is None:
+            ids = np.arange(n, dtype=np.int64)
+        else:
+            ids = np.asarray(ids, dtype=np.int64)
+            if ids.shape != (n,):
+                raise ValueError("ids must have one entry per item")
+        self.leaf_size = leaf_size
+        self.depth = (n // leaf_size).bit_length() - 1 if n >= leaf_size else 0
+        self._points = points
+        self._ids = ids.copy()
+        self._build()
+
+    @classmethod
+    def from_frk(cls, path, leaf_size: int = _KDTREE_LEAF_SIZE) -> 'EntropyKDTree':
+        """Build a tree over a .frk file's entropy columns; ids are record numbers."""
+        with FracktureFileReader(path) as reader:
+            return cls(reader.payloads.entropy, leaf_size=leaf_size)
+
+    def __len__(self):
+        return len(self._points)
+
+    def _build(self):
+        points, ids = self._points, self._ids
+        # bounds[level][j] is where node j of that level starts
+        bounds = [np.array([0, len(points)], dtype=np.int64)]
+        for _ in range(self.depth):
+            edges = bounds[-1]
+            split = np.empty(2 * len(edges) - 1, dtype=np.int64)
+            split[0::2] = edges
+            split[1::2] = (edges[:-1] + edges[1:]) // 2
+            for start, mid, stop in zip(edges[:-1].tolist(), split[1::2].tolist(), edges[1:].tolist()):
+                block = points[start:stop]
+                dim = int(np.argmax(block.max(axis=0).astype(np.int32) - block.min(axis=0)))
+                order = np.argpartition(block[:, dim], mid - start)
+                points[start:stop] = block[order]
+                ids[start:stop] = ids[start:stop][order]
+            bounds.append(split)
+        self._leaf_bounds = bounds[-1]
+        self._node_sizes = np.concatenate([np.diff(b) for b in bounds])
+
+        # Bounding boxes in heap order: node i has children 2i + 1 and 2i + 2
+        num_leaves = 1 << self.depth
+        lows = np.zeros((2 * num_leaves - 1, _FRACKTURE_ENTROPY_LEN), dtype=np.uint16)
+        highs = np.zeros_like(lows)
+        if len(points):
+            lows[num_leaves - 1 :] = np.minimum.reduceat(points, self._leaf_bounds[:-1], axis=0)
+            highs[num_leaves - 1 :] = np.maximum.reduceat(points, self._leaf_bounds[:-1], axis=0)
+        for level in range(self.depth - 1, -1, -1):
+            nodes = np.arange((1 << level) - 1, (1 << (level + 1)) - 1)
+            lows[nodes] = np.minimum(lows[2 * nodes + 1], lows[2 * nodes + 2])
+            highs[nodes] = np.maximum(highs[2 * nodes + 1], highs[2 * nodes + 2])
+        self._lows, self._highs = lows, highs
+
+    def _query_point(self, query) -> np.ndarray:
+        point = _index_entropy(query)
+        if len(point) != 1:
+            raise ValueError("expected a single query")
+        return point[0].astype(np.int64)
+
+    def _box_distances(self, point: np.ndarray, nodes: np.ndarray) -> np.ndarray:
+        """Squared distance from the point to each node's bounding box."""
+        below = self._lows[nodes] - point
+        above = point - self._highs[nodes]
+        gap = np.maximum(np.maximum(below, above), 0)
+        return np.einsum("ij,ij->i", gap, gap)
+
+    def _node_range(self, node: int):
+        level = (node + 1).bit_length() - 1
+        edges = self._leaf_bounds[:: 1 << (self.depth - level)]
+        j = node - ((1 << level) - 1)
+        return int(edges[j]), int(edges[j + 1])
+
+    def _within(self, point: np.ndarray, radius_sq: int):
+        """Tree positions and squared distances of points within the squared radius."""
+        frontier = np.zeros(1, dtype=np.int64)
+        frontier = frontier[self._box_distances(point, frontier) <= radius_sq]
+        for _ in range(self.depth):
+            if not len(frontier):
+                break
+            children = np.concatenate([2 * frontier + 1, 2 * frontier + 2])
+            frontier = np.sort(children[self._box_distances(point, children) <= radius_sq])
+        leaves = frontier - ((1 << self.depth) - 1)
+        starts = self._leaf_bounds[leaves]
+        counts = self._leaf_bounds[leaves + 1] - starts
+        total = int(counts.sum())
+        positions = np.arange(total) + np.repeat(starts - (np.cumsum(counts) - counts), counts)
+        diff = self._points[positions].astype(np.int64) - point
+        dist_sq = np.einsum("ij,ij->i", diff, diff)
+        keep = dist_sq <= radius_sq
+        return positions[keep], dist_sq[keep]
+
+    def _results(self, positions: np.ndarray, dist_sq: np.ndarray, limit: Optional[int] = None):
+        ids = self._ids[positions]
+        order = np.lexsort((ids, dist_sq))[:limit]
+        return ids[order], np.sqrt(dist_sq[order].astype(np.float64))
+
+    def radius(self, query, r: float):
+        """
+        Find every stored item within distance r of a query.
+
+        Args:
+            query: Payload or 16-value entropy vector
+            r: Maximum Euclidean distance in quantized units (inclusive)
+
+        Returns:
+            tuple: int64 ids and float64 distances, nearest first (ties by id)
+        """
+        if r < 0:
+            raise ValueError("r must be >= 0")
+        point = self._query_point(query)
+        if not len(self):
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        # Squared distances are integers, so the float radius becomes an exact integer bound
+        return self._results(*self._within(point, int(math.floor(r * r + 1e-9))))
+
+    def knn(self, query, k: int = 10):
+        """
+        Find the k stored items nearest to a query.
+
+        Args:
+            query: Payload or 16-value entropy vector
+            k: Number of results (capped at the tree size)
+
+        Returns:
+            tuple: (k,) int64 ids and (k,) float64 distances, nearest first (ties by id)
+        """
+        if k < 0:
+            raise ValueError("k must be >= 0")
+        point = self._query_point(query)
+        k = min(k, len(self))
+        if k == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+
+        # Descend towards the query, remembering the deepest node holding at least k points
+        node = seed = 0
+        for level in range(self.depth):
+            children = np.array([2 * node + 1, 2 * node + 2])
+            node = int(children[np.argmin(self._box_distances(point, children))])
+            if self._node_sizes[node] >= k:
+                seed = node
+        start, stop = self._node_range(seed)
+        diff = self._points[start:stop].astype(np.int64) - point
+        bound = int(np.partition(np.einsum("ij,ij->i", diff, diff), k - 1)[k - 1])
+        return self._results(*self._within(point, bound), limit=k)
+
+
+### === LSH Index === ###
+_LSH_HASH_BLOCK = 65536            # items projected per block when hashing
+_LSH_MERGE_MIN = 1 << 16           # tail-run size that triggers a merge into the main run
+_LSH_FORMAT = 1
+_LSH_ARRAYS = ("planes", "center", "compact", "ids", "table_keys", "table_positions")
+
+
+def _lsh_positions_dtype(size: int):
+    return np.dtype(np.uint32) if size <= 2**32 else np.dtype(np.int64)
+
+
+class CosineLSHIndex:
+    """
+    Approximate top-k cosine search over reconstructions with random-hyperplane LSH.
+
+    Each of `num_tables` tables hashes an item to `bits_per_table` sign bits,
+    one per random hyperplane through the corpus centre. Items whose
+    reconstructions point in similar directions collide in at least one table
+    with high probability, so a query only re-ranks the items sharing one of
+    its buckets. Re-ranking is exact: returned scores equal
+    `FracktureIndex.search` scores for the same items.
+
+    Reconstructions are their compact vector tiled 24 times, so a hyperplane
+    h in 768 dimensions splits them exactly as its 24 tiles summed split the
+    compact vectors, and summed Gaussian tiles are again isotropic Gaussian.
+    Hyperplanes are therefore drawn directly in the 32-dimensional compact
+    space. Every reconstruction has non-negative values, so hyperplanes
+    through the origin would put nearly all items in one bucket; hashing is
+    done relative to `center`, by default the mean compact vector of the
+    first batch added.
+
+    Buckets are stored as sorted code arrays with matching item positions,
+    one row per table. Inserts go to a small sorted tail run that is merged
+    into the main run once it grows past an eighth of it, so incremental
+    adds stay cheap and lookups are two binary searches per probed bucket.
+    """
+
+    def __init__(self, num_tables: int = 16, bits_per_table: int = 12, seed: int = 0, center=None):
+        """
+        Args:
+            num_tables: Number of hash tables
+            bits_per_table: Hyperplanes (code bits) per table, 1 to 64
+            seed: Seed for drawing the hyperplanes
+            center: Optional (32,) compact vector to hash around; defaults to
+                the mean of the first batch added
+        """
+        if num_tables < 1:
+            raise ValueError("num_tables must be at least 1")
+        if not 1 <= bits_per_table <= 64:
+            raise ValueError("bits_per_table must be between 1 and 64")
+        self.num_tables = num_tables
+        self.bits_per_table = bits_per_table
+        self.seed = seed
+        rng = np.random.default_rng(seed)
+        self._planes = rng.standard_normal((num_tables * bits_per_table, _SYMBOLIC_PERIOD))
+        self._center = None if center is None else self._check_center(center)
+        self._code_dtype = np.min_scalar_type((1 << bits_per_table) - 1)
+        self._weights = np.left_shift(np.uint64(1), np.arange(bits_per_table, dtype=np.uint64)).astype(self._code_dtype)
+        self._compact = np.empty((0, _SYMBOLIC_PERIOD), dtype=np.float32)
+        self._ids = np.empty(0, dtype=np.int64)
+        self._size = 0
+        empty = (np.empty((num_tables, 0), dtype=self._code_dtype), np.empty((num_tables, 0), dtype=np.uint32))
+        self._main = self._tail = empty
+
+    @staticmethod
+    def _check_center(center) -> np.ndarray:
+        center = np.asarray(center, dtype=np.float64)
+        if center.shape != (_SYMBOLIC_PERIOD,):
+            raise ValueError("center must be a (32,) compact vector")
+        return center
+
+    @classmethod
+    def from_payloads(cls, payloads, ids=None, **kwargs) -> 'CosineLSHIndex':
+        """Build an index from payloads or (N, 32) compact vectors in one pass."""
+        index = cls(**kwargs)
+        index.add(payloads, ids)
+        return index
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def compact(self) -> np.ndarray:
+        """(N, 32) float32 compact vectors of the stored items."""
+        return self._compact[: self._size]
+
+    @property
+    def ids(self) -> np.ndarray:
+        """(N,) int64 ids of the stored items."""
+        return self._ids[: self._size]
+
+    @property
+    def center(self) -> Optional[np.ndarray]:
+        """(32,) compact vector the hyperplanes pass through (None until fitted)."""
+        return self._center
+
+    def _margins(self, compact: np.ndarray) -> np.ndarray:
+        """(N, num_tables, bits_per_table) signed distances to the hyperplanes."""
+        projected = (compact.astype(np.float64) - self._center) @ self._planes.T
+        return projected.reshape(len(compact), self.num_tables, self.bits_per_table)
+
+    def _codes(self, compact: np.ndarray) -> np.ndarray:
+        """(N, num_tables) bucket codes of compact vectors."""
+        codes = np.empty((len(compact), self.num_tables), dtype=self._code_dtype)
+        for start in range(0, len(compact), _LSH_HASH_BLOCK):
+            bits = self._margins(compact[start : start + _LSH_HASH_BLOCK]) > 0
+            codes[start : start + len(bits)] = np.bitwise_or.reduce(bits * self._weights, axis=2)
+        return codes
+
+    def _reserve(self, needed: int):
+        capacity = len(self._ids)
+        if needed <= capacity:
+            return
+        capacity = max(needed, 2 * capacity, 1024)
+        for name in ("_compact", "_ids"):
+            old = getattr(self, name)
+            new = np.empty((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[: self._size] = old[: self._size]
+            setattr(self, name, new)
+
+    @staticmethod
+    def _merge_runs(run, other, positions_dtype):
+        """Merge two sorted runs; every position in `other` is newer than those in `run`."""
+        keys, positions = run
+        other_keys, other_positions = other
+        if not other_keys.shape[1]:
+            return keys, positions.astype(positions_dtype, copy=False)
+        merged_keys = np.empty((len(keys), keys.shape[1] + other_keys.shape[1]), dtype=keys.dtype)
+        merged_positions = np.empty(merged_keys.shape, dtype=positions_dtype)
+        for t in range(len(keys)):
+            # Inserting to the right keeps (code, position) order within each bucket
+            at = np.searchsorted(keys[t], other_keys[t], side="right")
+            merged_keys[t] = np.insert(keys[t], at, other_keys[t])
+            merged_positions[t] = np.insert(positions[t].astype(positions_dtype), at, other_positions[t])
+        return merged_keys, merged_positions
+
+    def add(self, payloads, ids=None) -> np.ndarray:
+        """
+        Add items to the index.
+
+        Args:
+            payloads: Payloads (see `_index_compact`) or an (N, 32) float array
+                of compact vectors
+            ids: Optional (N,) integer ids; defaults to insertion positions
+
+        Returns:
+            np.ndarray: (N,) int64 ids of the added items
+        """
+        compact = _index_compact(payloads)
+        n = len(compact)
+        start, stop = self._size, self._size + n
+        if ids is None:
+            ids = np.arange(start, stop, dtype=np.int64)
+        else:
+            ids = np.asarray(ids, dtype=np.int64)
+            if ids.shape != (n,):
+                raise ValueError("ids must have one entry per item")
+        if n == 0:
+            return ids
+        if self._center is None:
+            self._center = compact.mean(axis=0, dtype=np.float64)
+
+        codes = self._codes(compact).T
+        order = np.argsort(codes, axis=1, kind="stable")
+        positions_dtype = _lsh_positions_dtype(stop)
+        batch = (np.take_along_axis(codes, order, axis=1), (order + start).astype(positions_dtype))
+
+        self._reserve(stop)
+        self._compact[start:stop] = compact
+        self._ids[start:stop] = ids
+        self._size = stop
+        self._tail = self._merge_runs(self._tail, batch, positions_dtype)
+        if self._tail[0].shape[1] > max(_LSH_MERGE_MIN, self._main[0].shape[1] // 8):
+            self._main = self._merge_runs(self._main, self._tail, positions_dtype)
+            self._tail = (self._tail[0][:, :0], self._tail[1][:, :0])
+        return ids
+
+    def _candidates(self, compact: np.ndarray, probes: int) -> np.ndarray:
+        """Sorted positions of items sharing a probed bucket with the query."""
+        margins = self._margins(compact[None])[0]
+        codes = np.bitwise_or.reduce((margins > 0) * self._weights, axis=1)
+        probe_codes = codes[:, None]
+        if probes:
+            # Multi-probe: also visit the buckets across the hyperplanes nearest the query
+            flips = np.argsort(np.abs(margins), axis=1, kind="stable")[:, :probes]
+            probe_codes = np.concatenate([probe_codes, probe_codes ^ self._weights[flips]], axis=1)
+
+        found = []
+        for keys, positions in (self._main, self._tail):
+            for t in range(self.num_tables):
+                starts = np.searchsorted(keys[t], probe_codes[t], side="left")
+                counts = np.searchsorted(keys[t], probe_codes[t], side="right") - starts
+                total = int(counts.sum())
+                if total:
+                    shift = starts - (np.cumsum(counts) - counts)
+                    found.append(positions[t][np.arange(total) + np.repeat(shift, counts)])
+        if not found:
+            return np.zeros(0, dtype=np.int64)
+        # Sort-and-mask dedup; cheaper than np.unique on small unsigned positions
+        positions = np.sort(np.concatenate(found))
+        return positions[np.concatenate(([True], positions[1:] != positions[:-1]))].astype(np.int64)
+
+    def _query(self, query):
+        """Folded query and its full squared norm."""
+        if isinstance(query, np.ndarray) and query.dtype.kind == "f" and query.ndim != 1:
+            raise ValueError("expected a single query")
+        folded, query_sqnorms = _index_queries(query)
+        if len(folded) != 1:
+            raise ValueError("expected a single query")
+        return folded[0], query_sqnorms[0]
+
+    def _check_probes(self, probes: int):
+        if not 0 <= probes <= self.bits_per_table:
+            raise ValueError("probes must be between 0 and bits_per_table")
+
+    def candidates(self, query, probes: int = 0) -> np.ndarray:
+        """
+        Ids of the items colliding with a query in at least one table.
+
+        Args:
+            query: Payload, (32,) compact vector, or (768,) vector
+            probes: Extra buckets probed per table (see `search`)
+
+        Returns:
+            np.ndarray: int64 ids in insertion order
+        """
+        self._check_probes(probes)
+        folded, _ = self._query(query)
+        if not self._size:
+            return np.zeros(0, dtype=np.int64)
+        return self._ids[self._candidates(folded / _COMPACT_REPEATS, probes)]
+
+    def search(self, query, k: int = 10, probes: int = 0):
+        """
+        Find approximately the k stored items most cosine-similar to one query.
+
+        Candidates from the query's buckets are re-ranked exactly, so every
+        returned score is the true cosine similarity of the full 768-length
+        vectors; only items outside the probed buckets can be missed.
+
+        Args:
+            query: Payload, (32,) compact vector, or (768,) vector
+            k: Maximum number of results
+            probes: Extra buckets probed per table, each across one of the
+                hyperplanes nearest the query (0 to bits_per_table); more
+                probes raise recall and latency
+
+        Returns:
+            tuple: up to k int64 ids and float64 scores, highest first (ties by insertion position)
+        """
+        if k < 0:
+            raise ValueError("k must be >= 0")
+        self._check_probes(probes)
+        folded, query_sqnorm = self._query(query)
+        if k == 0 or not self._size:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+
+        positions = self._candidates(folded / _COMPACT_REPEATS, probes)
+        if len(positions) > k:
+            # Shortlist in float32 like FracktureIndex, then re-score the survivors exactly
+            candidates = self._compact[positions]
+            sqnorms = np.einsum("ij,ij->i", candidates, candidates)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                keys = -np.where(sqnorms > 0, (candidates @ folded.astype(np.float32)) / np.sqrt(sqnorms), 0.0)
+            positions = positions[np.argpartition(keys, k - 1)[:k]]
+        compact = self._compact[positions].astype(np.float64)
+        dots = compact @ folded
+        denom = np.sqrt(query_sqnorm * _COMPACT_REPEATS * np.einsum("ij,ij->i", compact, compact))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scores = np.where(denom > 0, dots / np.where(denom > 0, denom, 1.0), 0.0)
+        order = np.lexsort((positions, -scores))
+        return self._ids[positions[order]], scores[order]
+
+    def save(self, path):
+        """
+        Write the index to a directory of .npy arrays plus `meta.json`.
+
+        Every file is written under a temporary name and renamed into place,
+        with the metadata last, so saving over the directory an index was
+        memory-mapped from is safe and an interrupted save is not loadable.
+
+        Args:
+            path: Directory to create or overwrite
+        """
+        positions_dtype = _lsh_positions_dtype(self._size)
+        self._main = self._merge_runs(self._main, self._tail, positions_dtype)
+        self._tail = (self._tail[0][:, :0], self._tail[1][:, :0])
+        os.makedirs(path, exist_ok=True)
+        center = np.zeros(_SYMBOLIC_PERIOD) if self._center is None else self._center
+        arrays = (self._planes, center, self.compact, self.ids) + self._main
+        meta = {
+            "format": _LSH_FORMAT,
+            "num_tables": self.num_tables,
+            "bits_per_table": self.bits_per_table,
+            "seed": self.seed,
+            "size": self._size,
+            "fitted": self._center is not None,
+        }
+        staging = tempfile.mkdtemp(prefix=".lsh-save-", dir=path)
+        try:
+            for name, array in zip(_LSH_ARRAYS, arrays):
+                np.save(os.path.join(staging, name + ".npy"), np.ascontiguousarray(array), allow_pickle=False)
+            with open(os.path.join(staging, "meta.json"), "w") as f:
+                json.dump(meta, f)
+            meta_path = os.path.join(path, "meta.json")
+            if os.path.exists(meta_path):
+                os.remove(meta_path)
+            # Renaming leaves any existing memory maps pointing at the old files
+            for name in _LSH_ARRAYS:
+                os.replace(os.path.join(staging, name + ".npy"), os.path.join(path, name + ".npy"))
+            os.replace(os.path.join(staging, "meta.json"), meta_path)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    @classmethod
+    def load(cls, path, mmap: bool = False) -> 'CosineLSHIndex':
+        """
+        Load an index written by `save`.
+
+        Args:
+            path: Index directory
+            mmap: Memory-map the vectors, ids and tables read-only instead of
+                reading them, so queries only page in the buckets and vectors
+                they touch; a later `add` copies the data into memory
+
+        Returns:
+            CosineLSHIndex: The loaded index
+        """
+        meta_path = os.path.join(path, "meta.json")
+        if not os.path.exists(meta_path):
+            raise ValueError(f"{path} is not a saved CosineLSHIndex")
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if meta.get("format") != _LSH_FORMAT:
+            raise ValueError(f"unsupported LSH index format: {meta.get('format')}")
+        arrays = {
+            name: np.load(os.path.join(path, name + ".npy"), mmap_mode="r" if mmap else None, allow_pickle=False)
+            for name in _LSH_ARRAYS
+        }
+        index = cls(num_tables=meta["num_tables"], bits_per_table=meta["bits_per_table"], seed=meta["seed"])
+        size = meta["size"]
+        expected = {
+            "planes": index._planes.shape,
+            "center": (_SYMBOLIC_PERIOD,),
+            "compact": (size, _SYMBOLIC_PERIOD),
+            "ids": (size,),
+            "table_keys": (index.num_tables, size),
+            "table_positions": (index.num_tables, size),
+        }
+        if any(arrays[name].shape != shape for name, shape in expected.items()):
+            raise ValueError(f"{path} has inconsistent array shapes")
+        index._planes = np.array(arrays["planes"], dtype=np.float64)
+        index._center = np.array(arrays["center"], dtype=np.float64) if meta["fitted"] else None
+        index._compact = arrays["compact"]
+        index._ids = arrays["ids"]
+        index._size = size
+        index._main = (arrays["table_keys"], arrays["table_positions"])
+        return index
+
+
+### === Batch Preprocessing === ###
+_PREPROCESS_BATCH_BLOCK = 4096
+_WRAP_COLUMNS = np.arange(_FRACKTURE_VECTOR_LEN, dtype=np.int64)
+
+
+@lru_cache(maxsize=_FRACKTURE_VECTOR_LEN)
+def _wrap_columns_for_length(length: int) -> np.ndarray:
+    return _WRAP_COLUMNS % length
+
+
+def _wrap_columns(lengths: np.ndarray) -> np.ndarray:
+    """(N, 768) wrap-padding column offsets (column mod length) for records shorter than 768."""
+    unique, inverse = np.unique(lengths, return_inverse=True)
+    table = np.stack([_wrap_columns_for_length(int(length)) for length in unique])
+    return table[inverse.reshape(-1)]
+
+
+def _ragged_records(records, offsets=None):
+    """
+    Normalize batch input to a flat uint8 buffer plus (N + 1) record boundaries.
+
+    Accepts either a sequence of bytes-like/str records, or one concatenated
+    buffer together with CSR-style offsets (record i is buffer[offsets[i]:offsets[i + 1]]).
+    """
+    if offsets is None:
+        parts = [r.encode("utf-8") if isinstance(r, str) else bytes(r) for r in records]
+        bounds = np.zeros(len(parts) + 1, dtype=np.int64)
+        np.cumsum([len(part) for part in parts], out=bounds[1:])
+        return np.frombuffer(b"".join(parts), dtype=np.uint8), bounds
+
+    if isinstance(records, np.ndarray):
+        buffer = np.ravel(records).view(np.uint8)
+    else:
+        buffer = np.frombuffer(records, dtype=np.uint8)
+    bounds = np.asarray(offsets, dtype=np.int64)
+    if bounds.ndim != 1 or len(bounds) < 1:
+        raise ValueError("offsets must be a 1-D array of N + 1 record boundaries")
+    if bounds[0] < 0 or bounds[-1] > len(buffer) or np.any(np.diff(bounds) < 0):
+        raise ValueError("offsets must be non-decreasing and lie within the buffer")
+    return buffer, bounds
+
+
+def _ragged_reduce(buffer, starts, ends):
+    """Per-range (min, max) over non-empty, ascending, non-overlapping [start, end) ranges."""
+    idx = np.empty(2 * len(starts), dtype=np.int64)
+    idx[0::2] = starts
+    idx[1::2] = ends
+    if idx[-1] == len(buffer):
+        # The final range runs to the end of the buffer, which reduceat implies
+        idx = idx[:-1]
+    mins = np.minimum.reduceat(buffer, idx)[0::2]
+    maxs = np.maximum.reduceat(buffer, idx)[0::2]
+    return mins, maxs
+
+
+def _ragged_range(buffer, starts, ends):
+    """
+    Per-record (min, max) with the same early exit as the scalar range scan.
+
+    A first reduceat pass covers each record's leading `_RANGE_SCAN_CHUNK` bytes;
+    only records that have not yet seen both 0x00 and 0xFF are reduced over
+    their remaining bytes.
+    """
+    prefix_ends = np.minimum(ends, starts + _RANGE_SCAN_CHUNK)
+    mins, maxs = _ragged_reduce(buffer, starts, prefix_ends)
+    rest = np.flatnonzero((prefix_ends < ends) & ((mins != 0) | (maxs != 255)))
+    if len(rest):
+        rest_mins, rest_maxs = _ragged_reduce(buffer, prefix_ends[rest], ends[rest])
+        mins[rest] = np.minimum(mins[rest], rest_mins)
+        maxs[rest] = np.maximum(maxs[rest], rest_maxs)
+    return mins, maxs
+
+
+def _preprocess_batch(records, offsets=None, tiers=None, out=None):
+    buffer, bounds = _ragged_records(records, offsets)
+    n = len(bounds) - 1
+    lengths = np.diff(bounds)
+
+    if tiers is None:
+        tier_list = [_tier_for_size(int(length)) for length in lengths]
+    else:
+        tier_list = _tier_array(tiers, n)
+
+    if out is None:
+        out = np.empty((n, _FRACKTURE_VECTOR_LEN), dtype=np.float32)
+    elif out.shape != (n, _FRACKTURE_VECTOR_LEN) or out.dtype != np.float32:
+        raise ValueError("out must be a float32 array of shape (N, 768)")
+
+    is_tiny = np.array([t == CompressionTier.TINY for t in tier_list], dtype=bool)
+    out[~is_tiny & (lengths == 0)] = 0.0
+
+    standard = np.flatnonzero(~is_tiny & (lengths > 0))
+    if len(standard):
+        mins, maxs = _ragged_range(buffer, bounds[standard], bounds[standard + 1])
+        min_vals = mins.astype(np.float32)
+        denoms = (maxs.astype(np.float32) - min_vals) + np.float32(1e-8)
+        for block in range(0, len(standard), _PREPROCESS_BATCH_BLOCK):
+            sel = slice(block, block + _PREPROCESS_BATCH_BLOCK)
+            rows = standard[sel]
+            heads = np.empty((len(rows), _FRACKTURE_VECTOR_LEN), dtype=np.uint8)
+            short = lengths[rows] < _FRACKTURE_VECTOR_LEN
+            if not short.all():
+                # Records of 768+ bytes contribute their first 768 bytes as-is
+                windows = np.lib.stride_tricks.sliding_window_view(buffer, _FRACKTURE_VECTOR_LEN)
+                heads[~short] = windows[bounds[rows[~short]]]
+            if short.any():
+                # Wrap-padding to 768 is a gather at start + (column mod length)
+                short_rows = rows[short]
+                heads[short] = buffer[bounds[short_rows, None] + _wrap_columns(lengths[short_rows])]
+            normed = heads.astype(np.float32)
+            normed -= min_vals[sel, None]
+            normed /= denoms[sel, None]
+            out[rows] = normed
+
+    tiny = np.flatnonzero(is_tiny)
+    if len(tiny):
+        _preprocess_tiny_rows(buffer, bounds, tiny, out)
+
+    return out, tier_list
+
+
+def frackture_preprocess_batch(records, offsets=None, tiers=None, out=None):
+    """
+    Preprocess many variable-length byte records into an (N, 768) matrix.
+    
+    Standard-tier rows get their min/max from `np.minimum.reduceat` /
+    `np.maximum.reduceat` over the concatenated buffer and are wrap-padded with
+    a precomputed gather, writing straight into the output matrix. Row i is
+    identical to `frackture_preprocess_universal_v2_6(record_i)` for bytes
+    (or str, via UTF-8) records.
+    
+    Args:
+        records: Sequence of bytes-like or str records, or one concatenated buffer
+            when `offsets` is given
+        offsets: Optional (N + 1,) record boundaries into `records`
+        tiers: None (auto-detect from each record's length), a single
+            CompressionTier, or one tier per record
+        out: Optional preallocated (N, 768) float32 array to write into
+        
+    Returns:
+        np.ndarray: (N, 768) float32 matrix (`out` if provided)
+    """
+    return _preprocess_batch(records, offsets, tiers, out)[0]
+
+
+def compress_batch(records, offsets=None, tiers=None):
+    """
+    Compress many byte records into packed compact payloads.
+    
+    Combines `frackture_preprocess_batch` with `frackture_v3_3_safe_batch`; row i
+    is identical to `compress_simple(record_i)` (or to
+    `compress_simple(record_i, tier=tiers[i])` when tiers are given).
+    
+    Args:
+        records: Sequence of bytes-like or str records, or one concatenated buffer
+        offsets: Optional (N + 1,) record boundaries into `records`
+        tiers: None (auto-detect), a single CompressionTier, or one tier per record
+        
+    Returns:
+        np.ndarray: (N, 65) uint8 array of compact payloads
+    """
+    matrix, tier_list = _preprocess_batch(records, offsets, tiers)
+    return frackture_v3_3_safe_batch(matrix, tier_list)
+
+
+### === Tiny-Tier Batch Engine === ###
+@lru_cache(maxsize=256)
+def _tiny_repr_table(ptp: int):
+    """
+    repr() of every normalized value a byte can take in a record with the given range.
+
+    In the tiny-tier preprocessor a byte's normalized value depends only on its
+    offset from the record minimum and on the record's range, so the strings
+    hashed by the v1 padding can be looked up instead of formatted per float.
+    """
+    if ptp == 0:
+        # Variance guard: constant records normalize to 0.5 everywhere
+        return ("0.5",) * 256
+    values = np.arange(256, dtype=np.float32) / (np.float32(ptp) + 1e-8)
+    return tuple(repr(v) for v in values.tolist())
+
+
+def _tiny_padding_digest(offsets: bytes, ptp: int, version: int) -> bytes:
+    """SHA-256 seed for a tiny record's hash padding, given its bytes minus the record minimum."""
+    if version == 1:
+        # Bit-identical to hashing str(normed.tolist()) in the scalar preprocessor
+        text = "[" + ", ".join(map(_tiny_repr_table(ptp).__getitem__, offsets)) + "]"
+        return hashlib.sha256(text.encode()).digest()
+    return hashlib.sha256(bytes([ptp]) + offsets).digest()
+
+
+def _preprocess_tiny_rows(buffer, bounds, rows, out, version=1):
+    """
+    Tiny-tier preprocessing of the given rows of a ragged byte batch, written into `out`.
+
+    Version 1 reproduces `frackture_preprocess_universal_v2_6(record, TINY)`
+    exactly. Version 2 seeds the hash padding from the canonical (range, byte
+    offsets) form instead of the float repr string; both are shift invariant.
+    """
+    lengths = bounds[rows + 1] - bounds[rows]
+    # The scalar path cannot pad empty or >768-byte records and returns zeros
+    valid = (lengths > 0) & (lengths <= _FRACKTURE_VECTOR_LEN)
+    out[rows[~valid]] = 0.0
+    rows, lengths = rows[valid], lengths[valid]
+    if not len(rows):
+        return
+
+    starts = bounds[rows]
+    mins, maxs = _ragged_reduce(buffer, starts, bounds[rows + 1])
+    ptps = maxs - mins
+
+    # Byte offsets from each record's minimum, flattened record after record
+    flat_starts = np.zeros(len(rows), dtype=np.int64)
+    np.cumsum(lengths[:-1], out=flat_starts[1:])
+    total = int(lengths.sum())
+    src = np.repeat(starts - flat_starts, lengths) + np.arange(total, dtype=np.int64)
+    offsets = buffer[src] - np.repeat(mins, lengths)
+    offsets_blob = offsets.tobytes()
+
+    digests = np.frombuffer(
+        b"".join(
+            _tiny_padding_digest(offsets_blob[start : start + length], ptp, version)
+            for start, length, ptp in zip(flat_starts.tolist(), lengths.tolist(), ptps.tolist())
+        ),
+        dtype=np.uint8,
+    ).reshape(-1, 32)
+
+    denoms = ptps.astype(np.float32) + np.float32(1e-8)
+    normed = offsets.astype(np.float32) / np.repeat(denoms, lengths)
+    normed[np.repeat(ptps == 0, lengths)] = 0.5
+
+    ratios = np.minimum(lengths / 768.0, 1.0)
+    normed_weights = ratios.astype(np.float32)
+    hash_weights = (1 - ratios).astype(np.float32)
+    hash_vecs = digests.astype(np.float32) / 255.0
+
+    for block in range(0, len(rows), _PREPROCESS_BATCH_BLOCK):
+        sel = slice(block, block + _PREPROCESS_BATCH_BLOCK)
+        padded_normed = normed[flat_starts[sel, None] + _wrap_columns(lengths[sel])]
+        padded_normed *= normed_weights[sel, None]
+        padded_hash = np.tile(hash_vecs[sel], _FRACKTURE_VECTOR_LEN // 32)
+        padded_hash *= hash_weights[sel, None]
+        padded_normed += padded_hash
+        out[rows[sel]] = padded_normed
+
+
+def frackture_preprocess_tiny_batch(records, offsets=None, version: int = 1, out=None):
+    """
+    Tiny-tier preprocessing for a batch of short byte or str records.
+    
+    The hash padding seed is built from a lookup table (version 1, bit-identical
+    to `frackture_preprocess_universal_v2_6(record, CompressionTier.TINY)`) or from
+    the record's canonical byte form (version 2, no float formatting at all).
+    Normalization, wrap-padding and blending run across the whole batch.
+    
+    Args:
+        records: Sequence of bytes-like or str records, or one concatenated buffer
+            when `offsets` is given
+        offsets: Optional (N + 1,) record boundaries into `records`
+        version: 1 for stored-payload compatibility, 2 for the faster padding seed
+        out: Optional preallocated (N, 768) float32 array to write into
+        
+    Returns:
+        np.ndarray: (N, 768) float32 matrix (`out` if provided)
+    """
+    if version not in _FRACKTURE_PAYLOAD_VERSIONS:
+        raise ValueError(f"Unsupported payload version: {version}")
+    buffer, bounds = _ragged_records(records, offsets)
+    n = len(bounds) - 1
+    if out is None:
+        out = np.empty((n, _FRACKTURE_VECTOR_LEN), dtype=np.float32)
+    elif out.shape != (n, _FRACKTURE_VECTOR_LEN) or out.dtype != np.float32:
+        raise ValueError("out must be a float32 array of shape (N, 768)")
+    if n:
+        _preprocess_tiny_rows(buffer, bounds, np.arange(n), out, version)
+    return out
+
+
+def compress_tiny_batch(records, offsets=None, version: int = 1):
+    """
+    Compress a batch of short records as TINY-tier compact payloads.
+    
+    Version 1 rows are identical to `compress_simple(record, tier=CompressionTier.TINY)`.
+    Version 2 rows use the faster padding seed and carry version 2 in the header;
+    they decode exactly like version 1 payloads.
+    
+    Args:
+        records: Sequence of bytes-like or str records, or one concatenated buffer
+        offsets: Optional (N + 1,) record boundaries into `records`
+        version: Payload version (1 or 2)
+        
+    Returns:
+        np.ndarray: (N, 65) uint8 array of compact payloads
+    """
+    matrix = frackture_preprocess_tiny_batch(records, offsets, version=version)
+    return frackture_v3_3_safe_batch(matrix, CompressionTier.TINY, version=version)
+
+
+### === Self-Optimization (Decoder Loss Feedback Loop) === ###
+def optimize_frackture(
+    input_vector,
+    num_trials=5,
+    tier: Optional[CompressionTier] = None,
+    target_mse: Optional[float] = None,
+    time_budget: Optional[float] = None,
+    return_trials: bool = False,
+):
+    """
+    Self-optimizing encoder that minimizes reconstruction MSE.
+    
+    For tiny tier, caps the trial count at 2 for efficiency.
+    
+    The entropy channel is encoded and decoded once, the symbolic state is
+    advanced one pass per trial instead of being recomputed, and candidates are
+    scored directly from the decoded channel arrays.
+    
+    `num_trials` is an upper bound: the loop stops early once a candidate's MSE
+    is at or below `target_mse`, or once `time_budget` seconds have elapsed
+    (returning the best candidate so far). At least one trial always runs.
+    
+    Args:
+        input_vector: Preprocessed 768-length vector
+        num_trials: Maximum number of optimization trials, at least 1 (capped at 2 for tiny tier)
+        tier: Optional CompressionTier. If tiny, reduces trials automatically.
+        target_mse: Optional MSE at which to stop searching
+        time_budget: Optional wall-clock budget in seconds
+        return_trials: If True, also return the number of trials that ran
+        
+    Returns:
+        tuple: (best_payload, best_mse), or (best_payload, best_mse, trials_run)
+        if return_trials is True
+        
+    Raises:
+        ValueError: If num_trials is less than 1
+    """
+    start = time.perf_counter()
+    if num_trials < 1:
+        raise ValueError("num_trials must be at least 1")
+    if tier == CompressionTier.TINY:
+        num_trials = min(num_trials, 2)
+    tier_name = (tier or CompressionTier.DEFAULT).value
+    
+    entropy = [int(max(0, min(65535, x * 1000.0))) for x in entropy_channel_encode(input_vector)]
+    entropy_part = entropy_channel_decode([float(x) / 1000.0 for x in entropy])
+    
+    bits = (np.asarray(input_vector) * 255).astype(np.uint8).reshape(1, -1)
+    states = _iter_symbolic_passes(bits)
+    passes_done = 0
+    folded = None
+    
+    best_payload = None
+    best_mse = float("inf")
+    trials_run = 0
+    for trial in range(num_trials):
+        # Tiny tier always fingerprints with 2 passes
+        passes = 2 if tier == CompressionTier.TINY else trial + 2
+        while passes_done < passes:
+            folded = next(states)
+            passes_done += 1
+        symbolic = folded[0].tobytes()
+        
+        recon = _merge_channels(entropy_part, _symbolic_decode_raw(symbolic), tier_name)
+        mse = np.mean((input_vector - recon) ** 2)
+        if mse < best_mse:
+            best_mse = mse
+            best_payload = FrackturePayload(
+                symbolic=symbolic,
+                entropy=list(entropy),
+                tier_name=tier_name,
+                version=1
+            )
+        trials_run += 1
+        
+        if target_mse is not None and best_mse <= target_mse:
+            break
+        if time_budget is not None and time.perf_counter() - start >= time_budget:
+            break
+    
+    if return_trials:
+        return best_payload, best_mse, trials_run
+    return best_payload, best_mse
+
+
+### === Simple Wrapper Functions === ###
+def compress_simple(
+    data,
+    tier=None,
+    optimize=False,
+    return_format="compact",
+    num_trials=5,
+    target_mse=None,
+    time_budget=None,
+    return_trials=False,
+):
+    """
+    Simplified compression wrapper that performs preprocess → encode → optimization → compact serialization.
+    
+    Args:
+        data: Input data to compress (str, bytes, dict, list, np.ndarray, etc.)
+        tier: Optional CompressionTier. If None, will auto-detect.
+        optimize: If True, run optimization to minimize MSE.
+        return_format: "compact" (bytes) or "json" (dict) for legacy compatibility.
+        num_trials: Maximum optimization trials (see `optimize_frackture`).
+        target_mse: Stop optimizing once a candidate reaches this MSE. Implies optimize.
+        time_budget: Wall-clock optimization budget in seconds. Implies optimize.
+        return_trials: If True, also return how many optimization trials ran
+            (0 without optimization), to tell whether a budget cut the search short.
+        
+    Returns:
+        bytes or dict: Compressed payload in requested format, or a
+        (payload, trials_run) tuple if return_trials is True
+    """
+    # Auto-detect tier if not provided
+    if tier is None:
+        tier = select_tier(data)
+    
+    # Preprocess input
+    input_vector = frackture_preprocess_universal_v2_6(data, tier)
+    
+    return _encode_and_serialize(
+        input_vector, tier, optimize, return_format,
+        num_trials=num_trials, target_mse=target_mse, time_budget=time_budget, return_trials=return_trials,
+    )
+
+
+def _encode_and_serialize(
+    input_vector, tier, optimize, return_format, num_trials=5, target_mse=None, time_budget=None, return_trials=False
+):
+    """Shared encode → optimization → serialization tail of the simple wrappers."""
+    if return_format not in ("compact", "json"):
+        raise ValueError("return_format must be 'compact' or 'json'")
+    
+    # Encode with optional optimization
+    trials_run = 0
+    if optimize or target_mse is not None or time_budget is not None:
+        payload, _, trials_run = optimize_frackture(
+            input_vector, num_trials=num_trials, tier=tier, target_mse=target_mse, time_budget=time_budget,
+            return_trials=True,
+        )
+    else:
+        payload = frackture_v3_3_safe(input_vector, tier=tier)
+    
+    # Serialize in requested format
+    result = payload.to_bytes() if return_format == "compact" else payload.to_legacy_dict()
+    if return_trials:
+        return result, trials_run
+    return result
+
+
+def decompress_simple(payload, input_data=None, out=None, cache: Optional["ReconstructionCache"] = None):
+    """
+    Simplified decompression wrapper for any payload format.
+    
+    Args:
+        payload: Compressed payload (bytes, FrackturePayload, or dict)
+        input_data: Original input for comparison (optional)
+        out: Optional (768,) float32 or float16 array to write into
+        cache: Optional ReconstructionCache. Cached results are shared and
+            read-only unless written into `out`.
+        
+    Returns:
+        np.ndarray: Reconstructed 768-length vector
+    """
+    if cache is None:
+        return frackture_v3_3_reconstruct(payload, out=out)
+    if out is not None and (out.shape != (_FRACKTURE_VECTOR_LEN,) or out.dtype not in _RECONSTRUCT_DTYPES):
+        raise ValueError("out must be a float32 or float16 array of shape (768,)")
+    vector = cache.get(payload)
+    if out is None:
+        return vector
+    out[...] = vector
+    return out
+
+
+def decompress_batch(payloads, out=None, dtype=np.float32):
+    """
+    Decompress many packed compact payloads at once.
+    
+    Args:
+        payloads: (N, 65) uint8 array or bytes-like buffer of concatenated payloads
+        out: Optional preallocated (N, 768) float32 or float16 array or memmap
+        dtype: Output dtype when `out` is not given (float32 or float16)
+        
+    Returns:
+        np.ndarray: (N, 768) matrix; row i equals `decompress_simple(payload_i)`
+    """
+    return frackture_v3_3_reconstruct_batch(payloads, out=out, dtype=dtype)
+
+
+# Preset helpers for common use cases
+def compress_preset_tiny(data, optimize=False, return_format="compact"):
+    """Compress using TINY tier preset."""
+    return compress_simple(data, tier=CompressionTier.TINY, optimize=optimize, return_format=return_format)
+
+
+def compress_preset_default(data, optimize=False, return_format="compact"):
+    """Compress using DEFAULT tier preset.""" 
+    return compress_simple(data, tier=CompressionTier.DEFAULT, optimize=optimize, return_format=return_format)
+
+
+def compress_preset_large(data, optimize=False, return_format="compact"):
+    """Compress using LARGE tier preset."""
+    return compress_simple(data, tier=CompressionTier.LARGE, optimize=optimize, return_format=return_format)
+
+
+### === Streaming Encoder === ###
+class FracktureStreamEncoder:
+    """
+    Incremental encoder for byte streams.
+    
+    Feed chunks with `update()` and call `finalize()` for the payload. Only the
+    running length, the running byte range and the first 768 bytes are kept, so
+    memory stays constant regardless of stream size. The output is identical to
+    `compress_simple` on the concatenated bytes.
+    """
+    
+    def __init__(self):
+        self._head = bytearray()
+        self._total = 0
+        self._min = 255
+        self._max = 0
+    
+    @property
+    def total_bytes(self) -> int:
+        """Number of bytes consumed so far."""
+        return self._total
+    
+    @property
+    def tier(self) -> CompressionTier:
+        """Tier `compress_simple` would select for the bytes consumed so far."""
+        return _tier_for_size(self._total)
+    
+    def update(self, chunk) -> None:
+        """Consume the next chunk of the stream (any bytes-like object)."""
+        vec = np.frombuffer(chunk, dtype=np.uint8)
+        if len(vec) == 0:
+            return
+        
+        if len(self._head) < 768:
+            self._head.extend(vec[: 768 - len(self._head)].tobytes())
+        
+        # Once both extremes are seen, the range cannot change any more
+        if self._min != 0 or self._max != 255:
+            lo, hi = _byte_range_scan(vec)
+            self._min = min(self._min, lo)
+            self._max = max(self._max, hi)
+        
+        self._total += len(vec)
+    
+    def finalize(
+        self, optimize=False, return_format="compact", num_trials=5, target_mse=None, time_budget=None,
+        return_trials=False,
+    ):
+        """
+        Encode the stream consumed so far.
+        
+        Args:
+            optimize: If True, run optimization to minimize MSE.
+            return_format: "compact" (bytes) or "json" (dict) for legacy compatibility.
+            num_trials, target_mse, time_budget, return_trials: Optimization
+                controls, as in `compress_simple`.
+            
+        Returns:
+            bytes or dict: Compressed payload in requested format, or a
+            (payload, trials_run) tuple if return_trials is True
+        """
+        tier = self.tier
+        if tier == CompressionTier.TINY:
+            # Tiny streams are shorter than the retained head, so this is the whole input
+            input_vector = frackture_preprocess_universal_v2_6(bytes(self._head), tier)
+        else:
+            head = np.frombuffer(bytes(self._head), dtype=np.uint8)
+            input_vector = _normalize_byte_head(head, self._min, self._max)
+        
+        return _encode_and_serialize(
+            input_vector, tier, optimize, return_format,
+            num_trials=num_trials, target_mse=target_mse, time_budget=time_budget, return_trials=return_trials,
+        )
+
+
+### === Parallel Bulk Compression === ###
+_COMPRESS_MANY_BACKENDS = ("process", "thread")
+
+
+def _compress_chunk(items, tier, optimize):
+    """Compress a chunk of inputs into concatenated 65-byte compact payloads."""
+    return b"".join(compress_simple(item, tier=tier, optimize=optimize) for item in items)
+
+
+def _iter_chunks(iterable, chunksize):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _pool_workers():
+    """
+    The `frackture_workers` helper module, whose functions are process-pool entry points.
+
+    It sits next to this file and is registered under its own name once, so
+    workers can unpickle references to its functions.
+    """
+    module = sys.modules.get("frackture_workers")
+    if module is None:
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "frackture_workers.py")
+        spec = importlib.util.spec_from_file_location("frackture_workers", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        module = sys.modules.setdefault("frackture_workers", module)
+    return module
+
+
+def _compress_many_parts(iterable, workers, backend, chunksize, tier, optimize):
+    """Compress chunks in parallel; returns (start index, concatenated payloads) in completion order."""
+    if backend not in _COMPRESS_MANY_BACKENDS:
+        raise ValueError("backend must be 'process' or 'thread'")
+    if chunksize < 1:
+        raise ValueError("chunksize must be at least 1")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    
+    chunks = _iter_chunks(iterable, chunksize)
+    parts = []
+    
+    if workers == 1:
+        start = 0
+        for chunk in chunks:
+            parts.append((start, _compress_chunk(chunk, tier, optimize)))
+            start += len(chunk)
+        return parts
+    
+    if backend == "process":
+        executor = ProcessPoolExecutor(max_workers=workers)
+        task = _pool_workers().compress_chunk
+        tier_arg = None if tier is None else tier.value
+    else:
+        executor = ThreadPoolExecutor(max_workers=workers)
+        task, tier_arg = _compress_chunk, tier
+    
+    with executor:
+        pending = {}
+        start = 0
+        for chunk in chunks:
+            if len(pending) >= 2 * workers:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    parts.append((pending.pop(future), future.result()))
+            if backend == "process":
+                # PreparedInput only ships its raw input across processes anyway
+                chunk = [item.data if isinstance(item, PreparedInput) else item for item in chunk]
+            pending[executor.submit(task, chunk, tier_arg, optimize)] = start
+            start += len(chunk)
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                parts.append((pending.pop(future), future.result()))
+    return parts
+
+
+def _split_payloads(blob: bytes, packed: bool):
+    if packed:
+        return np.frombuffer(bytearray(blob), dtype=np.uint8).reshape(-1, _FRACKTURE_PAYLOAD_LEN)
+    return [blob[i : i + _FRACKTURE_PAYLOAD_LEN] for i in range(0, len(blob), _FRACKTURE_PAYLOAD_LEN)]
+
+
+def compress_many(
+    iterable,
+    workers: Optional[int] = None,
+    backend: str = "process",
+    chunksize: int = 256,
+    tier: Optional[CompressionTier] = None,
+    optimize: bool = False,
+    packed: bool = False,
+    ordered: bool = True,
+):
+    """
+    Compress many inputs in parallel with `compress_simple` semantics.
+    
+    Inputs are sent to workers in chunks of `chunksize` and each chunk comes back
+    as one bytes object of concatenated 65-byte payloads, so pickling cost is
+    amortized across the chunk. The thread backend avoids pickling entirely and
+    suits large inputs whose preprocessing is dominated by NumPy calls that
+    release the GIL. At most 2 × workers chunks are in flight, so arbitrarily
+    long iterables are consumed lazily. Process workers run the entry points in
+    `frackture_workers.py`, which must stay next to this file.
+    
+    Args:
+        iterable: Inputs to compress (anything `compress_simple` accepts)
+        workers: Number of workers (default: os.cpu_count()). 1 runs inline.
+        backend: "process" or "thread"
+        chunksize: Number of inputs per work item
+        tier: Optional CompressionTier applied to every input. If None, auto-detected per input.
+        optimize: If True, run optimization to minimize MSE.
+        packed: If True, return an (N, 65) uint8 array instead of a list of bytes.
+        ordered: If False, skip sorting chunks back into input order and return
+            `compress_many_unordered`'s (indices, payloads) tuple instead.
+        
+    Returns:
+        list[bytes] or np.ndarray: Compact payloads in input order. With
+        ordered=False, a tuple (indices, payloads) where indices is an (N,)
+        int64 array giving each payload's input position.
+    """
+    if not ordered:
+        return compress_many_unordered(iterable, workers, backend, chunksize, tier, optimize, packed)
+    parts = _compress_many_parts(iterable, workers, backend, chunksize, tier, optimize)
+    parts.sort(key=lambda part: part[0])
+    return _split_payloads(b"".join(part for _, part in parts), packed)
+
+
+def compress_many_unordered(
+    iterable,
+    workers: Optional[int] = None,
+    backend: str = "process",
+    chunksize: int = 256,
+    tier: Optional[CompressionTier] = None,
+    optimize: bool = False,
+    packed: bool = False,
+):
+    """
+    Like `compress_many`, but keep payloads in completion order instead of sorting chunks.
+    
+    Args:
+        iterable, workers, backend, chunksize, tier, optimize, packed: As for `compress_many`
+        
+    Returns:
+        tuple: (indices, payloads) where indices is an (N,) int64 array giving
+        each payload's input position
+    """
+    parts = _compress_many_parts(iterable, workers, backend, chunksize, tier, optimize)
+    indices = np.zeros(0, dtype=np.int64)
+    if parts:
+        indices = np.concatenate(
+            [np.arange(start, start + len(part) // _FRACKTURE_PAYLOAD_LEN, dtype=np.int64) for start, part in parts]
+        )
+    return indices, _split_payloads(b"".join(part for _, part in parts), packed)
+
+
+### === Legacy Payload Conversion === ###
+_CONVERT_BLOCK_SIZE = 65536
+_CONVERT_READ_CHUNK = 8 * 1024 * 1024
+_LEGACY_METADATA_KEYS = frozenset(("category_name", "actual_size_bytes", "target_size_bytes"))
+_CONVERT_ERRORS = ("raise", "skip")
+
+
+def _legacy_rows(objects):
+    """
+    Pack legacy payload dicts into compact rows with vectorized quantization.
+
+    Each valid dict yields exactly the bytes of
+    `FrackturePayload.from_legacy_dict(obj).to_bytes()`.
+
+    Returns:
+        tuple: ((N, 65) uint8 rows, (N,) bool mask of valid objects); invalid rows are zeroed
+    """
+    n = len(objects)
+    ok = np.ones(n, dtype=bool)
+    flags = np.zeros(n, dtype=np.uint8)
+    hexes = []
+    entropies = []
+    default_tier = CompressionTier.DEFAULT.value
+    for i, obj in enumerate(objects):
+        try:
+            if not isinstance(obj, dict) or "symbolic" not in obj or "entropy" not in obj:
+                raise ValueError("Frackture payload missing required keys")
+            if not _LEGACY_METADATA_KEYS.isdisjoint(obj):
+                validate_frackture_payload(obj)
+            symbolic, entropy = obj["symbolic"], obj["entropy"]
+            if not isinstance(symbolic, str) or len(symbolic) != _FRACKTURE_SYMBOLIC_HEX_LEN:
+                raise ValueError("Invalid symbolic fingerprint")
+            if not isinstance(entropy, (list, tuple)) or len(entropy) != _FRACKTURE_ENTROPY_LEN:
+                raise ValueError("Invalid entropy channel")
+            flags[i] = _PAYLOAD_TIER_FLAGS[obj.get("tier_name", default_tier)]
+        except (ValueError, KeyError, TypeError):
+            ok[i] = False
+            symbolic, entropy = "00" * 32, (0.0,) * _FRACKTURE_ENTROPY_LEN
+        hexes.append(symbolic)
+        entropies.append(entropy)
+
+    try:
+        symbolic = np.frombuffer(bytes.fromhex("".join(hexes)), dtype=np.uint8)
+        if symbolic.size != 32 * n:
+            raise ValueError("Invalid symbolic fingerprint")
+    except ValueError:
+        # Locate the malformed fingerprints (bad digits or embedded whitespace)
+        symbolic = np.zeros(32 * n, dtype=np.uint8)
+        for i, text in enumerate(hexes):
+            try:
+                raw = bytes.fromhex(text)
+            except ValueError:
+                raw = b""
+            if len(raw) == 32:
+                symbolic[32 * i : 32 * (i + 1)] = np.frombuffer(raw, dtype=np.uint8)
+            else:
+                ok[i] = False
+
+    try:
+        values = np.array(entropies)
+    except (ValueError, TypeError):
+        values = None
+    if values is not None and values.dtype.kind in "biuf" and values.shape == (n, _FRACKTURE_ENTROPY_LEN):
+        values = values.astype(np.float64) * 1000.0
+    else:
+        # Strings, None or other objects: scale element by element exactly like
+        # from_legacy_dict, so anything it rejects (e.g. "1.5") is marked invalid
+        values = np.zeros((n, _FRACKTURE_ENTROPY_LEN), dtype=np.float64)
+        for i, entropy in enumerate(entropies):
+            try:
+                values[i] = [float(x * 1000.0) for x in entropy]
+            except (ValueError, TypeError):
+                ok[i] = False
+    finite = np.isfinite(values).all(axis=1)
+    ok &= finite
+    values[~finite] = 0.0
+
+    rows = np.zeros((n, _FRACKTURE_PAYLOAD_LEN), dtype=np.uint8)
+    rows[:, 0] = (1 << 3) | flags
+    rows[:, 1:33] = symbolic.reshape(n, 32)
+    # int(max(0, min(65535, x * 1000.0))) truncates; clipping first makes astype agree
+    quantized = np.clip(values, 0, 65535).astype("<u2")
+    rows[:, 33:65] = quantized.view(np.uint8).reshape(n, 32)
+    rows[~ok] = 0
+    return rows, ok
+
+
+def pack_legacy_payloads(payloads) -> np.ndarray:
+    """
+    Convert legacy payload dicts to packed compact payloads in one pass.
+
+    Row i equals `FrackturePayload.from_legacy_dict(payloads[i]).to_bytes()`.
+    Validation follows `validate_frackture_payload`, which is stricter than
+    `from_legacy_dict`: fingerprints must be 64 hex digits and all 16 entropy
+    values finite, so every row is a well-formed 65-byte payload.
+
+    Args:
+        payloads: Sequence of legacy dicts (as produced by `to_legacy_dict`)
+
+    Returns:
+        np.ndarray: (N, 65) uint8 array
+
+    Raises:
+        ValueError: If any dict is not a valid legacy payload
+    """
+    rows, ok = _legacy_rows(list(payloads))
+    if not ok.all():
+        raise ValueError(f"Invalid legacy payload at index {int(np.argmin(ok))}")
+    return rows
+
+
+def _legacy_jsonl_lines(rows, ids=None, id_field=None):
+    """Render packed rows as legacy JSONL lines, matching `json.dumps(to_legacy_dict())`."""
+    n = rows.shape[0]
+    hexes = rows[:, 1:33].tobytes().hex()
+    entropy = (rows[:, 33:65].view("<u2") / 1000.0).tolist()
+    tiers = _TIER_NAMES_BY_FLAGS[rows[:, 0] & 0x07].tolist()
+    id_suffix = [""] * n
+    if ids is not None and id_field is not None:
+        key = json.dumps(id_field)
+        id_suffix = [
+            f", {key}: {json.dumps(row.tobytes().rstrip(bytes(1)).decode('utf-8', 'replace'))}" for row in ids
+        ]
+    return [
+        f'{{"symbolic": "{hexes[64 * i : 64 * (i + 1)]}", "entropy": [{", ".join(map(repr, entropy[i]))}], '
+        f'"tier_name": "{tiers[i]}"{id_suffix[i]}}}\n'
+        for i in range(n)
+    ]
+
+
+def _iter_jsonl_range(f, start, end, chunk_size: int = _CONVERT_READ_CHUNK):
+    """
+    Yield (offsets, lines) for the non-blank lines of a binary file that start in [start, end).
+
+    The file is read in large chunks and split on newlines, so no Python-level
+    work is done per line; `offsets` gives each line's byte offset for error reports.
+    """
+    if start > 0:
+        # Skip the line already in progress at `start`; it belongs to the previous range
+        f.seek(start - 1)
+        pos = start - 1 + len(f.readline())
+    else:
+        f.seek(0)
+        pos = 0
+    carry = b""
+    while pos < end:
+        chunk = f.read(chunk_size)
+        data = carry + chunk
+        if chunk:
+            cut = data.rfind(b"\n") + 1
+            lines = data[:cut].split(b"\n")[:-1]
+            carry = data[cut:]
+        else:
+            lines = [data] if data else []
+        offsets = list(itertools.accumulate(map(len, lines), lambda off, n: off + n + 1, initial=pos))
+        count = bisect.bisect_left(offsets, end, 0, len(lines))
+        keep = list(map(bytes.strip, lines[:count]))
+        if count:
+            yield list(itertools.compress(offsets, keep)), list(itertools.compress(lines, keep))
+        if count < len(lines) or not chunk:
+            return
+        pos = offsets[-1]
+
+
+def _convert_jsonl_blocks(src, start, end, block_size, errors, id_field, id_width):
+    """Yield (rows, ids, skipped) blocks converted from the lines of `src` starting in [start, end)."""
+    with open(src, "rb") as f:
+        pending_offsets, pending_lines = [], []
+        chunks = _iter_jsonl_range(f, start, end)
+        exhausted = False
+        while not exhausted or pending_lines:
+            while not exhausted and len(pending_lines) < block_size:
+                try:
+                    offsets, lines = next(chunks)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending_offsets += offsets
+                pending_lines += lines
+            if not pending_lines:
+                return
+            block_offsets, pending_offsets = pending_offsets[:block_size], pending_offsets[block_size:]
+            block, pending_lines = pending_lines[:block_size], pending_lines[block_size:]
+            yield _convert_jsonl_block(src, block_offsets, block, errors, id_field, id_width)
+
+
+def _convert_jsonl_block(src, offsets, lines, errors, id_field, id_width):
+    # Every line is parsed on its own, so an object can never span or share lines
+    try:
+        objects = [json.loads(line) for line in lines]
+    except ValueError:
+        objects = []
+        for line in lines:
+            try:
+                objects.append(json.loads(line))
+            except ValueError:
+                objects.append(None)
+    rows, ok = _legacy_rows(objects)
+
+    ids = None
+    if id_width:
+        values = [obj.get(id_field) if id_field and isinstance(obj, dict) else None for obj in objects]
+        encoded = [b"" if v is None else str(v).encode("utf-8") for v in values]
+        ok &= np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded)) <= id_width
+        ids = np.array(encoded, dtype=f"S{id_width}").view(np.uint8).reshape(len(encoded), id_width)
+
+    if not ok.all() and errors == "raise":
+        raise ValueError(f"Invalid legacy payload at byte offset {offsets[int(np.argmin(ok))]} of {src}")
+    return rows[ok], None if ids is None else ids[ok], int((~ok).sum())
+
+
+def _convert_jsonl_range(src, start, end, part_path, block_size, errors, id_field, id_width):
+    """Process-pool worker: convert one byte range of `src` into a part file of raw records."""
+    written = skipped = 0
+    with open(part_path, "wb") as part:
+        for rows, ids, bad in _convert_jsonl_blocks(src, start, end, block_size, errors, id_field, id_width):
+            records = rows if ids is None else np.hstack([rows, ids])
+            part.write(records.tobytes())
+            written += len(rows)
+            skipped += bad
+    return written, skipped
+
+
+def convert_jsonl_to_frk(
+    src,
+    dst,
+    block_size: int = _CONVERT_BLOCK_SIZE,
+    workers: int = 1,
+    errors: str = "raise",
+    id_field: Optional[str] = None,
+    id_width: int = 0,
+    append: bool = False,
+):
+    """
+    Stream a JSONL file of legacy payload dicts into a .frk payload file.
+    
+    Lines are parsed `block_size` at a time and each block is quantized and
+    packed with array operations, so memory stays bounded by the block size.
+    With `workers` > 1 the input is split into byte ranges aligned to line
+    starts; each range is converted in a separate process into a part file,
+    and the parts are appended to `dst` in input order.
+    
+    Args:
+        src: JSONL file with one legacy dict (`to_legacy_dict` form) per line
+        dst: Output .frk file
+        block_size: Lines converted per block
+        workers: Number of processes (1 converts inline)
+        errors: "raise" to stop at the first invalid line, "skip" to drop it
+        id_field: Optional dict key whose value is stored in the id column
+        id_width: Id column width in bytes (required when `id_field` is set)
+        append: Append to an existing `dst` instead of replacing it
+        
+    Returns:
+        dict: {"written": payloads written, "skipped": invalid lines dropped}
+    """
+    if errors not in _CONVERT_ERRORS:
+        raise ValueError("errors must be 'raise' or 'skip'")
+    if block_size < 1 or workers < 1:
+        raise ValueError("block_size and workers must be at least 1")
+    if id_field is not None and id_width < 1:
+        raise ValueError("id_width must be set when id_field is given")
+    if not append and os.path.exists(dst):
+        os.remove(dst)
+    
+    written = skipped = 0
+    with FracktureFileWriter(dst, id_width=id_width) as writer:
+        if workers == 1:
+            for rows, ids, bad in _convert_jsonl_blocks(src, 0, os.path.getsize(src), block_size, errors, id_field, id_width):
+                writer.append_many(rows, ids=ids)
+                written += len(rows)
+                skipped += bad
+            return {"written": written, "skipped": skipped}
+        
+        size = os.path.getsize(src)
+        ranges = workers * 4
+        bounds = [size * i // ranges for i in range(ranges + 1)]
+        part_dir = tempfile.mkdtemp(prefix=".frk-convert-", dir=os.path.dirname(os.path.abspath(dst)))
+        part_paths = [os.path.join(part_dir, f"part-{i:05d}") for i in range(ranges)]
+        try:
+            convert_range = _pool_workers().convert_jsonl_range
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(
+                        convert_range, src, bounds[i], bounds[i + 1], part_paths[i],
+                        block_size, errors, id_field, id_width,
+                    )
+                    for i in range(ranges)
+                ]
+                for future in futures:
+                    part_written, part_skipped = future.result()
+                    written += part_written
+                    skipped += part_skipped
+            
+            record_size = writer.record_size
+            for part_path in part_paths:
+                with open(part_path, "rb") as part:
+                    while True:
+                        chunk = part.read(block_size * record_size)
+                        if not chunk:
+                            break
+                        records = np.frombuffer(chunk, dtype=np.uint8).reshape(-1, record_size)
+                        writer.append_many(
+                            records[:, :_FRACKTURE_PAYLOAD_LEN],
+                            ids=records[:, _FRACKTURE_PAYLOAD_LEN:] if id_width else None,
+                        )
+        finally:
+            shutil.rmtree(part_dir, ignore_errors=True)
+    return {"written": written, "skipped": skipped}
+
+
+def convert_frk_to_jsonl(src, dst, block_size: int = _CONVERT_BLOCK_SIZE, id_field: Optional[str] = None) -> int:
+    """
+    Stream a .frk payload file back to JSONL of legacy payload dicts.
+    
+    Each line equals `json.dumps(FrackturePayload.from_bytes(p).to_legacy_dict())`,
+    with the record id appended under `id_field` when given.
+    
+    Args:
+        src: Input .frk file
+        dst: Output JSONL file
+        block_size: Records rendered per block
+        id_field: Optional key to write each record's id under
+        
+    Returns:
+        int: Number of lines written
+    """
+    if block_size < 1:
+        raise ValueError("block_size must be at least 1")
+    with open_frk(src) as reader, open(dst, "w", encoding="utf-8") as out:
+        rows, ids = reader.payloads.rows, reader.ids
+        for start in range(0, len(reader), block_size):
+            stop = start + block_size
+            block_ids = ids[start:stop] if reader.id_width else None
+            out.writelines(_legacy_jsonl_lines(rows[start:stop], block_ids, id_field))
+        return len(reader)
+
+
+### === Hashing Functions === ###
+
+_HASH_CHUNK_SIZE = 1024 * 1024  # 1MiB
+
+
+def normalize_to_bytes(data: Any) -> Union[bytes, memoryview]:
+    """Normalize arbitrary data into bytes for hashing.
+
+    Fast-paths bytes-like objects and uses deterministic JSON for dict/list.
+    """
+
+    if isinstance(data, PreparedInput):
+        return data.hash_bytes
+
+    if isinstance(data, memoryview):
+        return data
+
+    if isinstance(data, (bytes, bytearray)):
+        return memoryview(data)
+
+    if isinstance(data, str):
+        return data.encode("utf-8")
 
     if isinstance(data, np.ndarray):
         return data.tobytes()
@@ -799,3 +4640,57 @@ def frackture_decrypt_payload(encrypted_payload, key):
 
     frackture_verify_payload_integrity(encrypted_payload, key)
     return copy.deepcopy(encrypted_payload["data"])
+
+
+### === Command Line === ###
+def _cmd_to_frk(args):
+    stats = convert_jsonl_to_frk(
+        args.input,
+        args.output,
+        block_size=args.block_size,
+        workers=args.workers,
+        errors="skip" if args.skip_invalid else "raise",
+        id_field=args.id_field,
+        id_width=args.id_width,
+        append=args.append,
+    )
+    print(f"Wrote {stats['written']} payloads to {args.output} ({stats['skipped']} invalid lines skipped)")
+    return 0
+
+
+def _cmd_to_jsonl(args):
+    count = convert_frk_to_jsonl(args.input, args.output, block_size=args.block_size, id_field=args.id_field)
+    print(f"Wrote {count} legacy payloads to {args.output}")
+    return 0
+
+
+def main(argv=None):
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Frackture payload conversion tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    parser_frk = subparsers.add_parser("to-frk", help="Convert JSONL legacy payloads to a .frk file")
+    parser_frk.add_argument("input", help="JSONL file of legacy payload dicts")
+    parser_frk.add_argument("output", help="Output .frk file")
+    parser_frk.add_argument("--workers", type=int, default=1, help="Processes splitting the input by byte range")
+    parser_frk.add_argument("--block-size", type=int, default=_CONVERT_BLOCK_SIZE, help="Lines per block")
+    parser_frk.add_argument("--skip-invalid", action="store_true", help="Drop invalid lines instead of failing")
+    parser_frk.add_argument("--id-field", help="Dict key to store in the id column")
+    parser_frk.add_argument("--id-width", type=int, default=0, help="Id column width in bytes")
+    parser_frk.add_argument("--append", action="store_true", help="Append to an existing .frk file")
+    parser_frk.set_defaults(func=_cmd_to_frk)
+    
+    parser_jsonl = subparsers.add_parser("to-jsonl", help="Convert a .frk file to JSONL legacy payloads")
+    parser_jsonl.add_argument("input", help="Input .frk file")
+    parser_jsonl.add_argument("output", help="Output JSONL file")
+    parser_jsonl.add_argument("--block-size", type=int, default=_CONVERT_BLOCK_SIZE, help="Records per block")
+    parser_jsonl.add_argument("--id-field", help="Key to write each record's id under")
+    parser_jsonl.set_defaults(func=_cmd_to_jsonl)
+    
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,38 @@
+"""
+Process-pool entry points for Frackture.
+
+`frackture (2).py` is normally loaded from its file path rather than imported,
+so worker processes cannot resolve pickled references to its functions. The
+functions here live in an importable module instead: each one loads the
+library in the worker on first use and forwards to it. Arguments are plain
+picklable values (tiers travel as their string value).
+"""
+import importlib.util
+import os
+import sys
+
+LIBRARY_NAME = "_frackture_worker_library"
+LIBRARY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "frackture (2).py")
+
+
+def _library():
+    """Load the library once per process under a stable module name."""
+    module = sys.modules.get(LIBRARY_NAME)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(LIBRARY_NAME, LIBRARY_PATH)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[LIBRARY_NAME] = module
+        spec.loader.exec_module(module)
+    return module
+
+
+def compress_chunk(items, tier_name, optimize):
+    """Worker side of `compress_many`: concatenated 65-byte payloads for a chunk."""
+    frackture = _library()
+    tier = None if tier_name is None else frackture.CompressionTier(tier_name)
+    return frackture._compress_chunk(items, tier, optimize)
+
+
+def convert_jsonl_range(src, start, end, part_path, block_size, errors, id_field, id_width):
+    """Worker side of `convert_jsonl_to_frk`: convert one byte range into a part file."""
+    return _library()._convert_jsonl_range(src, start, end, part_path, block_size, errors, id_field, id_width)
@@ -0,0 +1,80 @@
+"""
+Tests for the batched encoder (frackture_v3_3_safe_batch).
+
+Every row of the packed output must be byte-identical to the scalar
+encoder's compact payload for the same vector and tier.
+"""
+import numpy as np
+import pytest
+
+from conftest import frackture_module as frackture
+
+CompressionTier = frackture.CompressionTier
+
+
+def _scalar_rows(matrix, tiers):
+    return [frackture.frackture_v3_3_safe(row, tier=tier).to_bytes() for row, tier in zip(matrix, tiers)]
+
+
+class TestBatchEncoder:
+    """Batch encoder output matches the scalar encoder"""
+
+    def test_output_shape_and_dtype(self):
+        matrix = np.random.default_rng(0).random((7, 768)).astype(np.float32)
+        packed = frackture.frackture_v3_3_safe_batch(matrix)
+        assert packed.shape == (7, 65)
+        assert packed.dtype == np.uint8
+
+    def test_matches_scalar_default_tier(self):
+        matrix = np.random.default_rng(1).random((200, 768)).astype(np.float32)
+        packed = frackture.frackture_v3_3_safe_batch(matrix)
+        expected = _scalar_rows(matrix, [CompressionTier.DEFAULT] * len(matrix))
+        assert [bytes(row) for row in packed] == expected
+
+    def test_matches_scalar_preprocessed_inputs(self):
+        inputs = [b"hello world", "short", {"a": 1}, b"x" * 500, "text " * 200, bytes(range(256)) * 8]
+        tiers = [frackture.select_tier(d) for d in inputs]
+        matrix = np.stack([frackture.frackture_preprocess_universal_v2_6(d, t) for d, t in zip(inputs, tiers)])
+        packed = frackture.frackture_v3_3_safe_batch(matrix, tiers)
+        assert [bytes(row) for row in packed] == _scalar_rows(matrix, tiers)
+
+    def test_mixed_tier_vector(self):
+        matrix = np.random.default_rng(2).random((60, 768)).astype(np.float32)
+        cycle = [CompressionTier.TINY, CompressionTier.DEFAULT, CompressionTier.LARGE]
+        tiers = [cycle[i % 3] for i in range(len(matrix))]
+        packed = frackture.frackture_v3_3_safe_batch(matrix, tiers)
+        assert [bytes(row) for row in packed] == _scalar_rows(matrix, tiers)
+        assert packed[0, 0] & 0x07 == 0b001
+        assert packed[1, 0] & 0x07 == 0b010
+
+    def test_tier_values_accepted(self):
+        matrix = np.random.default_rng(3).random((4, 768)).astype(np.float32)
+        by_enum = frackture.frackture_v3_3_safe_batch(matrix, CompressionTier.TINY)
+        by_value = frackture.frackture_v3_3_safe_batch(matrix, ["tiny"] * 4)
+        assert np.array_equal(by_enum, by_value)
+
+    def test_float64_rows_match_scalar(self):
+        matrix = np.random.default_rng(4).random((20, 768))
+        packed = frackture.frackture_v3_3_safe_batch(matrix)
+        expected = _scalar_rows(matrix, [CompressionTier.DEFAULT] * len(matrix))
+        assert [bytes(row) for row in packed] == expected
+
+    def test_rows_deserialize(self):
+        matrix = np.random.default_rng(5).random((3, 768)).astype(np.float32)
+        packed = frackture.frackture_v3_3_safe_batch(matrix, CompressionTier.LARGE)
+        payload = frackture.FrackturePayload.from_bytes(bytes(packed[2]))
+        assert payload.tier_name == "large"
+
+    def test_empty_batch(self):
+        packed = frackture.frackture_v3_3_safe_batch(np.zeros((0, 768), dtype=np.float32))
+        assert packed.shape == (0, 65)
+
+    def test_rejects_bad_shape(self):
+        with pytest.raises(ValueError):
+            frackture.frackture_v3_3_safe_batch(np.zeros((4, 512), dtype=np.float32))
+        with pytest.raises(ValueError):
+            frackture.frackture_v3_3_safe_batch(np.zeros(768, dtype=np.float32))
+
+    def test_rejects_tier_length_mismatch(self):
+        with pytest.raises(ValueError):
+            frackture.frackture_v3_3_safe_batch(np.zeros((3, 768), dtype=np.float32), ["tiny"])
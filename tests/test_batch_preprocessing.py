@@ -0,0 +1,123 @@
+"""
+Tests for ragged batch preprocessing (frackture_preprocess_batch / compress_batch).
+
+Every row must match the scalar preprocessor and compress_simple for the
+same record, whether records arrive as a list or as buffer + offsets.
+"""
+import os
+
+import numpy as np
+import pytest
+
+from conftest import frackture_module as frackture
+
+CompressionTier = frackture.CompressionTier
+
+
+def _records():
+    rng = np.random.default_rng(9)
+    records = [rng.integers(0, 256, size=int(n), dtype=np.uint8).tobytes() for n in rng.integers(0, 3000, 60)]
+    records += [
+        b"",
+        b"a",
+        b"z" * 99,
+        b"q" * 100,
+        b"w" * 768,
+        b"\x05" * 5000,
+        b"plain text record without extremes " * 100,
+        b"\x40" * 70_000 + b"\x00" + b"\x41" * 10 + b"\xff",
+        os.urandom(767),
+        os.urandom(769),
+    ]
+    return records
+
+
+def _concat(records):
+    offsets = np.zeros(len(records) + 1, dtype=np.int64)
+    np.cumsum([len(r) for r in records], out=offsets[1:])
+    return b"".join(records), offsets
+
+
+class TestBatchPreprocessing:
+    """Batch preprocessing matches the scalar preprocessor"""
+
+    def test_list_of_records(self):
+        records = _records()
+        matrix = frackture.frackture_preprocess_batch(records)
+        assert matrix.shape == (len(records), 768)
+        assert matrix.dtype == np.float32
+        for row, record in zip(matrix, records):
+            assert np.array_equal(row, frackture.frackture_preprocess_universal_v2_6(record))
+
+    def test_buffer_and_offsets(self):
+        records = _records()
+        buffer, offsets = _concat(records)
+        assert np.array_equal(
+            frackture.frackture_preprocess_batch(buffer, offsets),
+            frackture.frackture_preprocess_batch(records),
+        )
+
+    def test_offsets_into_memoryview_with_leading_gap(self):
+        records = [os.urandom(2000), b"short record here, over one hundred bytes long" * 3]
+        buffer, offsets = _concat(records)
+        padded = memoryview(b"HEADER" + buffer)
+        matrix = frackture.frackture_preprocess_batch(padded, offsets + 6)
+        for row, record in zip(matrix, records):
+            assert np.array_equal(row, frackture.frackture_preprocess_universal_v2_6(record))
+
+    def test_str_records_use_utf8(self):
+        records = ["ünïcödé " * 40, "tiny str"]
+        matrix = frackture.frackture_preprocess_batch(records)
+        for row, record in zip(matrix, records):
+            assert np.array_equal(row, frackture.frackture_preprocess_universal_v2_6(record))
+
+    @pytest.mark.parametrize("tier", [CompressionTier.TINY, CompressionTier.DEFAULT, CompressionTier.LARGE])
+    def test_explicit_tier(self, tier):
+        records = _records()[:20] + [b""]
+        matrix = frackture.frackture_preprocess_batch(records, tiers=tier)
+        for row, record in zip(matrix, records):
+            assert np.array_equal(row, frackture.frackture_preprocess_universal_v2_6(record, tier))
+
+    def test_writes_into_out(self):
+        records = _records()
+        out = np.full((len(records), 768), -1.0, dtype=np.float32)
+        result = frackture.frackture_preprocess_batch(records, out=out)
+        assert result is out
+        assert np.array_equal(out, frackture.frackture_preprocess_batch(records))
+
+    def test_rejects_bad_out(self):
+        with pytest.raises(ValueError):
+            frackture.frackture_preprocess_batch([b"abc"], out=np.zeros((2, 768), dtype=np.float32))
+        with pytest.raises(ValueError):
+            frackture.frackture_preprocess_batch([b"abc"], out=np.zeros((1, 768), dtype=np.float64))
+
+    def test_rejects_bad_offsets(self):
+        with pytest.raises(ValueError):
+            frackture.frackture_preprocess_batch(b"abcdef", [0, 4, 2])
+        with pytest.raises(ValueError):
+            frackture.frackture_preprocess_batch(b"abcdef", [0, 10])
+
+    def test_empty_batch(self):
+        assert frackture.frackture_preprocess_batch([]).shape == (0, 768)
+        assert frackture.frackture_preprocess_batch(b"", [0]).shape == (0, 768)
+
+
+class TestCompressBatch:
+    """compress_batch matches compress_simple"""
+
+    def test_auto_tier(self):
+        records = _records()
+        packed = frackture.compress_batch(records)
+        assert [bytes(row) for row in packed] == [frackture.compress_simple(r) for r in records]
+
+    def test_buffer_and_offsets(self):
+        records = _records()
+        buffer, offsets = _concat(records)
+        assert np.array_equal(frackture.compress_batch(buffer, offsets), frackture.compress_batch(records))
+
+    def test_per_row_tiers(self):
+        records = _records()[:12]
+        tiers = [CompressionTier.LARGE if i % 2 else CompressionTier.DEFAULT for i in range(len(records))]
+        packed = frackture.compress_batch(records, tiers=tiers)
+        expected = [frackture.compress_simple(r, tier=t) for r, t in zip(records, tiers)]
+        assert [bytes(row) for row in packed] == expected
@@ -0,0 +1,163 @@
+"""
+Tests for the batched decoder (frackture_v3_3_reconstruct_batch).
+
+Every output row must be identical to the scalar reconstruction of the same
+compact payload, including the TINY tier's 70/30 weighting.
+"""
+import os
+
+import numpy as np
+import pytest
+
+from conftest import frackture_module as frackture
+
+CompressionTier = frackture.CompressionTier
+
+
+def _scalar_rows(packed):
+    return np.stack([frackture.frackture_v3_3_reconstruct(bytes(row)) for row in packed])
+
+
+class TestBatchReconstruction:
+    """Batch decoder output matches the scalar decoder"""
+
+    def test_matches_scalar_mixed_tiers(self):
+        rng = np.random.default_rng(0)
+        records = [os.urandom(int(n)) for n in rng.integers(0, 2000, 300)] + [b"", b"\x00" * 200]
+        packed = frackture.compress_batch(records)
+        assert set(packed[:, 0] & 0x07) == {0b001, 0b010}
+        result = frackture.frackture_v3_3_reconstruct_batch(packed)
+        assert result.shape == (len(records), 768)
+        assert result.dtype == np.float32
+        assert np.array_equal(result, _scalar_rows(packed))
+
+    def test_large_tier_and_v2_rows(self):
+        matrix = np.random.default_rng(1).random((20, 768)).astype(np.float32)
+        packed = np.vstack(
+            [
+                frackture.frackture_v3_3_safe_batch(matrix, CompressionTier.LARGE),
+                frackture.compress_tiny_batch([b"k%d" % i for i in range(20)], version=2),
+            ]
+        )
+        assert np.array_equal(frackture.frackture_v3_3_reconstruct_batch(packed), _scalar_rows(packed))
+
+    def test_arbitrary_payload_bytes(self):
+        rng = np.random.default_rng(2)
+        packed = rng.integers(0, 256, size=(500, 65), dtype=np.uint8)
+        # Any tier flags, including unknown ones that decode as DEFAULT
+        packed[:, 0] = (1 << 3) | rng.integers(0, 8, size=500)
+        assert np.array_equal(frackture.frackture_v3_3_reconstruct_batch(packed), _scalar_rows(packed))
+
+    def test_accepts_concatenated_buffer(self):
+        packed = frackture.compress_batch([b"alpha" * 30, b"beta", b"gamma" * 300])
+        expected = frackture.frackture_v3_3_reconstruct_batch(packed)
+        for buf in (packed.tobytes(), bytearray(packed.tobytes()), memoryview(packed.tobytes())):
+            assert np.array_equal(frackture.frackture_v3_3_reconstruct_batch(buf), expected)
+        assert np.array_equal(frackture.decompress_batch(packed.tobytes()), expected)
+
+    def test_empty_batch(self):
+        result = frackture.frackture_v3_3_reconstruct_batch(b"")
+        assert result.shape == (0, 768)
+
+    def test_rejects_bad_input(self):
+        with pytest.raises(ValueError):
+            frackture.frackture_v3_3_reconstruct_batch(b"\x08" * 64)
+        with pytest.raises(ValueError):
+            frackture.frackture_v3_3_reconstruct_batch(np.zeros((2, 64), dtype=np.uint8))
+        with pytest.raises(ValueError):
+            frackture.frackture_v3_3_reconstruct_batch(np.zeros((2, 65), dtype=np.float32))
+
+    def test_rejects_unsupported_version(self):
+        packed = frackture.compress_batch([b"a", b"b"])
+        packed[1, 0] = (7 << 3) | 0b010
+        with pytest.raises(ValueError):
+            frackture.frackture_v3_3_reconstruct_batch(packed)
+
+
+class TestReconstructionOutputs:
+    """Decoding into caller-provided buffers, memmaps and float16"""
+
+    def _packed(self):
+        rng = np.random.default_rng(13)
+        return frackture.compress_batch([os.urandom(int(n)) for n in rng.integers(1, 1500, 50)])
+
+    def test_batch_out_array(self):
+        packed = self._packed()
+        out = np.full((len(packed), 768), np.nan, dtype=np.float32)
+        result = frackture.frackture_v3_3_reconstruct_batch(packed, out=out)
+        assert result is out
+        assert np.array_equal(out, _scalar_rows(packed))
+
+    def test_batch_strided_out(self):
+        packed = self._packed()
+        backing = np.zeros((len(packed), 768 * 2), dtype=np.float32)
+        out = backing[:, ::2]
+        frackture.frackture_v3_3_reconstruct_batch(packed, out=out)
+        assert np.array_equal(out, _scalar_rows(packed))
+        assert not backing[:, 1::2].any()
+
+    def test_batch_into_memmap(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(frackture, "_RECONSTRUCT_BATCH_BLOCK", 7)
+        packed = self._packed()
+        payload_file = tmp_path / "payloads.bin"
+        payload_file.write_bytes(packed.tobytes())
+        source = np.memmap(payload_file, dtype=np.uint8, mode="r")
+        out = np.memmap(tmp_path / "vectors.f32", dtype=np.float32, mode="w+", shape=(len(packed), 768))
+        frackture.decompress_batch(source, out=out)
+        out.flush()
+        stored = np.fromfile(tmp_path / "vectors.f32", dtype=np.float32).reshape(len(packed), 768)
+        assert np.array_equal(stored, _scalar_rows(packed))
+
+    def test_float16_output(self):
+        packed = self._packed()
+        half = frackture.frackture_v3_3_reconstruct_batch(packed, dtype=np.float16)
+        assert half.dtype == np.float16
+        assert np.array_equal(half, _scalar_rows(packed).astype(np.float16))
+        out = np.empty((len(packed), 768), dtype=np.float16)
+        assert np.array_equal(frackture.decompress_batch(packed, out=out), half)
+
+    def test_rejects_bad_out(self):
+        packed = self._packed()
+        with pytest.raises(ValueError):
+            frackture.frackture_v3_3_reconstruct_batch(packed, out=np.empty((len(packed), 768), dtype=np.float64))
+        with pytest.raises(ValueError):
+            frackture.frackture_v3_3_reconstruct_batch(packed, out=np.empty((1, 768), dtype=np.float32))
+        with pytest.raises(ValueError):
+            frackture.frackture_v3_3_reconstruct_batch(packed, dtype=np.int32)
+
+    def test_single_out(self):
+        payload = frackture.compress_simple(b"single payload into a caller buffer" * 5)
+        expected = frackture.decompress_simple(payload)
+        matrix = np.zeros((3, 768), dtype=np.float32)
+        result = frackture.decompress_simple(payload, out=matrix[1])
+        assert result is not None and np.shares_memory(result, matrix)
+        assert np.array_equal(matrix[1], expected)
+        assert not matrix[0].any() and not matrix[2].any()
+
+        half = np.empty(768, dtype=np.float16)
+        frackture.frackture_v3_3_reconstruct(frackture.FrackturePayload.from_bytes(payload), out=half)
+        assert np.array_equal(half, expected.astype(np.float16))
+
+        with pytest.raises(ValueError):
+            frackture.decompress_simple(payload, out=np.empty(32, dtype=np.float32))
+
+    def test_single_out_decodes_packed_bytes(self, monkeypatch):
+        payloads = [
+            frackture.compress_simple(b"tiny", tier=frackture.CompressionTier.TINY),
+            frackture.compress_simple(os.urandom(3000), tier=frackture.CompressionTier.LARGE),
+        ]
+        expected = [frackture.frackture_v3_3_reconstruct(p) for p in payloads]
+
+        def no_hex_decode(*args, **kwargs):
+            raise AssertionError("out= path must not go through the hex decoders")
+
+        monkeypatch.setattr(frackture, "symbolic_channel_decode", no_hex_decode)
+        monkeypatch.setattr(frackture, "entropy_channel_decode", no_hex_decode)
+        backing = np.zeros((2, 768 * 2), dtype=np.float32)
+        for i, payload in enumerate(payloads):
+            assert frackture.frackture_v3_3_reconstruct(payload, out=backing[i, ::2]) is not None
+            assert np.array_equal(backing[i, ::2], expected[i])
+            out = np.empty(768, dtype=np.float32)
+            frackture.frackture_v3_3_reconstruct(frackture.FrackturePayload.from_bytes(payload), out=out)
+            assert np.array_equal(out, expected[i])
+        assert not backing[:, 1::2].any()
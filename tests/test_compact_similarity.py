@@ -0,0 +1,85 @@
+"""
+Tests for the 32-value compact similarity space.
+
+Reconstructed vectors are one 32-value block tiled 24 times; the compact
+form and its similarity functions must agree with the full vectors.
+"""
+import os
+
+import numpy as np
+import pytest
+
+from conftest import frackture_module as frackture
+
+
+@pytest.fixture(scope="module")
+def packed():
+    rng = np.random.default_rng(12)
+    records = [os.urandom(int(n)) for n in rng.integers(1, 3000, 200)] + [b"tiny", b"\x00" * 300]
+    return frackture.compress_batch(records)
+
+
+class TestCompactForm:
+    """Compact vectors expand to the full reconstructions"""
+
+    def test_batch_expands_to_full(self, packed):
+        compact = frackture.decompress_compact_batch(packed)
+        assert compact.shape == (len(packed), 32)
+        assert compact.dtype == np.float32
+        assert np.array_equal(frackture.expand_compact_vector(compact), frackture.decompress_batch(packed))
+
+    def test_single_payload_formats(self, packed):
+        for row in packed[:10]:
+            payload = bytes(row)
+            full = frackture.decompress_simple(payload)
+            obj = frackture.FrackturePayload.from_bytes(payload)
+            for form in (payload, obj, obj.to_legacy_dict()):
+                compact = frackture.decompress_compact_vector(form)
+                assert compact.shape == (32,)
+                assert np.array_equal(frackture.expand_compact_vector(compact), full)
+
+    def test_full_vector_is_periodic(self, packed):
+        full = frackture.decompress_simple(bytes(packed[0]))
+        assert np.array_equal(full.reshape(24, 32), np.broadcast_to(full[:32], (24, 32)))
+
+    def test_expand_rejects_wrong_width(self):
+        with pytest.raises(ValueError):
+            frackture.expand_compact_vector(np.zeros(16))
+
+
+class TestCompactSimilarity:
+    """Similarity on the compact form equals similarity on full vectors"""
+
+    def test_matches_full_vector_metrics(self, packed):
+        compact = frackture.decompress_compact_batch(packed)
+        full = frackture.decompress_batch(packed).astype(np.float64)
+        query, q_full = compact[3], full[3]
+
+        assert np.allclose(frackture.compact_dot(query, compact), full @ q_full, rtol=1e-12)
+        norms = np.linalg.norm(full, axis=1)
+        nonzero = norms > 0
+        cos = full[nonzero] @ q_full / (norms[nonzero] * np.linalg.norm(q_full))
+        assert np.allclose(frackture.compact_cosine(query, compact)[nonzero], cos, rtol=1e-12)
+        assert np.allclose(frackture.compact_l2(query, compact), np.linalg.norm(full - q_full, axis=1), atol=1e-12)
+
+    def test_rankings_identical(self, packed):
+        compact = frackture.decompress_compact_batch(packed)
+        full = frackture.decompress_batch(packed).astype(np.float64)
+        norms = np.linalg.norm(full, axis=1)
+        nonzero = norms > 0
+        cos = full[nonzero] @ full[0] / (norms[nonzero] * norms[0])
+        ranked = np.argsort(-frackture.compact_cosine(compact[0], compact[nonzero]))
+        assert np.array_equal(ranked, np.argsort(-cos))
+
+    def test_scalar_results(self):
+        a = np.linspace(0, 1, 32, dtype=np.float32)
+        assert frackture.compact_cosine(a, a) == pytest.approx(1.0)
+        assert frackture.compact_l2(a, a) == 0.0
+        assert frackture.compact_dot(a, a) == pytest.approx(24 * float(np.dot(a, a)))
+
+    def test_zero_vector_cosine(self):
+        assert frackture.compact_cosine(np.zeros(32), np.ones(32)) == 0.0
+
+    def test_rejects_wrong_width(self):
+        with pytest.raises(ValueError):
+            frackture.compact_cosine(np.zeros(768), np.zeros(768))
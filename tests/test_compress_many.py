@@ -0,0 +1,103 @@
+"""
+Tests for compress_many.
+
+Parallel output must match compress_simple item by item for both backends.
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+from conftest import frackture_module as frackture
+
+CompressionTier = frackture.CompressionTier
+
+
+def _inputs():
+    rng = np.random.default_rng(8)
+    items = [rng.integers(0, 256, size=n, dtype=np.uint8).tobytes() for n in (1, 50, 99, 100, 500, 5000)]
+    items += ["log line %d" % i for i in range(40)]
+    items += [{"id": i, "tags": ["a", "b"]} for i in range(10)]
+    items += [b"x" * 2000, [1, 2, 3], np.arange(20, dtype=np.float32)]
+    return items
+
+
+@pytest.fixture(scope="module")
+def items():
+    return _inputs()
+
+
+@pytest.fixture(scope="module")
+def expected(items):
+    return [frackture.compress_simple(item) for item in items]
+
+
+class TestCompressMany:
+    """compress_many matches compress_simple"""
+
+    @pytest.mark.parametrize("backend", ["process", "thread"])
+    def test_ordered_list(self, items, expected, backend):
+        assert frackture.compress_many(items, workers=2, backend=backend, chunksize=7) == expected
+
+    @pytest.mark.parametrize("backend", ["process", "thread"])
+    def test_packed_array(self, items, expected, backend):
+        packed = frackture.compress_many(iter(items), workers=2, backend=backend, chunksize=5, packed=True)
+        assert packed.shape == (len(items), 65)
+        assert packed.dtype == np.uint8
+        assert [bytes(row) for row in packed] == expected
+
+    @pytest.mark.parametrize("backend", ["process", "thread"])
+    def test_unordered_returns_indices(self, items, expected, backend):
+        indices, payloads = frackture.compress_many_unordered(items, workers=3, backend=backend, chunksize=4)
+        assert sorted(indices.tolist()) == list(range(len(items)))
+        assert all(payloads[k] == expected[i] for k, i in enumerate(indices))
+
+    def test_ordered_false_delegates_to_unordered(self, items, expected):
+        indices, payloads = frackture.compress_many(items, workers=2, backend="thread", chunksize=4, ordered=False)
+        assert sorted(indices.tolist()) == list(range(len(items)))
+        assert all(payloads[k] == expected[i] for k, i in enumerate(indices))
+
+    def test_inline_single_worker(self, items, expected):
+        assert frackture.compress_many(items, workers=1) == expected
+
+    def test_tier_and_optimize_forwarded(self, items):
+        result = frackture.compress_many(items, workers=2, backend="thread", tier=CompressionTier.LARGE, optimize=True)
+        assert result == [frackture.compress_simple(i, tier=CompressionTier.LARGE, optimize=True) for i in items]
+
+    def test_prepared_inputs_cross_processes(self):
+        prepared = [frackture.PreparedInput("prepared %d" % i) for i in range(6)]
+        result = frackture.compress_many(prepared, workers=2, backend="process", chunksize=2)
+        assert result == [frackture.compress_simple(p.data) for p in prepared]
+
+    def test_process_backend_leaves_module_registry_alone(self, items, expected):
+        before = sys.modules.get(frackture.__name__)
+        assert frackture.compress_many(items[:8], workers=2, backend="process", tier=CompressionTier.DEFAULT) == [
+            frackture.compress_simple(item, tier=CompressionTier.DEFAULT) for item in items[:8]
+        ]
+        assert sys.modules.get(frackture.__name__) is before
+
+    def test_unordered_packed(self, items, expected):
+        indices, packed = frackture.compress_many_unordered(items, workers=2, backend="thread", chunksize=3, packed=True)
+        assert packed.shape == (len(items), 65)
+        assert all(bytes(packed[k]) == expected[i] for k, i in enumerate(indices))
+
+    def test_large_inputs_thread_backend(self):
+        blobs = [os.urandom(300_000) for _ in range(6)]
+        assert frackture.compress_many(blobs, workers=3, backend="thread", chunksize=1) == [
+            frackture.compress_simple(b) for b in blobs
+        ]
+
+    def test_empty_iterable(self):
+        assert frackture.compress_many([], workers=2) == []
+        assert frackture.compress_many([], workers=2, packed=True).shape == (0, 65)
+        indices, payloads = frackture.compress_many_unordered([], workers=2)
+        assert len(indices) == 0 and payloads == []
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            frackture.compress_many([b"a"], backend="gpu")
+        with pytest.raises(ValueError):
+            frackture.compress_many([b"a"], chunksize=0)
+        with pytest.raises(ValueError):
+            frackture.compress_many([b"a"], workers=0)
@@ -0,0 +1,199 @@
+"""
+Tests for DedupEngine streaming near-duplicate clustering.
+
+Assignments must match a straightforward reference implementation of the
+same exact / blocking / L2 rules, regardless of how items are split across
+add() calls, merges of recent postings, or save-and-resume via the state file.
+"""
+import json
+import os
+
+import numpy as np
+import pytest
+
+from conftest import frackture_module as frackture
+
+
+def _corpus(n=400, seed=0):
+    """Distinct short records plus exact copies and entropy-tweaked near duplicates."""
+    rng = np.random.default_rng(seed)
+    words = "alpha beta gamma delta error warning timeout request served cache miss hit".split()
+    records = [(" ".join(rng.choice(words, 6)) + " %d" % i).encode() for i in range(n)]
+    rows = frackture.compress_tiny_batch(records)
+    near = rows[rng.choice(n, n // 4, replace=False)].copy()
+    near[:, 33] ^= 1  # lowest bit of the first entropy value
+    exact = rows[rng.choice(n, n // 4, replace=False)]
+    stream = np.concatenate([rows, near, exact])
+    return stream[rng.permutation(len(stream))]
+
+
+def _reference(rows, threshold=2.0, entropy_quantum=1024, max_block=64):
+    """Item-by-item clustering with plain dicts and full reconstructions."""
+    keys = frackture._dedup_block_keys(rows, entropy_quantum).tolist()
+    full = frackture.frackture_v3_3_reconstruct_batch(rows).astype(np.float64)
+    exact, blocks, reps, out = {}, {}, [], []
+    for i, row in enumerate(rows):
+        payload = row.tobytes()
+        if payload in exact:
+            out.append(exact[payload])
+            continue
+        candidates = sorted({c for k in keys[i] if len(blocks.get(k, [])) <= max_block for c in blocks.get(k, [])})
+        cluster = -1
+        if candidates:
+            dist = [np.linalg.norm(full[i] - full[reps[c]]) for c in candidates]
+            best = int(np.argmin(dist))
+            if dist[best] <= threshold:
+                cluster = candidates[best]
+        if cluster < 0:
+            cluster = len(reps)
+            reps.append(i)
+            for k in keys[i]:
+                members = blocks.setdefault(k, [])
+                if len(members) <= max_block:
+                    members.append(cluster)
+        exact[payload] = cluster
+        out.append(cluster)
+    return np.array(out)
+
+
+class TestDedupEngine:
+    """Cluster assignments and counters"""
+
+    def test_matches_reference(self):
+        rows = _corpus()
+        engine = frackture.DedupEngine()
+        assert np.array_equal(engine.add(rows), _reference(rows))
+
+    @pytest.mark.parametrize("max_block", [1, 3, 64])
+    def test_saturated_keys_match_reference(self, max_block):
+        # Random vectors share few distinct symbolic bands, so keys saturate quickly
+        matrix = np.random.default_rng(1).random((300, 768)).astype(np.float32)
+        rows = frackture.frackture_v3_3_safe_batch(matrix)
+        near = rows[::3].copy()
+        near[:, 40] ^= 1
+        rows = np.concatenate([rows, near])
+        engine = frackture.DedupEngine(max_block=max_block)
+        assert np.array_equal(engine.add(rows), _reference(rows, max_block=max_block))
+
+    def test_exact_and_near_duplicates(self):
+        rows = frackture.compress_tiny_batch([b"first record", b"second, unrelated input"])
+        near = rows[:1].copy()
+        near[0, 33] ^= 1
+        engine = frackture.DedupEngine()
+        clusters = engine.add(np.concatenate([rows, rows[:1], near]))
+        assert list(clusters) == [0, 1, 0, 0]
+        assert engine.stats() == {
+            "items": 4, "exact_duplicates": 1, "near_duplicates": 1, "clusters": 2, "unique_payloads": 3
+        }
+        assert engine.representatives.to_bytes() == rows.tobytes()
+
+    def test_zero_threshold_only_merges_identical_reconstructions(self):
+        rows = frackture.compress_tiny_batch([b"record"])
+        near = rows.copy()
+        near[0, 33] ^= 1
+        engine = frackture.DedupEngine(threshold=0.0)
+        assert list(engine.add(np.concatenate([rows, near]))) == [0, 1]
+
+    def test_independent_of_batching(self, monkeypatch):
+        rows = _corpus(seed=2)
+        expected = frackture.DedupEngine().add(rows)
+        monkeypatch.setattr(frackture, "_DEDUP_MERGE_MIN", 5)
+        engine = frackture.DedupEngine()
+        chunked = np.concatenate([engine.add(rows[i : i + 37]) for i in range(0, len(rows), 37)])
+        assert np.array_equal(chunked, expected)
+        assert len(engine._posting_keys) > 0
+        single = frackture.DedupEngine()
+        assert [int(single.add(bytes(r))[0]) for r in rows[:50]] == list(expected[:50])
+
+    def test_payload_object_and_list_input(self):
+        rows = _corpus(40, seed=3)
+        engine = frackture.DedupEngine()
+        objects = [frackture.FrackturePayload.from_bytes(bytes(r)) for r in rows]
+        assert np.array_equal(engine.add(objects), _reference(rows))
+        assert engine.add(objects[0])[0] == engine.add(frackture.PayloadArray(rows[:1]))[0]
+
+    def test_empty_and_invalid(self):
+        engine = frackture.DedupEngine()
+        assert engine.add([]).shape == (0,)
+        bad = frackture.compress_tiny_batch([b"x"]).copy()
+        bad[0, 0] = 0
+        with pytest.raises(ValueError):
+            engine.add(bad)
+        with pytest.raises(ValueError):
+            frackture.DedupEngine(threshold=-1)
+        with pytest.raises(ValueError):
+            frackture.DedupEngine(max_block=0)
+
+
+class TestDedupPersistence:
+    """State file round trips"""
+
+    def test_resume_matches_single_run(self, tmp_path):
+        rows = _corpus(seed=4)
+        expected = frackture.DedupEngine().add(rows)
+        path = tmp_path / "dedup.frk"
+        half = len(rows) // 2
+        with frackture.DedupEngine(path=path) as engine:
+            first = engine.add(rows[:half])
+        with frackture.DedupEngine(path=path) as engine:
+            assert engine.num_clusters == int(first.max()) + 1
+            second = engine.add(rows[half:])
+        assert np.array_equal(np.concatenate([first, second]), expected)
+
+    def test_resume_with_saturated_keys(self, tmp_path):
+        rows = _corpus(seed=5)
+        expected = frackture.DedupEngine(max_block=2).add(rows)
+        path = tmp_path / "dedup.frk"
+        with frackture.DedupEngine(path=path, max_block=2) as engine:
+            engine.add(rows[:150])
+        with frackture.DedupEngine(path=path, max_block=2) as engine:
+            assert np.array_equal(engine.add(rows[150:]), expected[150:])
+
+    @pytest.mark.parametrize("setting", [{"entropy_quantum": 512}, {"max_block": 8}])
+    def test_rejects_changed_blocking_settings(self, tmp_path, setting):
+        rows = _corpus(seed=6)
+        path = tmp_path / "dedup.frk"
+        with frackture.DedupEngine(path=path) as engine:
+            engine.add(rows[:50])
+        with open(str(path) + ".json") as f:
+            assert json.load(f) == {"entropy_quantum": 1024, "max_block": frackture._DEDUP_MAX_BLOCK}
+        with pytest.raises(ValueError, match=next(iter(setting))):
+            frackture.DedupEngine(path=path, **setting)
+        # A different threshold does not change the stored postings
+        with frackture.DedupEngine(path=path, threshold=1.0) as engine:
+            assert engine.num_clusters > 0
+
+    def test_resume_without_settings_file(self, tmp_path):
+        rows = _corpus(seed=7)
+        expected = frackture.DedupEngine(max_block=4).add(rows)
+        path = tmp_path / "dedup.frk"
+        with frackture.DedupEngine(path=path, max_block=4) as engine:
+            engine.add(rows[:100])
+        os.remove(str(path) + ".json")
+        with frackture.DedupEngine(path=path, max_block=4) as engine:
+            assert np.array_equal(engine.add(rows[100:]), expected[100:])
+        with pytest.raises(ValueError):
+            frackture.DedupEngine(path=path)
+
+    def test_state_file_contents(self, tmp_path):
+        rows = frackture.compress_tiny_batch([b"one", b"two"])
+        path = tmp_path / "dedup.frk"
+        with frackture.DedupEngine(path=path) as engine:
+            engine.add(np.concatenate([rows, rows]))
+        with frackture.open_frk(path) as reader:
+            assert len(reader) == 2
+            assert reader.payloads.to_bytes() == rows.tobytes()
+            assert list(np.ascontiguousarray(reader.ids).view("<i8").ravel()) == [0, 1]
+
+    def test_rejects_foreign_files(self, tmp_path):
+        path = tmp_path / "plain.frk"
+        with frackture.FracktureFileWriter(path) as writer:
+            writer.append_many(frackture.compress_tiny_batch([b"a"]))
+        with pytest.raises(ValueError):
+            frackture.DedupEngine(path=path)
+
+        corrupt = tmp_path / "corrupt.frk"
+        with frackture.FracktureFileWriter(corrupt, id_width=8) as writer:
+            writer.append_many(frackture.compress_tiny_batch([b"a", b"b"]), ids=np.array([[1] + [0] * 7] * 2, dtype=np.uint8))
+        with pytest.raises(ValueError):
+            frackture.DedupEngine(path=corrupt)
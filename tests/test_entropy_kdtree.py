@@ -0,0 +1,120 @@
+"""
+Tests for EntropyKDTree.
+
+Radius and k-nearest queries must match a brute-force scan of the 16
+quantized entropy values, including ties and degenerate trees.
+"""
+import numpy as np
+import pytest
+
+from conftest import frackture_module as frackture
+
+
+def _clustered(n=5000, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.integers(0, 65536, (12, 16))
+    points = centers[rng.integers(0, 12, n)] + rng.normal(0, 1500, (n, 16))
+    return np.clip(points, 0, 65535).astype(np.uint16)
+
+
+def _brute(points, query, k=None, r=None):
+    dist_sq = ((points.astype(np.int64) - np.asarray(query, dtype=np.int64)) ** 2).sum(axis=1)
+    order = np.lexsort((np.arange(len(points)), dist_sq))
+    if r is not None:
+        order = order[dist_sq[order] <= r * r]
+    return order[:k], np.sqrt(dist_sq[order[:k]])
+
+
+class TestEntropyKDTree:
+    """Queries match a brute-force scan"""
+
+    @pytest.mark.parametrize("leaf_size", [1, 7, 64])
+    def test_knn_matches_brute_force(self, leaf_size):
+        points = _clustered()
+        tree = frackture.EntropyKDTree(points, leaf_size=leaf_size)
+        rng = np.random.default_rng(1)
+        queries = list(points[:5]) + list(rng.integers(0, 65536, (5, 16)))
+        for query in queries:
+            for k in (1, 10, 200):
+                ids, distances = tree.knn(query, k=k)
+                ref_ids, ref_distances = _brute(points, query, k=k)
+                assert np.array_equal(ids, ref_ids)
+                assert np.allclose(distances, ref_distances)
+
+    @pytest.mark.parametrize("r", [0.0, 1500.0, 4000.0, 6000.5, 1e6])
+    def test_radius_matches_brute_force(self, r):
+        points = _clustered()
+        tree = frackture.EntropyKDTree(points, leaf_size=16)
+        for query in points[[0, 100, 4999]]:
+            ids, distances = tree.radius(query, r)
+            ref_ids, ref_distances = _brute(points, query, r=r)
+            assert np.array_equal(ids, ref_ids)
+            assert np.allclose(distances, ref_distances)
+
+    def test_radius_boundary_is_inclusive(self):
+        points = np.zeros((3, 16), dtype=np.uint16)
+        points[1, 0] = 3
+        points[1, 1] = 4
+        points[2, 0] = 6
+        tree = frackture.EntropyKDTree(points, leaf_size=1)
+        assert list(tree.radius(np.zeros(16, dtype=np.int64), 5.0)[0]) == [0, 1]
+        assert list(tree.radius(np.zeros(16, dtype=np.int64), 4.999)[0]) == [0]
+
+    def test_ties_ordered_by_id(self):
+        points = np.tile(np.arange(16, dtype=np.uint16), (200, 1))
+        tree = frackture.EntropyKDTree(points, ids=np.arange(200)[::-1], leaf_size=4)
+        ids, distances = tree.knn(points[0], k=5)
+        assert list(ids) == [0, 1, 2, 3, 4]
+        assert np.array_equal(distances, np.zeros(5))
+
+    def test_balanced_leaves(self):
+        tree = frackture.EntropyKDTree(_clustered(1000), leaf_size=10)
+        sizes = np.diff(tree._leaf_bounds)
+        assert tree.depth == 6
+        assert sizes.min() >= 10 and sizes.max() < 20
+
+    def test_payload_inputs(self):
+        matrix = np.random.default_rng(2).random((300, 768)).astype(np.float32)
+        rows = frackture.frackture_v3_3_safe_batch(matrix)
+        tree = frackture.EntropyKDTree(frackture.PayloadArray(rows))
+        entropy = frackture.PayloadArray(rows).entropy
+        payload = frackture.FrackturePayload.from_bytes(bytes(rows[9]))
+        expected = _brute(entropy, entropy[9], k=4)[0]
+        for query in (bytes(rows[9]), payload, payload.entropy, entropy[9]):
+            assert np.array_equal(tree.knn(query, k=4)[0], expected)
+        from_list = frackture.EntropyKDTree([bytes(r) for r in rows])
+        assert np.array_equal(from_list.knn(payload, k=4)[0], expected)
+
+    def test_from_frk(self, tmp_path):
+        matrix = np.random.default_rng(3).random((500, 768)).astype(np.float32)
+        rows = frackture.frackture_v3_3_safe_batch(matrix)
+        path = tmp_path / "corpus.frk"
+        with frackture.FracktureFileWriter(path, id_width=4) as writer:
+            writer.append_many(rows, ids=[b"r%d" % i for i in range(500)])
+        tree = frackture.EntropyKDTree.from_frk(path, leaf_size=8)
+        entropy = frackture.PayloadArray(rows).entropy
+        assert len(tree) == 500
+        assert np.array_equal(tree.knn(bytes(rows[42]), k=6)[0], _brute(entropy, entropy[42], k=6)[0])
+
+    def test_small_and_empty_trees(self):
+        empty = frackture.EntropyKDTree(np.zeros((0, 16), dtype=np.uint16))
+        assert len(empty.knn(np.zeros(16, dtype=np.int64), k=3)[0]) == 0
+        assert len(empty.radius(np.zeros(16, dtype=np.int64), 10.0)[0]) == 0
+        tiny = frackture.EntropyKDTree(_clustered(3), leaf_size=64)
+        assert tiny.depth == 0
+        assert len(tiny.knn(np.zeros(16, dtype=np.int64), k=10)[0]) == 3
+
+    def test_rejects_bad_input(self):
+        tree = frackture.EntropyKDTree(_clustered(50))
+        with pytest.raises(ValueError):
+            tree.knn(np.zeros(15, dtype=np.int64))
+        with pytest.raises(ValueError):
+            tree.knn(np.zeros((2, 16), dtype=np.int64))
+        with pytest.raises(ValueError):
+            tree.radius(np.zeros(16, dtype=np.int64), -1.0)
+        with pytest.raises(ValueError):
+            frackture.EntropyKDTree(np.full((2, 16), 70000))
+        with pytest.raises(ValueError):
+            frackture.EntropyKDTree(np.zeros((2, 16)))
+        with pytest.raises(ValueError):
+            frackture.EntropyKDTree(_clustered(5), ids=[1, 2])
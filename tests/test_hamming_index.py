@@ -0,0 +1,99 @@
+"""
+Tests for SymbolicHammingIndex.
+
+Multi-index hashing radius queries must return exactly the items a full
+popcount scan finds within the radius, for both substring widths.
+"""
+import numpy as np
+import pytest
+
+from conftest import frackture_module as frackture
+
+
+def _flip(fingerprint, bits, rng):
+    flipped = fingerprint.copy()
+    for bit in rng.choice(256, bits, replace=False):
+        flipped[bit // 8] ^= 1 << (bit % 8)
+    return flipped
+
+
+def _planted(n=5000, seed=0):
+    """Random fingerprints with near-duplicates of item 0 at known distances."""
+    rng = np.random.default_rng(seed)
+    fingerprints = rng.integers(0, 256, (n, 32), dtype=np.uint8)
+    distances = [0, 1, 5, 15, 16, 17, 31, 32, 40, 70]
+    for j, bits in enumerate(distances):
+        fingerprints[10 + j] = _flip(fingerprints[0], bits, rng)
+    return fingerprints
+
+
+def _brute(fingerprints, query, r):
+    bits = np.unpackbits(fingerprints ^ query, axis=1).sum(axis=1)
+    hits = np.flatnonzero(bits <= r)
+    order = np.lexsort((hits, bits[hits]))
+    return hits[order], bits[hits][order]
+
+
+class TestSymbolicHammingIndex:
+    """Radius queries match a brute-force scan"""
+
+    @pytest.mark.parametrize("substring_bits", [8, 16])
+    @pytest.mark.parametrize("r", [0, 1, 15, 16, 17, 31, 40, 47, 100])
+    def test_radius_matches_brute_force(self, substring_bits, r):
+        fingerprints = _planted()
+        index = frackture.SymbolicHammingIndex.from_payloads(fingerprints, substring_bits=substring_bits)
+        ids, distances = index.radius(fingerprints[0], r)
+        ref_ids, ref_distances = _brute(fingerprints, fingerprints[0], r)
+        assert np.array_equal(ids, ref_ids)
+        assert np.array_equal(distances, ref_distances)
+
+    def test_distances_scan(self):
+        fingerprints = _planted(500)
+        index = frackture.SymbolicHammingIndex.from_payloads(fingerprints)
+        expected = np.unpackbits(fingerprints ^ fingerprints[3], axis=1).sum(axis=1)
+        assert np.array_equal(index.distances(fingerprints[3]), expected)
+
+    def test_packed_words(self):
+        fingerprints = _planted(30)
+        index = frackture.SymbolicHammingIndex.from_payloads(fingerprints)
+        assert index.fingerprints.shape == (30, 4)
+        assert index.fingerprints.dtype == np.uint64
+        assert index.fingerprints.tobytes() == fingerprints.tobytes()
+
+    def test_payload_inputs(self):
+        matrix = np.random.default_rng(1).random((50, 768)).astype(np.float32)
+        rows = frackture.frackture_v3_3_safe_batch(matrix)
+        index = frackture.SymbolicHammingIndex.from_payloads(frackture.PayloadArray(rows))
+        payload = frackture.FrackturePayload.from_bytes(bytes(rows[7]))
+        for query in (bytes(rows[7]), payload, payload.to_legacy_dict(), np.frombuffer(payload.symbolic, np.uint8)):
+            ids, distances = index.radius(query, 0)
+            assert 7 in ids and distances[0] == 0
+        from_list = frackture.SymbolicHammingIndex.from_payloads([bytes(r) for r in rows])
+        assert np.array_equal(from_list.fingerprints, index.fingerprints)
+        mixed = frackture.SymbolicHammingIndex.from_payloads([payload.to_legacy_dict(), payload])
+        assert np.array_equal(mixed.fingerprints[0], index.fingerprints[7])
+
+    def test_incremental_add_rebuilds_tables(self):
+        fingerprints = _planted(2000)
+        index = frackture.SymbolicHammingIndex()
+        index.add(fingerprints[:5])
+        assert list(index.radius(fingerprints[0], 20)[0]) == [0]
+        index.add(fingerprints[5:], ids=np.arange(5, 2000) + 100_000)
+        ids, _ = index.radius(fingerprints[0], 20)
+        assert list(ids) == [0, 100_010, 100_011, 100_012, 100_013, 100_014, 100_015]
+
+    def test_empty_index(self):
+        index = frackture.SymbolicHammingIndex()
+        ids, distances = index.radius(np.zeros(32, dtype=np.uint8), 10)
+        assert len(ids) == 0 and len(distances) == 0
+
+    def test_rejects_bad_input(self):
+        with pytest.raises(ValueError):
+            frackture.SymbolicHammingIndex(substring_bits=12)
+        index = frackture.SymbolicHammingIndex.from_payloads(_planted(30))
+        with pytest.raises(ValueError):
+            index.radius(np.zeros((2, 32), dtype=np.uint8), 3)
+        with pytest.raises(ValueError):
+            index.radius(np.zeros(32, dtype=np.uint8), -1)
+        with pytest.raises(ValueError):
+            index.add(np.zeros((2, 32), dtype=np.uint8), ids=[1])
@@ -0,0 +1,172 @@
+"""
+Tests for streaming conversion between legacy JSONL payloads and .frk files.
+
+Packed rows must match `FrackturePayload.from_legacy_dict(...).to_bytes()`
+and the reverse direction must emit `json.dumps(to_legacy_dict())` lines.
+"""
+import io
+import json
+import os
+
+import numpy as np
+import pytest
+
+from conftest import frackture_module as frackture
+
+FrackturePayload = frackture.FrackturePayload
+
+
+@pytest.fixture(scope="module")
+def legacy_dicts():
+    rng = np.random.default_rng(18)
+    packed = frackture.compress_batch([os.urandom(int(n)) for n in rng.integers(1, 2000, 80)])
+    dicts = [FrackturePayload.from_bytes(bytes(row)).to_legacy_dict() for row in packed]
+    for d in dicts[:20]:
+        # Arbitrary floats, including values that clip at both ends of the uint16 range
+        d["entropy"] = [float(x) for x in rng.normal(0, 40, 16)]
+    dicts[20]["entropy"][0] = 1e9
+    del dicts[21]["tier_name"]
+    dicts[22]["category_name"] = "text"
+    dicts[23]["entropy"] = [1] * 16
+    return dicts
+
+
+def _write_jsonl(path, objects, newline="\n"):
+    with open(path, "w", newline="") as f:
+        for obj in objects:
+            f.write((obj if isinstance(obj, str) else json.dumps(obj)) + newline)
+
+
+class TestLegacyPacking:
+    """Vectorized quantization matches the scalar path"""
+
+    def test_pack_matches_from_legacy_dict(self, legacy_dicts):
+        rows = frackture.pack_legacy_payloads(legacy_dicts)
+        assert [bytes(r) for r in rows] == [FrackturePayload.from_legacy_dict(d).to_bytes() for d in legacy_dicts]
+
+    @pytest.mark.parametrize(
+        "bad",
+        [
+            {"symbolic": "zz" * 32, "entropy": [0.0] * 16},
+            {"symbolic": "ab" * 31, "entropy": [0.0] * 16},
+            {"symbolic": "ab" * 30 + "a bb", "entropy": [0.0] * 16},
+            {"symbolic": "ab" * 32, "entropy": [0.0] * 15},
+            {"symbolic": "ab" * 32, "entropy": [float("nan")] + [0.0] * 15},
+            {"symbolic": "ab" * 32, "entropy": ["x"] * 16},
+            {"symbolic": "ab" * 32, "entropy": ["1.5"] * 16},
+            {"symbolic": "ab" * 32, "entropy": [0.5] * 15 + ["0.5"]},
+            {"symbolic": "ab" * 32, "entropy": [None] * 16},
+            {"symbolic": "ab" * 32, "entropy": [0.0] * 16, "tier_name": "huge"},
+            {"symbolic": "ab" * 32, "entropy": [0.0] * 16, "actual_size_bytes": -1},
+            {"entropy": [0.0] * 16},
+            [1, 2, 3],
+        ],
+    )
+    def test_invalid_dicts_rejected(self, legacy_dicts, bad):
+        with pytest.raises(ValueError, match="index 3"):
+            frackture.pack_legacy_payloads(legacy_dicts[:3] + [bad])
+
+    def test_jsonl_lines_match_json_dumps(self, legacy_dicts):
+        rows = frackture.pack_legacy_payloads(legacy_dicts)
+        lines = frackture._legacy_jsonl_lines(rows)
+        assert lines == [json.dumps(FrackturePayload.from_bytes(bytes(r)).to_legacy_dict()) + "\n" for r in rows]
+
+
+class TestJsonlRanges:
+    """Byte-range line splitting"""
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 64, 1 << 20])
+    def test_ranges_partition_lines(self, chunk_size):
+        data = b'{"a": 1}\n\n{"b": 22}\r\n   \n{"c": 333}\n{"d": 4444}'
+        expected = [(i, l) for i, l in enumerate_lines(data) if l.strip()]
+        for cuts in ([0, len(data)], [0, 5, 9, 10, 30, len(data)], list(range(len(data) + 1))):
+            found = []
+            for lo, hi in zip(cuts, cuts[1:]):
+                for offsets, lines in frackture._iter_jsonl_range(io.BytesIO(data), lo, hi, chunk_size):
+                    found += zip(offsets, lines)
+            assert found == expected
+
+
+def enumerate_lines(data):
+    offset = 0
+    for line in data.split(b"\n"):
+        yield offset, line
+        offset += len(line) + 1
+
+
+class TestConversion:
+    """File-level conversion in both directions"""
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_round_trip(self, tmp_path, legacy_dicts, workers):
+        src, frk, back = tmp_path / "in.jsonl", tmp_path / "out.frk", tmp_path / "back.jsonl"
+        _write_jsonl(src, legacy_dicts[:40], newline="\r\n")
+        with open(src, "a") as f:
+            f.write("\n" + json.dumps(legacy_dicts[40]))  # blank line, no trailing newline
+        stats = frackture.convert_jsonl_to_frk(src, frk, block_size=7, workers=workers)
+        assert stats == {"written": 41, "skipped": 0}
+
+        expected = frackture.pack_legacy_payloads(legacy_dicts[:41])
+        assert np.array_equal(frackture.open_frk(frk).payloads.rows, expected)
+
+        assert frackture.convert_frk_to_jsonl(frk, back, block_size=5) == 41
+        with open(back) as f:
+            assert f.read().splitlines() == [
+                json.dumps(FrackturePayload.from_bytes(bytes(r)).to_legacy_dict()) for r in expected
+            ]
+
+    def test_ids_round_trip(self, tmp_path, legacy_dicts):
+        src, frk, back = tmp_path / "in.jsonl", tmp_path / "out.frk", tmp_path / "back.jsonl"
+        _write_jsonl(src, [dict(d, doc=f"doc-{i}") for i, d in enumerate(legacy_dicts[:10])])
+        frackture.convert_jsonl_to_frk(src, frk, id_field="doc", id_width=8)
+        reader = frackture.open_frk(frk)
+        assert [reader.get_id(i) for i in range(10)] == [f"doc-{i}".encode() for i in range(10)]
+        frackture.convert_frk_to_jsonl(frk, back, id_field="doc")
+        with open(back) as f:
+            assert [json.loads(line)["doc"] for line in f] == [f"doc-{i}" for i in range(10)]
+
+    def test_invalid_lines(self, tmp_path, legacy_dicts):
+        src, frk = tmp_path / "in.jsonl", tmp_path / "out.frk"
+        _write_jsonl(src, [legacy_dicts[0], "{not json", legacy_dicts[1], {"symbolic": "00"}, legacy_dicts[2]])
+        with pytest.raises(ValueError, match="byte offset"):
+            frackture.convert_jsonl_to_frk(src, frk)
+        stats = frackture.convert_jsonl_to_frk(src, frk, errors="skip")
+        assert stats == {"written": 3, "skipped": 2}
+        assert np.array_equal(frackture.open_frk(frk).payloads.rows, frackture.pack_legacy_payloads(legacy_dicts[:3]))
+
+    @pytest.mark.parametrize("block_size", [1, 2, 1000])
+    def test_objects_must_match_lines(self, tmp_path, legacy_dicts, block_size):
+        src, frk = tmp_path / "in.jsonl", tmp_path / "out.frk"
+        text = json.dumps(legacy_dicts[0])
+        split = text.index(", ") + 1
+        # One dict split across two lines, then two dicts on one line: three lines, three objects
+        lines = [text[:split], text[split:], json.dumps(legacy_dicts[1]) + ", " + json.dumps(legacy_dicts[2])]
+        _write_jsonl(src, lines)
+        with pytest.raises(ValueError, match="byte offset 0 "):
+            frackture.convert_jsonl_to_frk(src, frk, block_size=block_size)
+        stats = frackture.convert_jsonl_to_frk(src, frk, block_size=block_size, errors="skip")
+        assert stats == {"written": 0, "skipped": 3}
+
+    def test_overlong_id_is_invalid(self, tmp_path, legacy_dicts):
+        src, frk = tmp_path / "in.jsonl", tmp_path / "out.frk"
+        _write_jsonl(src, [dict(legacy_dicts[0], doc="short"), dict(legacy_dicts[1], doc="much too long")])
+        stats = frackture.convert_jsonl_to_frk(src, frk, errors="skip", id_field="doc", id_width=6)
+        assert stats == {"written": 1, "skipped": 1}
+
+    def test_replace_and_append(self, tmp_path, legacy_dicts):
+        src, frk = tmp_path / "in.jsonl", tmp_path / "out.frk"
+        _write_jsonl(src, legacy_dicts[:5])
+        frackture.convert_jsonl_to_frk(src, frk)
+        frackture.convert_jsonl_to_frk(src, frk)
+        assert len(frackture.open_frk(frk)) == 5
+        frackture.convert_jsonl_to_frk(src, frk, append=True)
+        assert len(frackture.open_frk(frk)) == 10
+
+    def test_cli(self, tmp_path, legacy_dicts, capsys):
+        src, frk, back = tmp_path / "in.jsonl", tmp_path / "out.frk", tmp_path / "back.jsonl"
+        _write_jsonl(src, legacy_dicts[:6])
+        assert frackture.main(["to-frk", str(src), str(frk), "--block-size", "4"]) == 0
+        assert frackture.main(["to-jsonl", str(frk), str(back)]) == 0
+        assert "Wrote 6 payloads" in capsys.readouterr().out
+        with open(back) as f:
+            assert len(f.readlines()) == 6
@@ -0,0 +1,222 @@
+"""
+Tests for CosineLSHIndex approximate cosine search.
+
+Every returned score must equal the exact cosine of the full reconstructions,
+probing every bucket must reproduce FracktureIndex, and incremental inserts
+and save/load round trips must not change results.
+"""
+import json
+import os
+
+import numpy as np
+import pytest
+
+from conftest import frackture_module as frackture
+
+CompressionTier = frackture.CompressionTier
+
+
+def _rows(n, seed=0):
+    matrix = np.random.default_rng(seed).random((n, 768)).astype(np.float32)
+    tiers = [CompressionTier.TINY if i % 5 == 0 else CompressionTier.DEFAULT for i in range(n)]
+    return frackture.frackture_v3_3_safe_batch(matrix, tiers)
+
+
+def _assert_same_results(a, b):
+    assert np.array_equal(a[0], b[0])
+    assert np.array_equal(a[1], b[1])
+
+
+class TestCosineLSHIndex:
+    """Hashing, candidate lookup and exact re-ranking"""
+
+    def test_scores_are_exact_cosines(self):
+        rows = _rows(2000)
+        index = frackture.CosineLSHIndex.from_payloads(rows, num_tables=8, bits_per_table=8)
+        full = frackture.frackture_v3_3_reconstruct_batch(rows).astype(np.float64)
+        for qi in (0, 13, 1999):
+            ids, scores = index.search(bytes(rows[qi]), k=10, probes=2)
+            assert ids[0] == qi
+            query = full[qi]
+            ref = full[ids] @ query / (np.linalg.norm(full[ids], axis=1) * np.linalg.norm(query))
+            assert np.allclose(scores, ref, atol=1e-9)
+            assert np.all(np.diff(scores) <= 0)
+
+    def test_probing_every_bucket_matches_exact_search(self):
+        rows = _rows(1500, seed=1)
+        index = frackture.CosineLSHIndex.from_payloads(rows, num_tables=2, bits_per_table=1)
+        exact = frackture.FracktureIndex.from_payloads(rows)
+        for qi in (3, 700):
+            assert len(index.candidates(bytes(rows[qi]), probes=1)) == len(rows)
+            ids, scores = index.search(bytes(rows[qi]), k=10, probes=1)
+            ref_ids, ref_scores = exact.search(bytes(rows[qi]), k=10)
+            assert np.array_equal(ids, ref_ids)
+            assert np.allclose(scores, ref_scores, atol=1e-9)
+
+    def test_results_come_from_candidates(self):
+        rows = _rows(1000, seed=2)
+        index = frackture.CosineLSHIndex.from_payloads(rows, num_tables=4, bits_per_table=12)
+        candidates = index.candidates(bytes(rows[5]))
+        ids, _ = index.search(bytes(rows[5]), k=len(rows))
+        assert np.array_equal(np.sort(ids), candidates)
+        assert len(candidates) < len(rows)
+        # Extra probes only add buckets
+        assert np.isin(candidates, index.candidates(bytes(rows[5]), probes=3)).all()
+
+    def test_full_vector_query_hashes_like_compact_query(self):
+        rows = _rows(800, seed=3)
+        index = frackture.CosineLSHIndex.from_payloads(rows, num_tables=6, bits_per_table=10)
+        payload = bytes(rows[9])
+        compact = frackture.decompress_compact_vector(payload)
+        full = frackture.decompress_simple(payload)
+        assert np.array_equal(index.candidates(payload), index.candidates(compact))
+        assert np.array_equal(index.candidates(payload), index.candidates(full))
+        by_full, by_payload = index.search(full, k=5), index.search(payload, k=5)
+        assert np.array_equal(by_full[0], by_payload[0])
+        assert np.allclose(by_full[1], by_payload[1], atol=1e-6)
+
+    def test_center_defaults_to_first_batch_mean(self):
+        rows = _rows(300, seed=4)
+        index = frackture.CosineLSHIndex()
+        assert index.center is None
+        index.add(rows[:100])
+        expected = frackture.decompress_compact_batch(rows[:100]).mean(axis=0, dtype=np.float64)
+        assert np.allclose(index.center, expected)
+        index.add(rows[100:])
+        assert np.allclose(index.center, expected)
+
+    def test_custom_ids_and_limits(self):
+        rows = _rows(200, seed=5)
+        index = frackture.CosineLSHIndex(num_tables=2, bits_per_table=1)
+        index.add(rows, ids=np.arange(200) * 10)
+        ids, scores = index.search(bytes(rows[4]), k=3, probes=1)
+        assert ids[0] == 40
+        assert len(ids) == len(scores) == 3
+        assert len(index.search(bytes(rows[4]), k=0)[0]) == 0
+        assert len(frackture.CosineLSHIndex().search(bytes(rows[4]))[0]) == 0
+
+    def test_64_bit_codes(self):
+        rows = _rows(300, seed=6)
+        index = frackture.CosineLSHIndex.from_payloads(rows, num_tables=2, bits_per_table=64)
+        ids, _ = index.search(bytes(rows[17]), k=1)
+        assert ids[0] == 17
+
+    def test_validation(self):
+        with pytest.raises(ValueError):
+            frackture.CosineLSHIndex(num_tables=0)
+        with pytest.raises(ValueError):
+            frackture.CosineLSHIndex(bits_per_table=65)
+        with pytest.raises(ValueError):
+            frackture.CosineLSHIndex(center=np.zeros(768))
+        index = frackture.CosineLSHIndex.from_payloads(_rows(50), bits_per_table=4)
+        with pytest.raises(ValueError):
+            index.search(np.zeros(32), probes=5)
+        with pytest.raises(ValueError):
+            index.search(np.zeros(32), k=-1)
+        with pytest.raises(ValueError):
+            index.search(np.zeros((2, 32)))
+        with pytest.raises(ValueError):
+            index.add(_rows(3), ids=[1, 2])
+
+
+class TestIncrementalInserts:
+    """Tail-run merging keeps results identical to a bulk build"""
+
+    def test_incremental_matches_bulk(self, monkeypatch):
+        monkeypatch.setattr(frackture, "_LSH_MERGE_MIN", 100)
+        rows = _rows(1200, seed=7)
+        bulk = frackture.CosineLSHIndex.from_payloads(rows, num_tables=6, bits_per_table=10, seed=3)
+        incremental = frackture.CosineLSHIndex(num_tables=6, bits_per_table=10, seed=3, center=bulk.center)
+        for start in range(0, len(rows), 70):
+            incremental.add(rows[start : start + 70])
+        assert len(incremental) == len(bulk)
+        assert np.array_equal(incremental.ids, bulk.ids)
+        for qi in (0, 599, 1199):
+            query = bytes(rows[qi])
+            assert np.array_equal(incremental.candidates(query, probes=2), bulk.candidates(query, probes=2))
+            _assert_same_results(incremental.search(query, k=8, probes=2), bulk.search(query, k=8, probes=2))
+
+    def test_new_items_are_found_before_merge(self):
+        rows = _rows(400, seed=8)
+        index = frackture.CosineLSHIndex.from_payloads(rows[:300], num_tables=4, bits_per_table=8)
+        index.add(rows[300:])
+        for qi in (300, 399):
+            ids, _ = index.search(bytes(rows[qi]), k=1)
+            assert ids[0] == qi
+
+
+class TestPersistence:
+    """save/load round trips, with and without memory mapping"""
+
+    @pytest.mark.parametrize("mmap", [False, True])
+    def test_round_trip(self, tmp_path, mmap):
+        rows = _rows(900, seed=9)
+        index = frackture.CosineLSHIndex.from_payloads(rows[:600], num_tables=5, bits_per_table=9, seed=4)
+        index.add(rows[600:])
+        path = str(tmp_path / "lsh")
+        index.save(path)
+        loaded = frackture.CosineLSHIndex.load(path, mmap=mmap)
+        assert (loaded.num_tables, loaded.bits_per_table, loaded.seed) == (5, 9, 4)
+        assert np.array_equal(loaded.center, index.center)
+        assert np.array_equal(loaded.compact, index.compact)
+        for qi in (1, 450, 899):
+            query = bytes(rows[qi])
+            _assert_same_results(loaded.search(query, k=10, probes=3), index.search(query, k=10, probes=3))
+
+    def test_add_after_mmap_load(self, tmp_path):
+        rows = _rows(500, seed=10)
+        path = str(tmp_path / "lsh")
+        frackture.CosineLSHIndex.from_payloads(rows[:400], num_tables=4, bits_per_table=8).save(path)
+        loaded = frackture.CosineLSHIndex.load(path, mmap=True)
+        loaded.add(rows[400:])
+        reference = frackture.CosineLSHIndex.from_payloads(rows[:400], num_tables=4, bits_per_table=8)
+        reference.add(rows[400:])
+        for qi in (10, 420):
+            query = bytes(rows[qi])
+            _assert_same_results(loaded.search(query, k=10, probes=1), reference.search(query, k=10, probes=1))
+
+    def test_save_over_mmapped_directory(self, tmp_path):
+        rows = _rows(700, seed=11)
+        path = str(tmp_path / "lsh")
+        frackture.CosineLSHIndex.from_payloads(rows[:500], num_tables=4, bits_per_table=8).save(path)
+        loaded = frackture.CosineLSHIndex.load(path, mmap=True)
+        loaded.add(rows[500:])
+        loaded.save(path)
+        assert sorted(os.listdir(path)) == sorted([name + ".npy" for name in frackture._LSH_ARRAYS] + ["meta.json"])
+        reloaded = frackture.CosineLSHIndex.load(path)
+        assert len(reloaded) == 700
+        for qi in (3, 650):
+            query = bytes(rows[qi])
+            _assert_same_results(reloaded.search(query, k=10, probes=2), loaded.search(query, k=10, probes=2))
+
+        # Saving the unmodified mmapped index over itself keeps it loadable too
+        again = frackture.CosineLSHIndex.load(path, mmap=True)
+        again.save(path)
+        _assert_same_results(frackture.CosineLSHIndex.load(path).search(bytes(rows[3]), k=5), again.search(bytes(rows[3]), k=5))
+
+    @pytest.mark.parametrize("name", ["ids", "table_positions"])
+    def test_mismatched_shapes_are_rejected(self, tmp_path, name):
+        path = str(tmp_path / "lsh")
+        frackture.CosineLSHIndex.from_payloads(_rows(100)).save(path)
+        array = np.load(os.path.join(path, name + ".npy"))
+        np.save(os.path.join(path, name + ".npy"), array[..., :-1])
+        with pytest.raises(ValueError, match="inconsistent"):
+            frackture.CosineLSHIndex.load(path)
+
+    def test_interrupted_save_is_rejected(self, tmp_path):
+        path = str(tmp_path / "lsh")
+        frackture.CosineLSHIndex.from_payloads(_rows(100)).save(path)
+        os.remove(os.path.join(path, "meta.json"))
+        with pytest.raises(ValueError):
+            frackture.CosineLSHIndex.load(path)
+
+    def test_unknown_format_is_rejected(self, tmp_path):
+        path = str(tmp_path / "lsh")
+        frackture.CosineLSHIndex.from_payloads(_rows(100)).save(path)
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        meta["format"] = 99
+        with open(os.path.join(path, "meta.json"), "w") as f:
+            json.dump(meta, f)
+        with pytest.raises(ValueError):
+            frackture.CosineLSHIndex.load(path)
@@ -0,0 +1,163 @@
+"""
+Tests for the incremental optimize_frackture and its stopping rules.
+
+The restructured optimizer must select the same payload and report the same
+MSE as the original trial loop, which is kept here as a reference. Target-MSE
+and time-budget modes stop early and report how many trials ran.
+"""
+import numpy as np
+import pytest
+
+from conftest import frackture_module as frackture
+
+CompressionTier = frackture.CompressionTier
+
+
+def _reference_optimize(input_vector, num_trials=5, tier=None):
+    """Original optimizer: full encode and reconstruct per trial."""
+    if tier == CompressionTier.TINY:
+        num_trials = 2
+    best_payload = None
+    best_mse = float("inf")
+    for trial in range(num_trials):
+        symbolic_hex = frackture.frackture_symbolic_fingerprint_f_infinity(input_vector, passes=trial + 2, tier=tier)
+        entropy_values = frackture.entropy_channel_encode(input_vector)
+        payload = frackture.FrackturePayload(
+            symbolic=bytes.fromhex(symbolic_hex),
+            entropy=[int(max(0, min(65535, x * 1000.0))) for x in entropy_values],
+            tier_name=(tier or CompressionTier.DEFAULT).value,
+            version=1,
+        )
+        recon = frackture.frackture_v3_3_reconstruct(payload)
+        mse = np.mean((input_vector - recon) ** 2)
+        if mse < best_mse:
+            best_mse = mse
+            best_payload = payload
+    return best_payload, best_mse
+
+
+INPUTS = [b"hi", "MSE optimization test", b"x" * 1000, bytes(range(256)) * 4, {"key": "value" * 40}]
+
+
+class TestIncrementalOptimizer:
+    """Incremental optimizer matches the reference trial loop"""
+
+    @pytest.mark.parametrize("data", INPUTS)
+    @pytest.mark.parametrize("tier", [None, CompressionTier.TINY, CompressionTier.DEFAULT, CompressionTier.LARGE])
+    def test_matches_reference(self, data, tier):
+        vec = frackture.frackture_preprocess_universal_v2_6(data, tier)
+        for num_trials in (1, 3, 5, 8):
+            payload, mse = frackture.optimize_frackture(vec, num_trials=num_trials, tier=tier)
+            ref_payload, ref_mse = _reference_optimize(vec, num_trials=num_trials, tier=tier)
+            assert payload == ref_payload
+            assert mse == ref_mse
+
+    def test_random_vectors(self):
+        rng = np.random.default_rng(11)
+        for vec in [rng.random(768).astype(np.float32), rng.random(768)]:
+            payload, mse = frackture.optimize_frackture(vec)
+            ref_payload, ref_mse = _reference_optimize(vec)
+            assert payload.to_bytes() == ref_payload.to_bytes()
+            assert mse == ref_mse
+
+    def test_mse_matches_full_reconstruction(self):
+        vec = frackture.frackture_preprocess_universal_v2_6(b"score from channel arrays" * 20)
+        payload, mse = frackture.optimize_frackture(vec)
+        recon = frackture.frackture_v3_3_reconstruct(payload.to_bytes())
+        assert mse == np.mean((vec - recon) ** 2)
+
+    def test_symbolic_decode_raw_matches_hex_decode(self):
+        raw = bytes(range(0, 256, 8))
+        assert np.array_equal(
+            frackture._symbolic_decode_raw(raw),
+            frackture.symbolic_channel_decode(raw.hex()),
+        )
+
+
+class TestOptimizationBudgets:
+    """Target-MSE and wall-clock stopping rules"""
+
+    def _vec(self):
+        return frackture.frackture_preprocess_universal_v2_6(b"budgeted optimization input" * 10)
+
+    def test_default_runs_all_trials(self):
+        payload, mse, trials = frackture.optimize_frackture(self._vec(), num_trials=5, return_trials=True)
+        assert trials == 5
+        assert (payload, mse) == frackture.optimize_frackture(self._vec(), num_trials=5)
+
+    def test_tiny_tier_caps_trials(self):
+        vec = frackture.frackture_preprocess_universal_v2_6("tiny")
+        _, _, trials = frackture.optimize_frackture(vec, num_trials=9, tier=CompressionTier.TINY, return_trials=True)
+        assert trials == 2
+        _, _, trials = frackture.optimize_frackture(vec, num_trials=1, tier=CompressionTier.TINY, return_trials=True)
+        assert trials == 1
+
+    @pytest.mark.parametrize("num_trials", [0, -3])
+    def test_non_positive_trials_rejected(self, num_trials):
+        with pytest.raises(ValueError, match="num_trials"):
+            frackture.optimize_frackture(self._vec(), num_trials=num_trials)
+        with pytest.raises(ValueError, match="num_trials"):
+            frackture.compress_simple(b"budgeted optimization input", optimize=True, num_trials=num_trials)
+
+    def test_reachable_target_stops_early(self):
+        _, mse, trials = frackture.optimize_frackture(self._vec(), num_trials=5, target_mse=1.0, return_trials=True)
+        assert trials == 1
+        assert mse <= 1.0
+
+    def test_unreachable_target_runs_all_trials(self):
+        full_payload, full_mse = frackture.optimize_frackture(self._vec(), num_trials=5)
+        payload, mse, trials = frackture.optimize_frackture(
+            self._vec(), num_trials=5, target_mse=0.0, return_trials=True
+        )
+        assert trials == 5
+        assert payload == full_payload
+        assert mse == full_mse
+
+    def test_target_stops_at_first_qualifying_trial(self):
+        vec = self._vec()
+        scores = [frackture.optimize_frackture(vec, num_trials=n)[1] for n in range(1, 6)]
+        target = scores[2]
+        _, mse, trials = frackture.optimize_frackture(vec, num_trials=5, target_mse=target, return_trials=True)
+        assert mse <= target
+        assert trials == next(i + 1 for i, s in enumerate(scores) if s <= target)
+
+    def test_exhausted_budget_returns_best_so_far(self):
+        payload, mse, trials = frackture.optimize_frackture(
+            self._vec(), num_trials=50, time_budget=0.0, return_trials=True
+        )
+        assert trials == 1
+        assert payload is not None
+        assert (payload, mse) == frackture.optimize_frackture(self._vec(), num_trials=1)
+
+    def test_generous_budget_runs_all_trials(self):
+        _, _, trials = frackture.optimize_frackture(self._vec(), num_trials=4, time_budget=60.0, return_trials=True)
+        assert trials == 4
+
+    def test_compress_simple_passes_controls(self):
+        data = b"budgeted optimization input" * 10
+        vec = frackture.frackture_preprocess_universal_v2_6(data)
+        expected, _ = frackture.optimize_frackture(vec, num_trials=3, tier=CompressionTier.DEFAULT, target_mse=1.0)
+        assert frackture.compress_simple(data, optimize=True, num_trials=3, target_mse=1.0) == expected.to_bytes()
+        # Either control implies optimization
+        assert frackture.compress_simple(data, time_budget=0.0) == frackture.compress_simple(
+            data, optimize=True, num_trials=1
+        )
+
+    def test_compress_simple_reports_trials(self):
+        data = b"budgeted optimization input" * 10
+        payload, trials = frackture.compress_simple(data, num_trials=50, time_budget=0.0, return_trials=True)
+        assert trials == 1
+        assert payload == frackture.compress_simple(data, time_budget=0.0)
+        _, trials = frackture.compress_simple(data, optimize=True, num_trials=4, return_trials=True)
+        assert trials == 4
+        payload, trials = frackture.compress_simple(data, return_format="json", return_trials=True)
+        assert trials == 0
+        assert payload == frackture.compress_simple(data, return_format="json")
+
+    def test_stream_finalize_passes_controls(self):
+        data = b"budgeted optimization input" * 10
+        encoder = frackture.FracktureStreamEncoder()
+        encoder.update(data)
+        assert encoder.finalize(target_mse=1.0) == frackture.compress_simple(data, target_mse=1.0)
+        _, trials = encoder.finalize(num_trials=5, target_mse=1.0, return_trials=True)
+        assert trials == 1
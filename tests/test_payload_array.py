@@ -0,0 +1,98 @@
+"""
+Tests for the columnar PayloadArray container.
+
+Column views must be zero-copy and agree field-for-field with the
+FrackturePayload objects decoded from the same rows.
+"""
+import os
+
+import numpy as np
+import pytest
+
+from conftest import frackture_module as frackture
+
+CompressionTier = frackture.CompressionTier
+
+
+@pytest.fixture(scope="module")
+def packed():
+    rng = np.random.default_rng(14)
+    records = [os.urandom(int(n)) for n in rng.integers(1, 2000, 120)]
+    matrix = np.random.default_rng(15).random((10, 768)).astype(np.float32)
+    return np.vstack([frackture.compress_batch(records), frackture.frackture_v3_3_safe_batch(matrix, "large")])
+
+
+class TestPayloadArrayColumns:
+    """Zero-copy column views"""
+
+    def test_columns_are_views(self, packed):
+        arr = frackture.PayloadArray(packed)
+        assert len(arr) == len(packed)
+        assert arr.nbytes == len(packed) * 65
+        for column in (arr.header, arr.symbolic, arr.entropy):
+            assert np.shares_memory(column, packed)
+        assert arr.symbolic.shape == (len(packed), 32)
+        assert arr.entropy.shape == (len(packed), 16)
+        assert arr.entropy.dtype == np.dtype("<u2")
+
+    def test_columns_match_payload_objects(self, packed):
+        arr = frackture.PayloadArray(packed)
+        for i in range(len(arr)):
+            payload = frackture.FrackturePayload.from_bytes(bytes(packed[i]))
+            assert arr[i] == payload
+            assert bytes(arr.symbolic[i]) == payload.symbolic
+            assert arr.entropy[i].tolist() == payload.entropy
+            assert arr.tier_names[i] == payload.tier_name
+            assert arr.versions[i] == payload.version
+
+    def test_tier_decoding(self, packed):
+        arr = frackture.PayloadArray(packed)
+        assert arr.tier_mask(CompressionTier.LARGE).sum() == 10
+        assert np.array_equal(arr.tier_mask("tiny"), arr.tier_flags == 0b001)
+        unknown = packed[:1].copy()
+        unknown[0, 0] = (1 << 3) | 0b111
+        assert frackture.PayloadArray(unknown).tier_names[0] == "default"
+
+
+class TestPayloadArrayContainer:
+    """Construction, slicing, concatenation and serialization"""
+
+    def test_bytes_round_trip(self, packed):
+        arr = frackture.PayloadArray(packed)
+        data = arr.to_bytes()
+        assert data == packed.tobytes()
+        again = frackture.PayloadArray.from_bytes(data)
+        assert np.array_equal(again.rows, packed)
+
+    def test_from_payloads(self, packed):
+        payloads = [bytes(row) for row in packed[:5]] + [frackture.FrackturePayload.from_bytes(bytes(packed[5]))]
+        arr = frackture.PayloadArray.from_payloads(payloads)
+        assert np.array_equal(arr.rows, packed[:6])
+        with pytest.raises(ValueError):
+            frackture.PayloadArray.from_payloads([b"short"])
+
+    def test_slicing(self, packed):
+        arr = frackture.PayloadArray(packed)
+        head = arr[:10]
+        assert isinstance(head, frackture.PayloadArray)
+        assert np.shares_memory(head.rows, packed)
+        picked = arr[arr.tier_mask("large")]
+        assert len(picked) == 10
+        assert list(arr[[3, 1]]) == [arr[3], arr[1]]
+
+    def test_concatenate(self, packed):
+        arr = frackture.PayloadArray(packed)
+        joined = frackture.PayloadArray.concatenate([arr[:20], arr[20:], packed[:3]])
+        assert np.array_equal(joined.rows, np.vstack([packed, packed[:3]]))
+        assert len(frackture.PayloadArray.concatenate([])) == 0
+
+    def test_batch_apis_accept_payload_array(self, packed):
+        arr = frackture.PayloadArray(packed)
+        assert np.array_equal(frackture.decompress_batch(arr), frackture.decompress_batch(packed))
+        assert np.array_equal(arr.reconstruct(), frackture.decompress_batch(packed))
+        assert np.array_equal(arr.compact(), frackture.decompress_compact_batch(packed))
+        assert np.array_equal(np.asarray(arr), packed)
+
+    def test_rejects_bad_buffer(self):
+        with pytest.raises(ValueError):
+            frackture.PayloadArray(b"\x08" * 100)
@@ -0,0 +1,123 @@
+"""
+Tests for the .frk payload file format.
+
+Files written by FracktureFileWriter must read back through the
+memory-mapped FracktureFileReader byte-for-byte, with ids, and survive
+reopening for append and an uncommitted (crashed) tail.
+"""
+import os
+
+import numpy as np
+import pytest
+
+from conftest import frackture_module as frackture
+
+
+@pytest.fixture(scope="module")
+def packed():
+    rng = np.random.default_rng(15)
+    return frackture.compress_batch([os.urandom(int(n)) for n in rng.integers(1, 1500, 60)])
+
+
+class TestPayloadFile:
+    """Writer and memory-mapped reader"""
+
+    def test_round_trip_without_ids(self, tmp_path, packed):
+        path = tmp_path / "corpus.frk"
+        with frackture.FracktureFileWriter(path) as writer:
+            writer.append_many(packed[:40])
+            for row in packed[40:]:
+                writer.append(bytes(row))
+        assert os.path.getsize(path) == 32 + len(packed) * 65
+
+        with frackture.open_frk(path) as reader:
+            assert len(reader) == len(packed)
+            assert isinstance(reader.payloads, frackture.PayloadArray)
+            assert np.array_equal(reader.payloads.rows, packed)
+            assert reader.ids.shape == (len(packed), 0)
+
+    def test_round_trip_with_ids(self, tmp_path, packed):
+        path = tmp_path / "ids.frk"
+        ids = [f"doc-{i}" for i in range(len(packed))]
+        with frackture.FracktureFileWriter(path, id_width=12) as writer:
+            writer.append_many(packed[:30], ids=ids[:30])
+            writer.append(frackture.FrackturePayload.from_bytes(bytes(packed[30])), record_id=ids[30])
+            id_array = np.frombuffer(b"".join(i.encode().ljust(12, b"\0") for i in ids[31:]), dtype=np.uint8)
+            writer.append_many(frackture.PayloadArray(packed[31:]), ids=id_array.reshape(-1, 12))
+
+        reader = frackture.open_frk(path)
+        assert np.array_equal(reader.payloads.rows, packed)
+        assert [reader.get_id(i) for i in range(len(reader))] == [i.encode() for i in ids]
+        assert reader.payloads[7] == frackture.FrackturePayload.from_bytes(bytes(packed[7]))
+        assert np.array_equal(frackture.decompress_batch(reader.payloads), frackture.decompress_batch(packed))
+
+    def test_reader_is_memory_mapped(self, tmp_path, packed):
+        path = tmp_path / "mapped.frk"
+        with frackture.FracktureFileWriter(path) as writer:
+            writer.append_many(packed)
+        reader = frackture.open_frk(path)
+        assert isinstance(reader.payloads.rows.base, np.memmap) or isinstance(reader.payloads.rows, np.memmap)
+
+    def test_empty_file(self, tmp_path):
+        path = tmp_path / "empty.frk"
+        frackture.FracktureFileWriter(path, id_width=4).close()
+        reader = frackture.open_frk(path)
+        assert len(reader) == 0
+        assert reader.ids.shape == (0, 4)
+
+    def test_reopen_appends(self, tmp_path, packed):
+        path = tmp_path / "append.frk"
+        with frackture.FracktureFileWriter(path, id_width=4) as writer:
+            writer.append_many(packed[:10], ids=[b"a"] * 10)
+        with frackture.FracktureFileWriter(path, id_width=4) as writer:
+            assert len(writer) == 10
+            writer.append_many(packed[10:20], ids=[b"b"] * 10)
+        reader = frackture.open_frk(path)
+        assert np.array_equal(reader.payloads.rows, packed[:20])
+        assert reader.get_id(15) == b"b"
+        with pytest.raises(ValueError):
+            frackture.FracktureFileWriter(path, id_width=8)
+
+    def test_uncommitted_tail_is_ignored_and_discarded(self, tmp_path, packed):
+        path = tmp_path / "crash.frk"
+        writer = frackture.FracktureFileWriter(path, fsync_every=0)
+        writer.append_many(packed[:5])
+        writer.sync()
+        writer.append_many(packed[5:8])
+        writer._file.flush()  # records reach the file but the count is never committed
+        assert len(frackture.open_frk(path)) == 5
+        writer._file.close()
+
+        with frackture.FracktureFileWriter(path) as reopened:
+            assert len(reopened) == 5
+            reopened.append(bytes(packed[20]))
+        reader = frackture.open_frk(path)
+        assert np.array_equal(reader.payloads.rows, np.vstack([packed[:5], packed[20:21]]))
+
+    def test_periodic_sync_commits_count(self, tmp_path, packed):
+        path = tmp_path / "periodic.frk"
+        writer = frackture.FracktureFileWriter(path, fsync_every=4)
+        for row in packed[:10]:
+            writer.append(bytes(row))
+        assert len(frackture.open_frk(path)) == 8
+        writer.close()
+        assert len(frackture.open_frk(path)) == 10
+
+    def test_rejects_bad_records(self, tmp_path, packed):
+        with frackture.FracktureFileWriter(tmp_path / "bad.frk", id_width=2) as writer:
+            with pytest.raises(ValueError):
+                writer.append(b"short")
+            with pytest.raises(ValueError):
+                writer.append(bytes(packed[0]), record_id=b"too long")
+            with pytest.raises(ValueError):
+                writer.append_many(packed[:3], ids=[b"a"])
+
+    def test_rejects_invalid_files(self, tmp_path):
+        bad = tmp_path / "bad.frk"
+        bad.write_bytes(b"NOPE" + bytes(28))
+        with pytest.raises(ValueError):
+            frackture.open_frk(bad)
+        short = tmp_path / "short.frk"
+        short.write_bytes(b"FRK")
+        with pytest.raises(ValueError):
+            frackture.open_frk(short)
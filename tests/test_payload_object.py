@@ -0,0 +1,159 @@
+"""
+Tests for the slotted, lazily decoded FrackturePayload.
+
+Parsed payloads must keep their serialized buffer while fields are only
+read, and behave exactly like the former plain dataclass once fields are
+mutated.
+"""
+import copy
+import dataclasses
+
+import pytest
+
+from conftest import frackture_module as frackture
+
+FrackturePayload = frackture.FrackturePayload
+
+
+@pytest.fixture
+def raw():
+    return frackture.compress_simple(b"lazy payload object" * 10)
+
+
+class TestLazyPayload:
+    """Parsing, caching and invalidation"""
+
+    def test_round_trip_returns_original_buffer(self, raw):
+        payload = FrackturePayload.from_bytes(raw)
+        assert payload.to_bytes() is raw
+        assert payload.symbolic == raw[1:33]
+        assert payload.tier_name == "default"
+        assert payload.to_bytes() is raw
+
+    def test_fields_match_eager_parse(self, raw):
+        payload = FrackturePayload.from_bytes(raw)
+        eager = FrackturePayload(
+            symbolic=raw[1:33],
+            entropy=[int.from_bytes(raw[33 + 2 * i : 35 + 2 * i], "little") for i in range(16)],
+            tier_name="default",
+            version=1,
+        )
+        assert payload == eager
+        assert eager.to_bytes() == raw
+        assert payload.entropy == eager.entropy
+
+    def test_accepts_longer_and_mutable_buffers(self, raw):
+        assert FrackturePayload.from_bytes(raw + b"trailer").to_bytes() == raw
+        assert FrackturePayload.from_bytes(bytearray(raw)).to_bytes() == raw
+        assert FrackturePayload.from_bytes(memoryview(raw)).symbolic == raw[1:33]
+
+    def test_entropy_list_mutation_is_serialized(self, raw):
+        payload = FrackturePayload.from_bytes(raw)
+        payload.entropy[0] = 4321
+        assert payload.to_bytes()[33:35] == (4321).to_bytes(2, "little")
+        payload.entropy[1] = 7
+        assert payload.to_bytes()[35:37] == (7).to_bytes(2, "little")
+
+    def test_constructor_list_mutation_is_serialized(self):
+        entropy = [1] * 16
+        payload = FrackturePayload(symbolic=b"\x01" * 32, entropy=entropy, tier_name="tiny")
+        first = payload.to_bytes()
+        entropy[0] = 2
+        assert payload.to_bytes() != first
+
+    def test_constructed_payload_caches_serialization(self):
+        entropy = [5] * 16
+        payload = FrackturePayload(symbolic=b"\x02" * 32, entropy=entropy, tier_name="large")
+        first = payload.to_bytes()
+        assert payload.to_bytes() is first
+        entropy[3] = 6
+        second = payload.to_bytes()
+        assert second[39:41] == (6).to_bytes(2, "little")
+        assert payload.to_bytes() is second
+
+    def test_reading_entropy_keeps_buffer(self, raw):
+        payload = FrackturePayload.from_bytes(raw)
+        frackture.validate_frackture_payload(payload)
+        assert payload.entropy == list(FrackturePayload.from_bytes(raw).entropy)
+        assert payload.to_bytes() is raw
+        frackture.frackture_v3_3_reconstruct(payload)
+        assert payload.to_bytes() is raw
+
+    def test_setters_invalidate_buffer(self, raw):
+        payload = FrackturePayload.from_bytes(raw)
+        payload.tier_name = "tiny"
+        assert payload.to_bytes()[0] & 0x07 == 0b001
+        assert payload.to_bytes()[1:] == raw[1:]
+        payload.symbolic = b"\x00" * 32
+        payload.version = 2
+        assert payload.to_bytes() == bytes([(2 << 3) | 0b001]) + b"\x00" * 32 + raw[33:]
+
+    def test_unknown_tier_flags_reserialize_as_default(self, raw):
+        odd = bytes([(1 << 3) | 0b011]) + raw[1:]
+        payload = FrackturePayload.from_bytes(odd)
+        assert payload.tier_name == "default"
+        assert payload.to_bytes()[0] == (1 << 3) | 0b010
+        assert payload == FrackturePayload.from_bytes(raw)
+
+    def test_rejects_bad_input(self, raw):
+        with pytest.raises(ValueError):
+            FrackturePayload.from_bytes(raw[:64])
+        with pytest.raises(ValueError):
+            FrackturePayload.from_bytes(bytes([9 << 3]) + raw[1:])
+        with pytest.raises(ValueError):
+            FrackturePayload(symbolic=b"\x00" * 32, entropy=[0] * 16, tier_name="huge").to_bytes()
+
+
+class TestPayloadCompatibility:
+    """Former dataclass behaviors"""
+
+    def test_slots(self, raw):
+        payload = FrackturePayload.from_bytes(raw)
+        with pytest.raises(AttributeError):
+            payload.extra = 1
+
+    def test_dict_access(self, raw):
+        payload = FrackturePayload.from_bytes(raw)
+        assert payload["symbolic"] == raw[1:33].hex()
+        assert payload["entropy"] == [x / 1000.0 for x in payload.entropy]
+        assert dict(payload.items()) == payload.to_legacy_dict()
+        assert "tier_name" in payload
+        with pytest.raises(KeyError):
+            payload["missing"]
+
+    def test_equality_and_repr(self, raw):
+        a = FrackturePayload.from_bytes(raw)
+        b = FrackturePayload.from_bytes(bytes(raw))
+        assert a == b
+        assert a != FrackturePayload.from_bytes(raw[:1] + bytes(32) + raw[33:])
+        assert repr(a) == (
+            f"FrackturePayload(symbolic={a.symbolic!r}, entropy={a.entropy!r}, tier_name='default', version=1)"
+        )
+        with pytest.raises(TypeError):
+            hash(a)
+
+    def test_copies_are_independent(self, raw):
+        payload = FrackturePayload.from_bytes(raw)
+        for clone in (copy.copy(payload), copy.deepcopy(payload)):
+            assert clone == payload
+            clone.entropy[0] = 1
+            assert payload.to_bytes() == raw
+
+    def test_dataclass_helpers(self, raw):
+        payload = FrackturePayload.from_bytes(raw)
+        assert dataclasses.is_dataclass(payload)
+        assert [field.name for field in dataclasses.fields(payload)] == ["symbolic", "entropy", "tier_name", "version"]
+        assert dataclasses.asdict(payload) == {
+            "symbolic": raw[1:33],
+            "entropy": payload.entropy,
+            "tier_name": "default",
+            "version": 1,
+        }
+        tiny = dataclasses.replace(payload, tier_name="tiny")
+        assert tiny.to_bytes() == bytes([(1 << 3) | 0b001]) + raw[1:]
+        assert payload.to_bytes() is raw
+
+    def test_reconstruct_and_validate(self, raw):
+        payload = FrackturePayload.from_bytes(raw)
+        frackture.validate_frackture_payload(payload)
+        assert (frackture.frackture_v3_3_reconstruct(payload) == frackture.decompress_simple(raw)).all()
@@ -0,0 +1,89 @@
+"""
+Tests for vectorized bulk payload validation.
+"""
+import os
+
+import numpy as np
+import pytest
+
+from conftest import frackture_module as frackture
+
+
+@pytest.fixture
+def packed():
+    return frackture.compress_batch([os.urandom(n) for n in (5, 50, 150, 500, 2000, 7)])
+
+
+class TestValidatePayloadBatch:
+    """Masks and error codes"""
+
+    def test_all_valid(self, packed):
+        mask, codes = frackture.validate_payload_batch(packed)
+        assert mask.all()
+        assert (codes == frackture.PAYLOAD_VALID).all()
+        v2 = frackture.compress_tiny_batch([b"k1", b"k2"], version=2)
+        assert frackture.validate_payload_batch(v2)[0].all()
+
+    def test_header_errors(self, packed):
+        rows = packed.copy()
+        rows[1, 0] = (9 << 3) | 0b010
+        rows[2, 0] = (1 << 3) | 0b011
+        rows[3, 0] = (0 << 3) | 0b000
+        mask, codes = frackture.validate_payload_batch(rows)
+        assert mask.tolist() == [True, False, False, False, True, True]
+        assert codes.tolist() == [
+            frackture.PAYLOAD_VALID,
+            frackture.PAYLOAD_BAD_VERSION,
+            frackture.PAYLOAD_BAD_TIER,
+            frackture.PAYLOAD_BAD_VERSION,
+            frackture.PAYLOAD_VALID,
+            frackture.PAYLOAD_VALID,
+        ]
+
+    def test_version_codes_agree_with_from_bytes(self):
+        rows = np.zeros((256, 65), dtype=np.uint8)
+        rows[:, 0] = np.arange(256)
+        _, codes = frackture.validate_payload_batch(rows)
+        for header, code in enumerate(codes):
+            if code == frackture.PAYLOAD_BAD_VERSION:
+                with pytest.raises(ValueError):
+                    frackture.FrackturePayload.from_bytes(bytes(rows[header]))
+            else:
+                frackture.FrackturePayload.from_bytes(bytes(rows[header]))
+
+    def test_input_forms_agree(self, packed):
+        rows = packed.copy()
+        rows[4, 0] = 0xFF
+        expected = frackture.validate_payload_batch(rows)[1]
+        for form in (rows.tobytes(), frackture.PayloadArray(rows), [bytes(r) for r in rows]):
+            assert np.array_equal(frackture.validate_payload_batch(form)[1], expected)
+
+    def test_ragged_lengths(self, packed):
+        records = [bytes(packed[0]), b"", bytes(packed[1])[:64], bytes(packed[2]) + b"x", bytes(packed[3])]
+        mask, codes = frackture.validate_payload_batch(records)
+        assert mask.tolist() == [True, False, False, False, True]
+        assert (codes[1:4] == frackture.PAYLOAD_BAD_LENGTH).all()
+
+        buffer = b"".join(records)
+        offsets = np.cumsum([0] + [len(r) for r in records])
+        assert np.array_equal(frackture.validate_payload_batch(buffer, offsets=offsets)[1], codes)
+
+    def test_raise_on_error(self, packed):
+        frackture.validate_payload_batch(packed, raise_on_error=True)
+        rows = packed.copy()
+        rows[3, 0] = (1 << 3) | 0b110
+        with pytest.raises(ValueError, match="row 3"):
+            frackture.validate_payload_batch(rows, raise_on_error=True)
+
+    def test_filter_valid_payloads(self, packed):
+        records = [bytes(r) for r in packed] + [b"bad"]
+        records[2] = bytes([0xFF]) + records[2][1:]
+        valid, indices = frackture.filter_valid_payloads(records)
+        assert isinstance(valid, frackture.PayloadArray)
+        assert indices.tolist() == [0, 1, 3, 4, 5]
+        assert np.array_equal(valid.rows, packed[[0, 1, 3, 4, 5]])
+
+    def test_empty(self):
+        mask, codes = frackture.validate_payload_batch(b"")
+        assert mask.shape == codes.shape == (0,)
+        assert len(frackture.filter_valid_payloads([])[0]) == 0
@@ -0,0 +1,107 @@
+"""
+Tests for PreparedInput canonicalization.
+
+A prepared input must give the same tier, preprocessed vector, payload and
+hash as the raw input, while serializing it at most once.
+"""
+import numpy as np
+import pytest
+
+from conftest import frackture_module as frackture
+
+CompressionTier = frackture.CompressionTier
+
+
+class CountingDict(dict):
+    """Dict that counts how often it is serialized for preprocessing."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.items_calls = 0
+
+    def items(self):
+        self.items_calls += 1
+        return super().items()
+
+
+INPUTS = [
+    "",
+    "short",
+    "text " * 200,
+    b"",
+    b"raw bytes" * 50,
+    {"a": 1, "b": [1, 2, 3]},
+    {i: f"value_{i}" for i in range(100)},
+    [1, 2, 3],
+    [0.5] * 300,
+    (1, 2, 3),
+    np.arange(40, dtype=np.float32),
+    bytearray(b"abc" * 50),
+    12345,
+]
+
+
+class TestPreparedInput:
+    """PreparedInput is a drop-in replacement for the raw input"""
+
+    @pytest.mark.parametrize("data", INPUTS)
+    def test_same_tier(self, data):
+        assert frackture.select_tier(frackture.PreparedInput(data)) == frackture.select_tier(data)
+
+    @pytest.mark.parametrize("data", INPUTS)
+    def test_same_preprocessed_vector(self, data):
+        prepared = frackture.PreparedInput(data)
+        for tier in (None, CompressionTier.TINY, CompressionTier.DEFAULT):
+            assert np.array_equal(
+                frackture.frackture_preprocess_universal_v2_6(prepared, tier),
+                frackture.frackture_preprocess_universal_v2_6(data, tier),
+            )
+
+    @pytest.mark.parametrize("data", INPUTS)
+    def test_same_payload(self, data):
+        prepared = frackture.PreparedInput(data)
+        assert frackture.compress_simple(prepared) == frackture.compress_simple(data)
+        assert frackture.compress_simple(prepared, optimize=True) == frackture.compress_simple(data, optimize=True)
+
+    @pytest.mark.parametrize("data", INPUTS)
+    def test_same_hash(self, data):
+        prepared = frackture.PreparedInput(data)
+        assert frackture.frackture_deterministic_hash(prepared) == frackture.frackture_deterministic_hash(data)
+        assert frackture.frackture_deterministic_hash(prepared, salt="s") == frackture.frackture_deterministic_hash(
+            data, salt="s"
+        )
+
+    def test_caches_size_and_tier(self):
+        prepared = frackture.PreparedInput("x" * 150)
+        assert prepared.size == 150
+        assert prepared.tier == CompressionTier.DEFAULT
+        assert prepared.canonical_bytes is prepared.canonical_bytes
+
+    def test_str_hash_reuses_canonical_bytes(self):
+        prepared = frackture.PreparedInput("shared encoding")
+        assert prepared.hash_bytes is prepared.canonical_bytes
+
+    def test_dict_serialized_once_across_pipeline(self):
+        data = CountingDict({f"key_{i}": i for i in range(200)})
+        prepared = frackture.PreparedInput(data)
+        frackture.select_tier(prepared)
+        frackture.frackture_preprocess_universal_v2_6(prepared)
+        frackture.compress_simple(prepared)
+        assert data.items_calls == 1
+
+    def test_numeric_inputs_have_no_canonical_bytes(self):
+        assert frackture.PreparedInput([1, 2, 3]).canonical_bytes is None
+        assert frackture.PreparedInput(np.zeros(4)).canonical_bytes is None
+
+    def test_wrapping_is_idempotent(self):
+        prepared = frackture.PreparedInput(b"abc")
+        assert frackture.PreparedInput(prepared).data == b"abc"
+
+    def test_unorderable_dict_falls_back_like_raw_input(self):
+        data = {1: "a", "b": 2}
+        prepared = frackture.PreparedInput(data)
+        assert prepared.tier == CompressionTier.DEFAULT
+        assert np.array_equal(
+            frackture.frackture_preprocess_universal_v2_6(prepared),
+            np.zeros(768, dtype=np.float32),
+        )
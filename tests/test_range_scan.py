@@ -0,0 +1,98 @@
+"""
+Tests for the early-exit range scan used by standard-tier byte preprocessing.
+
+The optimized path must produce vectors identical to full float32
+normalization of the whole input, including for buffers and mapped files.
+"""
+import os
+
+import numpy as np
+import pytest
+
+from conftest import frackture_module as frackture
+
+CompressionTier = frackture.CompressionTier
+
+
+def _reference_standard(data: bytes) -> np.ndarray:
+    """Original standard-tier preprocessing: normalize everything, keep 768."""
+    if not data:
+        return np.zeros(768, dtype=np.float32)
+    normed = np.frombuffer(data, dtype=np.uint8).astype(np.float32)
+    normed = (normed - np.min(normed)) / (np.ptp(normed) + 1e-8)
+    padded = np.pad(normed, (0, 768 - len(normed) % 768), mode="wrap")
+    return padded[:768].astype(np.float32)
+
+
+BYTE_CASES = [
+    b"",
+    b"\x00" * 500,
+    b"\xff" * 1000,
+    bytes(range(256)) * 3,
+    b"text only, never hits the extremes " * 4000,
+    os.urandom(767),
+    os.urandom(768),
+    os.urandom(200_000),
+    # Extremes appear only far past the first scan chunk
+    b"\x40" * 300_000 + b"\x00" + b"\x80" * 100_000 + b"\xff",
+]
+
+
+class TestRangeScan:
+    """Range scan matches full normalization"""
+
+    def test_scan_stops_on_extremes(self):
+        vec = np.frombuffer(b"\x00\xff" + b"\x10" * 10, dtype=np.uint8)
+        assert frackture._byte_range_scan(vec) == (0, 255)
+
+    def test_scan_covers_whole_input(self):
+        data = b"\x40" * 300_000 + b"\x01" + b"\x80" * 100_000 + b"\xfe"
+        assert frackture._byte_range_scan(np.frombuffer(data, dtype=np.uint8)) == (1, 254)
+
+    @pytest.mark.parametrize("data", BYTE_CASES)
+    def test_bytes_identical_to_full_normalization(self, data):
+        result = frackture.frackture_preprocess_universal_v2_6(data, CompressionTier.DEFAULT)
+        assert np.array_equal(result, _reference_standard(data))
+        assert result.dtype == np.float32
+
+    def test_str_identical_to_full_normalization(self):
+        text = "unicode ünïcödé text " * 500
+        result = frackture.frackture_preprocess_universal_v2_6(text, CompressionTier.LARGE)
+        assert np.array_equal(result, _reference_standard(text.encode("utf-8")))
+
+    def test_tiny_tier_unchanged(self):
+        data = b"tiny input"
+        assert np.array_equal(
+            frackture.frackture_preprocess_buffer(bytearray(data)),
+            frackture.frackture_preprocess_universal_v2_6(data),
+        )
+
+
+class TestBufferPreprocessing:
+    """Buffer and file entry points match bytes preprocessing"""
+
+    @pytest.mark.parametrize("data", BYTE_CASES + [b"short"])
+    def test_buffer_types(self, data):
+        expected = frackture.frackture_preprocess_universal_v2_6(data)
+        for buf in (bytearray(data), memoryview(data), np.frombuffer(data, dtype=np.uint8)):
+            assert np.array_equal(frackture.frackture_preprocess_buffer(buf), expected)
+
+    @pytest.mark.parametrize("data", [b"", b"small file", os.urandom(50_000), b"a" * 70_000 + b"\x00"])
+    def test_mapped_file(self, tmp_path, data):
+        path = tmp_path / "payload.bin"
+        path.write_bytes(data)
+        expected = frackture.frackture_preprocess_universal_v2_6(data)
+        assert np.array_equal(frackture.frackture_preprocess_file(path), expected)
+
+    def test_np_memmap(self, tmp_path):
+        data = os.urandom(100_000)
+        path = tmp_path / "payload.bin"
+        path.write_bytes(data)
+        mapped = np.memmap(path, dtype=np.uint8, mode="r")
+        expected = frackture.frackture_preprocess_universal_v2_6(data)
+        assert np.array_equal(frackture.frackture_preprocess_buffer(mapped), expected)
+
+    def test_explicit_tier(self):
+        data = os.urandom(50)
+        result = frackture.frackture_preprocess_buffer(memoryview(data), CompressionTier.DEFAULT)
+        assert np.array_equal(result, _reference_standard(data))
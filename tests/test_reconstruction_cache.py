@@ -0,0 +1,150 @@
+"""
+Tests for ReconstructionCache.
+
+Cached results must equal uncached reconstruction, be shared read-only
+between callers, and respect the entry and byte bounds with LRU eviction.
+"""
+import threading
+
+import numpy as np
+import pytest
+
+from conftest import frackture_module as frackture
+
+
+def _payloads(n, seed=0):
+    matrix = np.random.default_rng(seed).random((n, 768)).astype(np.float32)
+    return [bytes(row) for row in frackture.frackture_v3_3_safe_batch(matrix)]
+
+
+class TestReconstructionCache:
+    """Cache hits, sharing and bounds"""
+
+    def test_matches_uncached_reconstruction(self):
+        cache = frackture.ReconstructionCache()
+        for payload in _payloads(5):
+            expected = frackture.frackture_v3_3_reconstruct(payload)
+            assert np.array_equal(cache.get(payload), expected)
+            assert np.array_equal(cache.get(payload), expected)
+        assert cache.stats() == {"hits": 5, "misses": 5, "evictions": 0, "entries": 5, "bytes": 5 * 768 * 4}
+
+    def test_hits_share_read_only_vector(self):
+        cache = frackture.ReconstructionCache()
+        payload = _payloads(1)[0]
+        first = cache.get(payload)
+        assert cache.get(payload) is first
+        assert not first.flags.writeable
+        with pytest.raises(ValueError):
+            first[0] = 1.0
+        private = cache.get(payload, copy=True)
+        assert private.flags.writeable and private is not first
+        assert np.array_equal(private, first)
+
+    def test_payload_object_and_bytes_share_key(self):
+        cache = frackture.ReconstructionCache()
+        payload = _payloads(1)[0]
+        cache.get(payload)
+        assert frackture.FrackturePayload.from_bytes(payload) in cache
+        cache.get(frackture.FrackturePayload.from_bytes(payload))
+        cache.get(payload + b"trailing")
+        assert cache.hits == 2 and len(cache) == 1
+
+    @pytest.mark.parametrize("wrap", [bytearray, memoryview, list])
+    def test_rejects_what_the_uncached_path_rejects(self, wrap):
+        cache = frackture.ReconstructionCache()
+        payload = _payloads(1)[0]
+        with pytest.raises(ValueError, match="Payload must be"):
+            frackture.frackture_v3_3_reconstruct(wrap(payload))
+        with pytest.raises(ValueError, match="Payload must be"):
+            cache.get(wrap(payload))
+        with pytest.raises(ValueError, match="Payload must be"):
+            frackture.decompress_simple(wrap(payload), cache=cache)
+        assert wrap(payload) not in cache
+        assert len(cache) == 0 and cache.hits == cache.misses == 0
+
+    def test_dict_payload_bypasses_cache(self):
+        cache = frackture.ReconstructionCache()
+        legacy = frackture.FrackturePayload.from_bytes(_payloads(1)[0]).to_legacy_dict()
+        assert np.array_equal(cache.get(legacy), frackture.frackture_v3_3_reconstruct(legacy))
+        assert len(cache) == 0 and cache.misses == 0
+
+    def test_lru_eviction_by_entries(self):
+        cache = frackture.ReconstructionCache(max_entries=2)
+        a, b, c = _payloads(3)
+        cache.get(a)
+        cache.get(b)
+        cache.get(a)
+        cache.get(c)
+        assert a in cache and c in cache and b not in cache
+        assert cache.evictions == 1
+
+    def test_eviction_by_bytes(self):
+        cache = frackture.ReconstructionCache(max_entries=100, max_bytes=2 * 768 * 4 + 10)
+        for payload in _payloads(4):
+            cache.get(payload)
+        assert len(cache) == 2
+        assert cache.nbytes == 2 * 768 * 4
+        assert cache.evictions == 2
+
+    def test_entry_larger_than_budget_not_cached(self):
+        cache = frackture.ReconstructionCache(max_bytes=100)
+        payload = _payloads(1)[0]
+        assert np.array_equal(cache.get(payload), frackture.frackture_v3_3_reconstruct(payload))
+        assert len(cache) == 0 and cache.misses == 1
+
+    def test_clear_resets(self):
+        cache = frackture.ReconstructionCache()
+        for payload in _payloads(3):
+            cache.get(payload)
+        cache.clear()
+        assert cache.stats() == {"hits": 0, "misses": 0, "evictions": 0, "entries": 0, "bytes": 0}
+
+    def test_rejects_bad_bounds(self):
+        with pytest.raises(ValueError):
+            frackture.ReconstructionCache(max_entries=0)
+        with pytest.raises(ValueError):
+            frackture.ReconstructionCache(max_bytes=-1)
+
+    def test_concurrent_access(self):
+        cache = frackture.ReconstructionCache(max_entries=8)
+        payloads = _payloads(16, seed=1)
+        expected = [frackture.frackture_v3_3_reconstruct(p) for p in payloads]
+        errors = []
+
+        def worker(offset):
+            for i in range(200):
+                j = (i * 7 + offset) % len(payloads)
+                if not np.array_equal(cache.get(payloads[j]), expected[j]):
+                    errors.append(j)
+
+        threads = [threading.Thread(target=worker, args=(k,)) for k in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert not errors
+        stats = cache.stats()
+        assert stats["hits"] + stats["misses"] == 800
+        assert stats["entries"] <= 8
+        assert stats["bytes"] == stats["entries"] * 768 * 4
+
+
+class TestDecompressSimpleCache:
+    """decompress_simple with an opt-in cache"""
+
+    def test_cached_result_matches(self):
+        cache = frackture.ReconstructionCache()
+        payload = _payloads(1)[0]
+        expected = frackture.decompress_simple(payload)
+        assert np.array_equal(frackture.decompress_simple(payload, cache=cache), expected)
+        assert frackture.decompress_simple(payload, cache=cache) is cache.get(payload)
+
+    def test_out_receives_private_copy(self):
+        cache = frackture.ReconstructionCache()
+        payload = _payloads(1)[0]
+        out = np.empty(768, dtype=np.float16)
+        result = frackture.decompress_simple(payload, out=out, cache=cache)
+        assert result is out
+        assert np.array_equal(out, frackture.decompress_simple(payload).astype(np.float16))
+        with pytest.raises(ValueError):
+            frackture.decompress_simple(payload, out=np.empty(10, dtype=np.float32), cache=cache)
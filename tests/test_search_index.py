@@ -0,0 +1,159 @@
+"""
+Tests for FracktureIndex exact top-k search.
+
+Results must match a brute-force comparison against the full 768-length
+reconstructions, for payload, compact and arbitrary vector queries.
+"""
+import numpy as np
+import pytest
+
+from conftest import frackture_module as frackture
+
+CompressionTier = frackture.CompressionTier
+
+
+def _rows(n, seed=0):
+    matrix = np.random.default_rng(seed).random((n, 768)).astype(np.float32)
+    tiers = [CompressionTier.TINY if i % 5 == 0 else CompressionTier.DEFAULT for i in range(n)]
+    return frackture.frackture_v3_3_safe_batch(matrix, tiers)
+
+
+def _brute(rows, query, k, metric):
+    full = frackture.frackture_v3_3_reconstruct_batch(rows).astype(np.float64)
+    query = np.asarray(query, dtype=np.float64)
+    if metric == "cosine":
+        scores = full @ query / (np.linalg.norm(full, axis=1) * np.linalg.norm(query))
+        order = np.lexsort((np.arange(len(full)), -scores))
+    else:
+        scores = np.linalg.norm(full - query, axis=1)
+        order = np.lexsort((np.arange(len(full)), scores))
+    return order[:k], scores[order[:k]]
+
+
+class TestFracktureIndex:
+    """Exact search matches brute force over full reconstructions"""
+
+    @pytest.mark.parametrize("metric", ["cosine", "l2"])
+    def test_payload_query_matches_brute_force(self, metric):
+        rows = _rows(3000)
+        index = frackture.FracktureIndex.from_payloads(rows)
+        for qi in (0, 7, 2999):
+            ids, scores = index.search(bytes(rows[qi]), k=10, metric=metric)
+            ref_ids, ref_scores = _brute(rows, frackture.decompress_simple(bytes(rows[qi])), 10, metric)
+            assert np.array_equal(ids, ref_ids)
+            assert np.allclose(scores, ref_scores, atol=1e-6)
+            assert ids[0] == qi
+
+    @pytest.mark.parametrize("metric", ["cosine", "l2"])
+    def test_arbitrary_vector_query(self, metric):
+        rows = _rows(2000, seed=1)
+        index = frackture.FracktureIndex.from_payloads(rows)
+        query = np.random.default_rng(9).random(768)
+        ids, scores = index.search(query, k=5, metric=metric)
+        ref_ids, ref_scores = _brute(rows, query, 5, metric)
+        assert np.array_equal(ids, ref_ids)
+        assert np.allclose(scores, ref_scores, atol=1e-6)
+
+    def test_compact_query_equals_payload_query(self):
+        rows = _rows(500, seed=2)
+        index = frackture.FracktureIndex.from_payloads(rows)
+        payload = bytes(rows[42])
+        by_payload = index.search(payload, k=8)
+        by_compact = index.search(frackture.decompress_compact_vector(payload), k=8)
+        assert np.array_equal(by_payload[0], by_compact[0])
+        assert np.allclose(by_payload[1], by_compact[1])
+
+    def test_blocked_scan(self, monkeypatch):
+        rows = _rows(1000, seed=3)
+        index = frackture.FracktureIndex.from_payloads(rows)
+        expected = index.search_batch(rows[:6], k=12)
+        monkeypatch.setattr(frackture, "_INDEX_SEARCH_BLOCK", 7)
+        monkeypatch.setattr(frackture, "_INDEX_BATCH_SCORES", 7)
+        for qi in range(6):
+            ids, scores = index.search(bytes(rows[qi]), k=12)
+            assert np.array_equal(ids, expected[0][qi])
+        blocked = index.search_batch(rows[:6], k=12)
+        assert np.array_equal(blocked[0], expected[0])
+
+    @pytest.mark.parametrize("metric", ["cosine", "l2"])
+    @pytest.mark.parametrize("block", [7, 65536])
+    def test_near_ties_at_k_boundary(self, monkeypatch, metric, block):
+        # Rows a few ulps apart (and exact duplicates) straddle the k-th place,
+        # closer together than float32 scoring can resolve
+        monkeypatch.setattr(frackture, "_INDEX_SEARCH_BLOCK", block)
+        rng = np.random.default_rng(12)
+        base = rng.random(32).astype(np.float32)
+        near = np.repeat(base[None], 32, axis=0)
+        lanes = rng.permutation(32)
+        steps = rng.choice([-3, -2, -1, 1, 2, 3], 32).astype(np.float32)
+        near[np.arange(32), lanes] += steps * np.spacing(base[lanes])
+        near[::5] = base
+        compact = np.concatenate([rng.random((200, 32)).astype(np.float32), near])
+        compact = compact[rng.permutation(len(compact))]
+        index = frackture.FracktureIndex()
+        index.add(compact)
+
+        query = np.tile(base + 0.05 * rng.standard_normal(32), 24)
+        full = np.tile(compact.astype(np.float64), (1, 24))
+        if metric == "cosine":
+            ref = full @ query / (np.linalg.norm(full, axis=1) * np.linalg.norm(query))
+            order = np.lexsort((np.arange(len(full)), -ref))
+        else:
+            ref = np.linalg.norm(full - query, axis=1)
+            order = np.lexsort((np.arange(len(full)), ref))
+        for k in (5, 12, 20):
+            ids, scores = index.search(query, k=k, metric=metric)
+            assert np.array_equal(ids, order[:k])
+            assert np.allclose(scores, ref[order[:k]], rtol=0, atol=1e-12)
+
+    @pytest.mark.parametrize("metric", ["cosine", "l2"])
+    def test_batch_matches_single(self, metric):
+        rows = _rows(800, seed=4)
+        index = frackture.FracktureIndex.from_payloads(rows)
+        ids, scores = index.search_batch(frackture.PayloadArray(rows[:20]), k=5, metric=metric)
+        assert ids.shape == scores.shape == (20, 5)
+        for qi in range(20):
+            single_ids, single_scores = index.search(bytes(rows[qi]), k=5, metric=metric)
+            assert np.array_equal(ids[qi], single_ids)
+            assert np.allclose(scores[qi], single_scores)
+
+    def test_incremental_add_and_custom_ids(self):
+        rows = _rows(300, seed=5)
+        index = frackture.FracktureIndex()
+        index.add(frackture.PayloadArray(rows[:100]), ids=np.arange(100) + 1000)
+        index.add([bytes(r) for r in rows[100:250]], ids=np.arange(150) + 2000)
+        index.add(frackture.FrackturePayload.from_bytes(bytes(rows[250])), ids=[7])
+        assert len(index) == 251
+        assert index.search(bytes(rows[250]), k=1)[0][0] == 7
+        assert index.search(bytes(rows[120]), k=1)[0][0] == 2020
+        assert np.array_equal(index.compact, frackture.decompress_compact_batch(rows[:251]))
+
+    def test_dict_payloads(self):
+        payload = frackture.FrackturePayload.from_bytes(bytes(_rows(1)[0]))
+        legacy = payload.to_legacy_dict()
+        index = frackture.FracktureIndex.from_payloads([legacy, payload.to_bytes()])
+        assert np.allclose(index.compact[0], frackture.decompress_compact_vector(legacy))
+
+    def test_k_capped_and_empty(self):
+        index = frackture.FracktureIndex()
+        ids, scores = index.search(bytes(_rows(1)[0]), k=5)
+        assert ids.shape == (0,) and scores.shape == (0,)
+        index.add(_rows(3))
+        assert len(index.search(bytes(_rows(1)[0]), k=10)[0]) == 3
+
+    def test_zero_query_scores_zero_cosine(self):
+        index = frackture.FracktureIndex.from_payloads(_rows(10))
+        ids, scores = index.search(np.zeros(768), k=3)
+        assert np.array_equal(ids, [0, 1, 2])
+        assert np.array_equal(scores, [0.0, 0.0, 0.0])
+
+    def test_rejects_bad_input(self):
+        index = frackture.FracktureIndex.from_payloads(_rows(10))
+        with pytest.raises(ValueError):
+            index.search(bytes(_rows(1)[0]), metric="dot")
+        with pytest.raises(ValueError):
+            index.search(np.zeros((2, 768)))
+        with pytest.raises(ValueError):
+            index.search(np.zeros(100))
+        with pytest.raises(ValueError):
+            index.add(_rows(2), ids=[1])
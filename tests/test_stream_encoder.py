@@ -0,0 +1,89 @@
+"""
+Tests for FracktureStreamEncoder.
+
+Streaming output must be identical to one-shot compress_simple on the
+concatenated bytes, for every tier and chunking.
+"""
+import os
+import sys
+
+import pytest
+
+from conftest import frackture_module as frackture
+
+CompressionTier = frackture.CompressionTier
+
+
+def _stream(data: bytes, chunk_size: int, **kwargs):
+    encoder = frackture.FracktureStreamEncoder()
+    for offset in range(0, len(data), chunk_size):
+        encoder.update(data[offset : offset + chunk_size])
+    return encoder.finalize(**kwargs)
+
+
+class TestStreamEncoder:
+    """Stream encoder matches compress_simple"""
+
+    @pytest.mark.parametrize("size", [0, 1, 50, 99, 100, 500, 768, 769, 5000, 200_000])
+    @pytest.mark.parametrize("chunk_size", [1, 7, 768, 65536])
+    def test_matches_compress_simple(self, size, chunk_size):
+        if size > 10_000 and chunk_size < 768:
+            pytest.skip("too many tiny chunks")
+        data = os.urandom(size)
+        assert _stream(data, chunk_size) == frackture.compress_simple(data)
+
+    def test_text_stream_never_hits_extremes(self):
+        data = b"log line: request served in 12ms\n" * 10_000
+        assert _stream(data, 4096) == frackture.compress_simple(data)
+
+    def test_extremes_late_in_stream(self):
+        data = b"\x41" * 100_000 + b"\x00" + b"\x42" * 5000 + b"\xff"
+        assert _stream(data, 1000) == frackture.compress_simple(data)
+
+    def test_optimize_and_json_format(self):
+        data = os.urandom(3000)
+        assert _stream(data, 256, optimize=True) == frackture.compress_simple(data, optimize=True)
+        assert _stream(data, 256, return_format="json") == frackture.compress_simple(data, return_format="json")
+
+    def test_accepts_bytes_like_chunks(self):
+        data = os.urandom(2048)
+        encoder = frackture.FracktureStreamEncoder()
+        encoder.update(bytearray(data[:1000]))
+        encoder.update(memoryview(data)[1000:])
+        encoder.update(b"")
+        assert encoder.total_bytes == 2048
+        assert encoder.finalize() == frackture.compress_simple(data)
+
+    def test_tier_tracks_total_length(self):
+        encoder = frackture.FracktureStreamEncoder()
+        encoder.update(b"x" * 99)
+        assert encoder.tier == CompressionTier.TINY
+        encoder.update(b"x")
+        assert encoder.tier == CompressionTier.DEFAULT
+
+    def test_finalize_is_repeatable(self):
+        encoder = frackture.FracktureStreamEncoder()
+        encoder.update(os.urandom(1000))
+        assert encoder.finalize() == encoder.finalize()
+
+    def test_invalid_return_format(self):
+        encoder = frackture.FracktureStreamEncoder()
+        encoder.update(b"abc")
+        with pytest.raises(ValueError):
+            encoder.finalize(return_format="xml")
+
+    def test_large_tier_dataset_stream(self):
+        sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+        from dataset_repository import DatasetRepository
+
+        try:
+            repo = DatasetRepository()
+        except FileNotFoundError:
+            pytest.skip("benchmark datasets not available")
+
+        target = 12 * 1024 * 1024
+        encoder = frackture.FracktureStreamEncoder()
+        for chunk in repo.stream_chunks("binary_png", target):
+            encoder.update(chunk)
+        assert encoder.tier == CompressionTier.LARGE
+        assert encoder.finalize() == frackture.compress_simple(b"".join(repo.stream_chunks("binary_png", target)))
@@ -0,0 +1,59 @@
+"""
+Tests for the raw-bytes symbolic fingerprint kernel.
+
+The vectorized kernel must stay bit-identical to the original list-based
+implementation, which is kept here as a reference.
+"""
+import numpy as np
+import pytest
+
+from conftest import frackture_module as frackture
+
+CompressionTier = frackture.CompressionTier
+
+
+def _reference_fingerprint(input_vector, passes=4):
+    """Original per-call implementation of the symbolic channel."""
+    bits = (input_vector * 255).astype(np.uint8)
+    mask = np.array([(i**2 + i * 3 + 1) % 256 for i in range(len(bits))], dtype=np.uint8)
+    for p in range(passes):
+        rotated = np.roll(bits ^ mask, p * 17)
+        entropy_mixed = (rotated * ((p + 1) ** 2)).astype(np.uint16) % 256
+        chunks = np.array_split(entropy_mixed, 32)
+        folded = [np.bitwise_xor.reduce(chunk) for chunk in chunks]
+        fingerprint = "".join(f"{x:02x}" for x in folded)
+        bits = (entropy_mixed + folded[p % len(folded)]) % 256
+    return fingerprint
+
+
+class TestSymbolicKernel:
+    """Raw-bytes kernel and its hex compatibility wrapper"""
+
+    @pytest.mark.parametrize("length", [1, 20, 32, 100, 767, 768, 1000])
+    @pytest.mark.parametrize("passes", [1, 2, 4, 7, 20])
+    def test_matches_reference(self, length, passes):
+        vec = np.random.default_rng(length * 31 + passes).random(length).astype(np.float32)
+        expected = _reference_fingerprint(vec, passes=passes)
+        assert frackture.frackture_symbolic_fingerprint_bytes(vec, passes=passes).hex() == expected
+        assert frackture.frackture_symbolic_fingerprint_f_infinity(vec, passes=passes) == expected
+
+    def test_returns_32_raw_bytes(self):
+        vec = frackture.frackture_preprocess_universal_v2_6(b"raw fingerprint bytes" * 10)
+        raw = frackture.frackture_symbolic_fingerprint_bytes(vec)
+        assert isinstance(raw, bytes)
+        assert len(raw) == 32
+        assert raw == bytes.fromhex(frackture.frackture_symbolic_fingerprint_f_infinity(vec))
+
+    def test_tiny_tier_uses_two_passes(self):
+        vec = np.random.default_rng(0).random(768).astype(np.float32)
+        tiny = frackture.frackture_symbolic_fingerprint_bytes(vec, passes=9, tier=CompressionTier.TINY)
+        assert tiny.hex() == _reference_fingerprint(vec, passes=2)
+
+    def test_encoder_payload_uses_raw_bytes(self):
+        vec = frackture.frackture_preprocess_universal_v2_6("payload symbolic channel")
+        payload = frackture.frackture_v3_3_safe(vec, tier=CompressionTier.TINY)
+        assert payload.symbolic.hex() == _reference_fingerprint(vec, passes=2)
+
+    def test_rejects_zero_passes(self):
+        with pytest.raises(ValueError):
+            frackture.frackture_symbolic_fingerprint_bytes(np.zeros(768, dtype=np.float32), passes=0)
@@ -0,0 +1,110 @@
+"""
+Tests for the tiny-tier batch engine.
+
+Version 1 output must be bit-identical to the scalar TINY pipeline; version 2
+uses a canonical padding seed and is flagged in the payload header.
+"""
+import os
+
+import numpy as np
+import pytest
+
+from conftest import frackture_module as frackture
+
+CompressionTier = frackture.CompressionTier
+
+
+def _records():
+    rng = np.random.default_rng(10)
+    records = [rng.integers(0, 256, size=int(n), dtype=np.uint8).tobytes() for n in rng.integers(1, 100, 200)]
+    records += [b"", b"a", b"aaaa", b"\x00\xff", b"user:42:session", b"GET /health 200", os.urandom(99)]
+    return records
+
+
+class TestTinyEngineV1:
+    """Version 1 matches the scalar tiny-tier pipeline"""
+
+    def test_preprocess_matches_scalar(self):
+        records = _records()
+        matrix = frackture.frackture_preprocess_tiny_batch(records)
+        for row, record in zip(matrix, records):
+            assert np.array_equal(row, frackture.frackture_preprocess_universal_v2_6(record, CompressionTier.TINY))
+
+    def test_forced_tiny_on_longer_records(self):
+        records = [b"x" * 300, os.urandom(768), b"y" * 769, os.urandom(5000)]
+        matrix = frackture.frackture_preprocess_tiny_batch(records)
+        for row, record in zip(matrix, records):
+            assert np.array_equal(row, frackture.frackture_preprocess_universal_v2_6(record, CompressionTier.TINY))
+
+    def test_str_records(self):
+        records = ["héllo", "key:1234", "ünïcode"]
+        matrix = frackture.frackture_preprocess_tiny_batch(records)
+        for row, record in zip(matrix, records):
+            assert np.array_equal(row, frackture.frackture_preprocess_universal_v2_6(record))
+
+    def test_payloads_match_compress_simple(self):
+        records = _records()
+        packed = frackture.compress_tiny_batch(records)
+        assert [bytes(row) for row in packed] == [
+            frackture.compress_simple(r, tier=CompressionTier.TINY) for r in records
+        ]
+
+    def test_batch_preprocessing_uses_tiny_engine(self):
+        records = _records() + [os.urandom(500)]
+        packed = frackture.compress_batch(records)
+        assert [bytes(row) for row in packed] == [frackture.compress_simple(r) for r in records]
+
+    def test_repr_table_matches_float_formatting(self):
+        for ptp in (0, 1, 7, 255):
+            table = frackture._tiny_repr_table(ptp)
+            normed = np.arange(ptp + 1, dtype=np.float32)
+            if ptp:
+                normed = (normed - np.float32(0)) / (np.float32(ptp) + 1e-8)
+            else:
+                normed = np.ones_like(normed) * 0.5
+            assert list(table[: ptp + 1]) == [repr(v) for v in normed.tolist()]
+
+
+class TestTinyEngineV2:
+    """Version 2 payloads"""
+
+    def test_header_carries_version(self):
+        packed = frackture.compress_tiny_batch([b"abc", b"defg"], version=2)
+        assert list(packed[:, 0] >> 3) == [2, 2]
+        assert list(packed[:, 0] & 0x07) == [0b001, 0b001]
+
+    def test_payload_round_trips(self):
+        row = bytes(frackture.compress_tiny_batch([b"session-key"], version=2)[0])
+        payload = frackture.FrackturePayload.from_bytes(row)
+        assert payload.version == 2
+        assert payload.tier_name == "tiny"
+        assert payload.to_bytes() == row
+        vec = frackture.decompress_simple(row)
+        assert vec.shape == (768,)
+        assert np.all(np.isfinite(vec))
+
+    def test_deterministic_and_shift_invariant(self):
+        a = frackture.frackture_preprocess_tiny_batch([b"\x10\x20\x30"], version=2)
+        b = frackture.frackture_preprocess_tiny_batch([b"\x10\x20\x30"], version=2)
+        shifted = frackture.frackture_preprocess_tiny_batch([b"\x11\x21\x31"], version=2)
+        assert np.array_equal(a, b)
+        assert np.array_equal(a, shifted)
+
+    def test_differs_from_v1_padding(self):
+        v1 = frackture.frackture_preprocess_tiny_batch([b"abc"], version=1)
+        v2 = frackture.frackture_preprocess_tiny_batch([b"abc"], version=2)
+        assert not np.array_equal(v1, v2)
+
+    def test_distinct_keys_distinct_payloads(self):
+        keys = [b"user:%d" % i for i in range(500)]
+        packed = frackture.compress_tiny_batch(keys, version=2)
+        assert len({bytes(row) for row in packed}) == len(keys)
+
+    def test_rejects_unknown_version(self):
+        with pytest.raises(ValueError):
+            frackture.compress_tiny_batch([b"abc"], version=3)
+
+    def test_writes_into_out(self):
+        out = np.empty((2, 768), dtype=np.float32)
+        result = frackture.frackture_preprocess_tiny_batch([b"a", b"bc"], version=2, out=out)
+        assert result is out
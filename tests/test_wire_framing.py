@@ -0,0 +1,173 @@
+"""
+Tests for length-prefixed payload framing over sockets, pipes and buffers.
+"""
+import io
+import os
+import socket
+import threading
+
+import numpy as np
+import pytest
+
+from conftest import frackture_module as frackture
+
+
+@pytest.fixture(scope="module")
+def packed():
+    rng = np.random.default_rng(19)
+    return frackture.compress_batch([os.urandom(int(n)) for n in rng.integers(1, 1500, 250)])
+
+
+def _collect(frames):
+    frames = list(frames)
+    assert all(isinstance(frame, frackture.PayloadArray) for frame in frames)
+    return frames, frackture.PayloadArray.concatenate(frames).rows
+
+
+class TestFrameEncoding:
+    """Frame layout"""
+
+    def test_layout(self, packed):
+        frame = frackture.encode_payload_frame(packed[:3])
+        assert frame[:4] == b"FRKF"
+        assert int.from_bytes(frame[8:12], "little") == 3
+        assert len(frame) == 12 + 4 + 3 * 65
+        assert frame[16:] == packed[:3].tobytes()
+        assert len(frackture.encode_payload_frame(packed[:3], crc=False)) == 12 + 3 * 65
+
+    @pytest.mark.parametrize("crc", [True, False])
+    def test_stream_round_trip(self, packed, crc):
+        stream = io.BytesIO()
+        assert frackture.write_payload_frames(stream, packed, frame_records=100, crc=crc) == 3
+        stream.seek(0)
+        frames, rows = _collect(frackture.read_payload_frames(stream))
+        assert [len(f) for f in frames] == [100, 100, 50]
+        assert np.array_equal(rows, packed)
+
+    def test_empty_frame(self):
+        stream = io.BytesIO(frackture.encode_payload_frame(b""))
+        frames = list(frackture.read_payload_frames(stream))
+        assert len(frames) == 1 and len(frames[0]) == 0
+
+    def test_strided_source(self, tmp_path, packed):
+        path = tmp_path / "ids.frk"
+        with frackture.FracktureFileWriter(path, id_width=5) as writer:
+            writer.append_many(packed, ids=[b"id"] * len(packed))
+        stream = io.BytesIO()
+        frackture.write_payload_frames(stream, frackture.open_frk(path).payloads, frame_records=64)
+        stream.seek(0)
+        assert np.array_equal(_collect(frackture.read_payload_frames(stream))[1], packed)
+
+
+class TestTransports:
+    """Sockets and pipes"""
+
+    def test_socketpair(self, packed):
+        left, right = socket.socketpair()
+        big = np.tile(packed, (40, 1))
+        sender = threading.Thread(target=lambda: (frackture.write_payload_frames(left, big, 3000), left.close()))
+        sender.start()
+        try:
+            _, rows = _collect(frackture.read_payload_frames(right))
+        finally:
+            sender.join()
+            right.close()
+        assert np.array_equal(rows, big)
+
+    def test_pipe(self, packed):
+        read_fd, write_fd = os.pipe()
+        with os.fdopen(read_fd, "rb") as reader, os.fdopen(write_fd, "wb") as writer:
+            sender = threading.Thread(target=lambda: (frackture.write_payload_frames(writer, packed, 77), writer.close()))
+            sender.start()
+            _, rows = _collect(frackture.read_payload_frames(reader))
+            sender.join()
+        assert np.array_equal(rows, packed)
+
+
+class TestFrameErrors:
+    """Corruption and truncation"""
+
+    def test_crc_mismatch(self, packed):
+        frame = bytearray(frackture.encode_payload_frame(packed[:10]))
+        frame[40] ^= 0x01
+        with pytest.raises(ValueError, match="CRC"):
+            list(frackture.read_payload_frames(io.BytesIO(bytes(frame))))
+        with pytest.raises(ValueError, match="CRC"):
+            frackture.PayloadFrameDecoder().feed(bytes(frame))
+
+    def test_truncated_stream(self, packed):
+        frame = frackture.encode_payload_frame(packed[:10])
+        for cut in (5, 14, len(frame) - 1):
+            with pytest.raises(ValueError, match="Truncated"):
+                list(frackture.read_payload_frames(io.BytesIO(frame[:cut])))
+
+    def test_bad_magic_and_size_limit(self, packed):
+        frame = frackture.encode_payload_frame(packed[:10])
+        with pytest.raises(ValueError, match="magic"):
+            list(frackture.read_payload_frames(io.BytesIO(b"XXXX" + frame[4:])))
+        with pytest.raises(ValueError, match="max_records"):
+            list(frackture.read_payload_frames(io.BytesIO(frame), max_records=5))
+
+
+class TestPayloadFrameDecoder:
+    """Push-style decoding of arbitrary chunks"""
+
+    @pytest.mark.parametrize("chunk", [1, 13, 65, 1000, 1 << 20])
+    def test_arbitrary_chunking(self, packed, chunk):
+        data = b"".join(
+            frackture.encode_payload_frame(packed[i : i + 60], crc=bool(i % 120)) for i in range(0, len(packed), 60)
+        )
+        decoder = frackture.PayloadFrameDecoder()
+        frames = []
+        for i in range(0, len(data), chunk):
+            frames += decoder.feed(data[i : i + chunk])
+        decoder.close()
+        assert [len(f) for f in frames] == [60, 60, 60, 60, 10]
+        assert np.array_equal(frackture.PayloadArray.concatenate(frames).rows, packed)
+
+    def test_frames_survive_later_feeds(self, packed):
+        decoder = frackture.PayloadFrameDecoder()
+        first = frackture.encode_payload_frame(packed[:10]) + frackture.encode_payload_frame(packed[10:25])
+        frames = decoder.feed(first + frackture.encode_payload_frame(packed[25:30])[:20])
+        assert [len(f) for f in frames] == [10, 15]
+        assert decoder.pending_bytes == 20
+        later = decoder.feed(frackture.encode_payload_frame(packed[25:30])[20:])
+        assert np.array_equal(frames[0].rows, packed[:10])
+        assert np.array_equal(frames[1].rows, packed[10:25])
+        assert np.array_equal(later[0].rows, packed[25:30])
+        assert decoder.pending_bytes == 0
+
+    def test_crc_failure_keeps_bad_frame_pending(self, packed):
+        bad = bytearray(frackture.encode_payload_frame(packed[:3]))
+        bad[-1] ^= 0x01
+        decoder = frackture.PayloadFrameDecoder()
+        frames = decoder.feed(frackture.encode_payload_frame(packed[3:5]) + bytes(bad))
+        assert len(frames) == 1
+        assert np.array_equal(frames[0].rows, packed[3:5])
+        assert decoder.pending_bytes == len(bad)
+        with pytest.raises(ValueError, match="CRC"):
+            decoder.feed(b"")
+        with pytest.raises(ValueError, match="CRC"):
+            decoder.close()
+
+    def test_corrupt_first_frame_raises_immediately(self, packed):
+        bad = bytearray(frackture.encode_payload_frame(packed[:3]))
+        bad[-1] ^= 0x01
+        decoder = frackture.PayloadFrameDecoder()
+        with pytest.raises(ValueError, match="CRC"):
+            decoder.feed(bytes(bad))
+        assert decoder.pending_bytes == len(bad)
+
+    def test_bad_header_after_good_frame(self, packed):
+        decoder = frackture.PayloadFrameDecoder()
+        frames = decoder.feed(frackture.encode_payload_frame(packed[:2]) + b"XXXXXXXXXXXXXXXX")
+        assert len(frames) == 1 and len(frames[0]) == 2
+        with pytest.raises(ValueError):
+            decoder.close()
+
+    def test_partial_frame_on_close(self, packed):
+        decoder = frackture.PayloadFrameDecoder()
+        assert decoder.feed(frackture.encode_payload_frame(packed[:4])[:-3]) == []
+        assert decoder.pending_bytes > 0
+        with pytest.raises(ValueError):
+            decoder.close()